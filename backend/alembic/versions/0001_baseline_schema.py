@@ -0,0 +1,320 @@
+"""baseline schema
+
+The schema exactly as Base.metadata.create_all built it before versioned
+migrations were introduced.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 12:26:20.970490
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ENUM_TYPES = [
+    "alertseverity",
+    "alerttype",
+    "automationtrigger",
+    "bookingstatus",
+    "contactsource",
+    "conversationstatus",
+    "messagedirection",
+    "messagestatus",
+    "messagetype",
+    "servicetype",
+    "submissionstatus",
+    "userrole"
+]
+
+
+def upgrade() -> None:
+    op.create_table('workspace_settings',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('workspace_id', sa.String(length=36), nullable=False),
+    sa.Column('key', sa.String(length=100), nullable=False),
+    sa.Column('value', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('workspaces',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('slug', sa.String(length=255), nullable=False),
+    sa.Column('address', sa.Text(), nullable=True),
+    sa.Column('timezone', sa.String(length=50), nullable=True),
+    sa.Column('contact_email', sa.String(length=255), nullable=False),
+    sa.Column('phone', sa.String(length=50), nullable=True),
+    sa.Column('logo_url', sa.String(length=500), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('onboarding_step', sa.String(length=50), nullable=True),
+    sa.Column('onboarding_completed', sa.Boolean(), nullable=True),
+    sa.Column('email_provider', sa.String(length=50), nullable=True),
+    sa.Column('email_config', sa.JSON(), nullable=True),
+    sa.Column('email_connected', sa.Boolean(), nullable=True),
+    sa.Column('sms_provider', sa.String(length=50), nullable=True),
+    sa.Column('sms_config', sa.JSON(), nullable=True),
+    sa.Column('sms_connected', sa.Boolean(), nullable=True),
+    sa.Column('welcome_message', sa.Text(), nullable=True),
+    sa.Column('booking_confirmation_message', sa.Text(), nullable=True),
+    sa.Column('reminder_message', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_workspaces_slug'), 'workspaces', ['slug'], unique=True)
+    op.create_table('alerts',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('workspace_id', sa.String(length=36), nullable=False),
+    sa.Column('alert_type', sa.Enum('MISSED_MESSAGE', 'UNCONFIRMED_BOOKING', 'OVERDUE_FORM', 'LOW_INVENTORY', 'SYSTEM', name='alerttype'), nullable=False),
+    sa.Column('severity', sa.Enum('INFO', 'WARNING', 'CRITICAL', name='alertseverity'), nullable=True),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('message', sa.Text(), nullable=True),
+    sa.Column('is_read', sa.Boolean(), nullable=True),
+    sa.Column('link', sa.String(length=500), nullable=True),
+    sa.Column('related_id', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('automation_rules',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('workspace_id', sa.String(length=36), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('trigger', sa.Enum('CONTACT_CREATED', 'BOOKING_CREATED', 'BOOKING_REMINDER', 'FORM_PENDING', 'INVENTORY_LOW', 'STAFF_REPLY', name='automationtrigger'), nullable=False),
+    sa.Column('action', sa.String(length=50), nullable=False),
+    sa.Column('config', sa.JSON(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('contacts',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('workspace_id', sa.String(length=36), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=True),
+    sa.Column('phone', sa.String(length=50), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('source', sa.Enum('CONTACT_FORM', 'BOOKING', 'MANUAL', name='contactsource'), nullable=True),
+    sa.Column('tags', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_contacts_email'), 'contacts', ['email'], unique=False)
+    op.create_index(op.f('ix_contacts_phone'), 'contacts', ['phone'], unique=False)
+    op.create_table('form_templates',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('workspace_id', sa.String(length=36), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('form_type', sa.String(length=50), nullable=True),
+    sa.Column('fields', sa.JSON(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('sort_order', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('inventory_items',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('workspace_id', sa.String(length=36), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('quantity', sa.Integer(), nullable=True),
+    sa.Column('low_stock_threshold', sa.Integer(), nullable=True),
+    sa.Column('unit', sa.String(length=50), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('services',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('workspace_id', sa.String(length=36), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('duration_minutes', sa.Integer(), nullable=False),
+    sa.Column('service_type', sa.Enum('IN_PERSON', 'VIRTUAL', 'PHONE', name='servicetype'), nullable=True),
+    sa.Column('location', sa.String(length=500), nullable=True),
+    sa.Column('price', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('color', sa.String(length=7), nullable=True),
+    sa.Column('linked_form_ids', sa.JSON(), nullable=True),
+    sa.Column('linked_inventory', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('users',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('hashed_password', sa.String(length=255), nullable=False),
+    sa.Column('full_name', sa.String(length=255), nullable=False),
+    sa.Column('role', sa.Enum('OWNER', 'STAFF', name='userrole'), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('workspace_id', sa.String(length=36), nullable=True),
+    sa.Column('can_access_inbox', sa.Boolean(), nullable=True),
+    sa.Column('can_access_bookings', sa.Boolean(), nullable=True),
+    sa.Column('can_access_forms', sa.Boolean(), nullable=True),
+    sa.Column('can_access_inventory', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_table('automation_logs',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('workspace_id', sa.String(length=36), nullable=False),
+    sa.Column('rule_id', sa.String(length=36), nullable=True),
+    sa.Column('trigger', sa.String(length=50), nullable=False),
+    sa.Column('action', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('details', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['rule_id'], ['automation_rules.id'], ),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('availabilities',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('service_id', sa.String(length=36), nullable=False),
+    sa.Column('day_of_week', sa.Integer(), nullable=False),
+    sa.Column('start_time', sa.String(length=5), nullable=False),
+    sa.Column('end_time', sa.String(length=5), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.ForeignKeyConstraint(['service_id'], ['services.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('bookings',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('workspace_id', sa.String(length=36), nullable=False),
+    sa.Column('contact_id', sa.String(length=36), nullable=False),
+    sa.Column('service_id', sa.String(length=36), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'CONFIRMED', 'COMPLETED', 'CANCELLED', 'NO_SHOW', name='bookingstatus'), nullable=True),
+    sa.Column('booking_date', sa.DateTime(), nullable=False),
+    sa.Column('end_time', sa.DateTime(), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('confirmation_sent', sa.String(length=10), nullable=True),
+    sa.Column('reminder_sent', sa.String(length=10), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['contact_id'], ['contacts.id'], ),
+    sa.ForeignKeyConstraint(['service_id'], ['services.id'], ),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('conversations',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('workspace_id', sa.String(length=36), nullable=False),
+    sa.Column('contact_id', sa.String(length=36), nullable=False),
+    sa.Column('subject', sa.String(length=500), nullable=True),
+    sa.Column('status', sa.Enum('OPEN', 'REPLIED', 'CLOSED', name='conversationstatus'), nullable=True),
+    sa.Column('is_automation_paused', sa.Boolean(), nullable=True),
+    sa.Column('last_message_at', sa.DateTime(), nullable=True),
+    sa.Column('assigned_to', sa.String(length=36), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['assigned_to'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['contact_id'], ['contacts.id'], ),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('form_fields',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('template_id', sa.String(length=36), nullable=False),
+    sa.Column('label', sa.String(length=255), nullable=False),
+    sa.Column('field_type', sa.String(length=50), nullable=False),
+    sa.Column('is_required', sa.Boolean(), nullable=True),
+    sa.Column('options', sa.JSON(), nullable=True),
+    sa.Column('sort_order', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['template_id'], ['form_templates.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('form_submissions',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('template_id', sa.String(length=36), nullable=False),
+    sa.Column('contact_id', sa.String(length=36), nullable=False),
+    sa.Column('booking_id', sa.String(length=36), nullable=True),
+    sa.Column('workspace_id', sa.String(length=36), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'COMPLETED', 'OVERDUE', name='submissionstatus'), nullable=True),
+    sa.Column('data', sa.JSON(), nullable=True),
+    sa.Column('submitted_at', sa.DateTime(), nullable=True),
+    sa.Column('due_date', sa.DateTime(), nullable=True),
+    sa.Column('reminder_count', sa.String(length=10), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['booking_id'], ['bookings.id'], ),
+    sa.ForeignKeyConstraint(['contact_id'], ['contacts.id'], ),
+    sa.ForeignKeyConstraint(['template_id'], ['form_templates.id'], ),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('inventory_logs',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('item_id', sa.String(length=36), nullable=False),
+    sa.Column('change', sa.Integer(), nullable=False),
+    sa.Column('reason', sa.String(length=255), nullable=True),
+    sa.Column('booking_id', sa.String(length=36), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['booking_id'], ['bookings.id'], ),
+    sa.ForeignKeyConstraint(['item_id'], ['inventory_items.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('messages',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('conversation_id', sa.String(length=36), nullable=False),
+    sa.Column('sender_id', sa.String(length=36), nullable=True),
+    sa.Column('message_type', sa.Enum('EMAIL', 'SMS', 'SYSTEM', name='messagetype'), nullable=False),
+    sa.Column('direction', sa.Enum('INBOUND', 'OUTBOUND', name='messagedirection'), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('status', sa.Enum('SENT', 'DELIVERED', 'FAILED', 'PENDING', name='messagestatus'), nullable=True),
+    sa.Column('is_automated', sa.Boolean(), nullable=True),
+    sa.Column('metadata_json', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['conversation_id'], ['conversations.id'], ),
+    sa.ForeignKeyConstraint(['sender_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('messages')
+    op.drop_table('inventory_logs')
+    op.drop_table('form_submissions')
+    op.drop_table('form_fields')
+    op.drop_table('conversations')
+    op.drop_table('bookings')
+    op.drop_table('availabilities')
+    op.drop_table('automation_logs')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_table('services')
+    op.drop_table('inventory_items')
+    op.drop_table('form_templates')
+    op.drop_index(op.f('ix_contacts_phone'), table_name='contacts')
+    op.drop_index(op.f('ix_contacts_email'), table_name='contacts')
+    op.drop_table('contacts')
+    op.drop_table('automation_rules')
+    op.drop_table('alerts')
+    op.drop_index(op.f('ix_workspaces_slug'), table_name='workspaces')
+    op.drop_table('workspaces')
+    op.drop_table('workspace_settings')
+
+    # drop_table leaves PostgreSQL enum types behind
+    for enum_name in ENUM_TYPES:
+        sa.Enum(name=enum_name).drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,68 @@
+"""workspace scoped indexes
+
+Composite indexes for the workspace/status/date filters the routers and the
+scheduler run on every request, plus two partial indexes for the scheduler
+jobs. Enum columns store member names, so the predicates compare against
+'CONFIRMED' / 'PENDING', not the lowercase values.
+
+On PostgreSQL the indexes are built CONCURRENTLY so existing tables stay
+writable during the upgrade.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 12:26:50.843820
+
+"""
+from contextlib import nullcontext
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+REMINDER_DUE = "status = 'CONFIRMED' AND reminder_sent = 'no'"
+PENDING = "status = 'PENDING'"
+
+# (name, table, columns, partial index predicate)
+INDEXES = [
+    ('ix_bookings_workspace_date', 'bookings', ['workspace_id', 'booking_date'], None),
+    ('ix_bookings_service_status_date', 'bookings', ['service_id', 'status', 'booking_date'], None),
+    ('ix_bookings_reminder_due', 'bookings', ['booking_date'], REMINDER_DUE),
+    ('ix_conversations_workspace_status_last', 'conversations', ['workspace_id', 'status', 'last_message_at'], None),
+    ('ix_messages_conversation_created', 'messages', ['conversation_id', 'created_at'], None),
+    ('ix_form_submissions_workspace_status', 'form_submissions', ['workspace_id', 'status'], None),
+    ('ix_form_submissions_pending_due', 'form_submissions', ['due_date'], PENDING),
+    ('ix_alerts_workspace_read_created', 'alerts', ['workspace_id', 'is_read', 'created_at'], None),
+    ('ix_availabilities_service_day', 'availabilities', ['service_id', 'day_of_week'], None),
+]
+
+
+def _is_postgresql() -> bool:
+    return op.get_context().dialect.name == 'postgresql'
+
+
+def upgrade() -> None:
+    concurrently = _is_postgresql()
+    with op.get_context().autocommit_block() if concurrently else nullcontext():
+        for name, table, columns, where in INDEXES:
+            kwargs = {}
+            if where:
+                kwargs = {'postgresql_where': sa.text(where), 'sqlite_where': sa.text(where)}
+            op.create_index(
+                name, table, columns, unique=False, if_not_exists=True,
+                postgresql_concurrently=concurrently, **kwargs
+            )
+
+
+def downgrade() -> None:
+    concurrently = _is_postgresql()
+    with op.get_context().autocommit_block() if concurrently else nullcontext():
+        for name, table, _columns, _where in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=concurrently)
+
@@ -0,0 +1,50 @@
+"""service capacity and resources
+
+services.capacity (concurrent bookings per resource), the service_resources
+table linking services to the staff who run them, and bookings.resource_id.
+bookings is altered in batch mode so SQLite, which cannot add a foreign key
+in place, rebuilds the table; other databases get a plain ALTER TABLE.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 12:48:39.185941
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('service_resources',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('service_id', sa.String(length=36), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['service_id'], ['services.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_service_resources_service_user', 'service_resources', ['service_id', 'user_id'], unique=True)
+    with op.batch_alter_table('bookings') as batch_op:
+        batch_op.add_column(sa.Column('resource_id', sa.String(length=36), nullable=True))
+        batch_op.create_foreign_key('fk_bookings_resource_id', 'service_resources', ['resource_id'], ['id'])
+    op.add_column('services', sa.Column('capacity', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('services', 'capacity')
+    with op.batch_alter_table('bookings') as batch_op:
+        batch_op.drop_constraint('fk_bookings_resource_id', type_='foreignkey')
+        batch_op.drop_column('resource_id')
+    op.drop_index('ix_service_resources_service_user', table_name='service_resources')
+    op.drop_table('service_resources')
@@ -0,0 +1,51 @@
+"""booking series
+
+booking_series holds the recurrence rule of a recurring booking, and
+bookings.series_id links each occurrence to it. bookings is altered in batch
+mode as in 0004.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 12:53:27.878942
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('booking_series',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('workspace_id', sa.String(length=36), nullable=False),
+    sa.Column('contact_id', sa.String(length=36), nullable=False),
+    sa.Column('service_id', sa.String(length=36), nullable=False),
+    sa.Column('rrule', sa.String(length=500), nullable=False),
+    sa.Column('starts_at', sa.DateTime(), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['contact_id'], ['contacts.id'], ),
+    sa.ForeignKeyConstraint(['service_id'], ['services.id'], ),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('bookings') as batch_op:
+        batch_op.add_column(sa.Column('series_id', sa.String(length=36), nullable=True))
+        batch_op.create_index('ix_bookings_series_id', ['series_id'], unique=False)
+        batch_op.create_foreign_key('fk_bookings_series_id', 'booking_series', ['series_id'], ['id'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('bookings') as batch_op:
+        batch_op.drop_constraint('fk_bookings_series_id', type_='foreignkey')
+        batch_op.drop_index('ix_bookings_series_id')
+        batch_op.drop_column('series_id')
+    op.drop_table('booking_series')
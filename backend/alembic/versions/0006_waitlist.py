@@ -0,0 +1,52 @@
+"""waitlist
+
+waitlist_entries, with an index that walks a service's waiting entries in
+priority order for offers and one for the hold expiry job.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 12:56:16.134605
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('waitlist_entries',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('workspace_id', sa.String(length=36), nullable=False),
+    sa.Column('service_id', sa.String(length=36), nullable=False),
+    sa.Column('contact_id', sa.String(length=36), nullable=False),
+    sa.Column('status', sa.Enum('WAITING', 'OFFERED', 'BOOKED', 'EXPIRED', 'CANCELLED', name='waitliststatus'), nullable=False),
+    sa.Column('priority', sa.Integer(), nullable=False),
+    sa.Column('window_start', sa.DateTime(), nullable=False),
+    sa.Column('window_end', sa.DateTime(), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('offered_booking_id', sa.String(length=36), nullable=True),
+    sa.Column('offer_expires_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['contact_id'], ['contacts.id'], ),
+    sa.ForeignKeyConstraint(['offered_booking_id'], ['bookings.id'], ),
+    sa.ForeignKeyConstraint(['service_id'], ['services.id'], ),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_waitlist_service_status_priority', 'waitlist_entries', ['service_id', 'status', 'priority', 'created_at'], unique=False)
+    op.create_index('ix_waitlist_status_offer_expires', 'waitlist_entries', ['status', 'offer_expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_waitlist_status_offer_expires', table_name='waitlist_entries')
+    op.drop_index('ix_waitlist_service_status_priority', table_name='waitlist_entries')
+    op.drop_table('waitlist_entries')
@@ -0,0 +1,31 @@
+"""contact source import
+
+Adds IMPORT to the contactsource enum for contacts created by the bulk
+importer. Only PostgreSQL has a native enum type to alter; elsewhere the
+column is a VARCHAR wide enough for the new name already.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 13:20:41.512873
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        op.execute("ALTER TYPE contactsource ADD VALUE IF NOT EXISTS 'IMPORT'")
+
+
+def downgrade() -> None:
+    # PostgreSQL cannot drop a value from an enum type; an unused IMPORT is harmless
+    pass
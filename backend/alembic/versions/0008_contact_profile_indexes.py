@@ -0,0 +1,33 @@
+"""contact profile indexes
+
+Indexes leading on contact_id for the contact profile: bookings,
+conversations and form submissions of one contact in date order, paged by
+keyset, and the grouped stats over them.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 13:09:41.707085
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_bookings_contact_date', 'bookings', ['contact_id', 'booking_date'], unique=False)
+    op.create_index('ix_conversations_contact_created', 'conversations', ['contact_id', 'created_at'], unique=False)
+    op.create_index('ix_form_submissions_contact_created', 'form_submissions', ['contact_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_form_submissions_contact_created', table_name='form_submissions')
+    op.drop_index('ix_conversations_contact_created', table_name='conversations')
+    op.drop_index('ix_bookings_contact_date', table_name='bookings')
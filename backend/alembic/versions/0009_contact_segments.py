@@ -0,0 +1,62 @@
+"""contact segments
+
+segments (saved contact filters) and segment_members, their materialized
+membership, plus (workspace_id, updated_at) indexes on contacts, bookings
+and form_submissions for finding the contacts written since the last
+segment refresh.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 13:14:03.612636
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('segments',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('workspace_id', sa.String(length=36), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('definition', sa.JSON(), nullable=False),
+    sa.Column('member_count', sa.Integer(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=True),
+    sa.Column('full_refreshed_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_segments_workspace_id'), 'segments', ['workspace_id'], unique=False)
+    op.create_table('segment_members',
+    sa.Column('segment_id', sa.String(length=36), nullable=False),
+    sa.Column('contact_id', sa.String(length=36), nullable=False),
+    sa.Column('added_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['contact_id'], ['contacts.id'], ),
+    sa.ForeignKeyConstraint(['segment_id'], ['segments.id'], ),
+    sa.PrimaryKeyConstraint('segment_id', 'contact_id')
+    )
+    op.create_index('ix_segment_members_contact', 'segment_members', ['contact_id'], unique=False)
+    op.create_index('ix_bookings_workspace_updated', 'bookings', ['workspace_id', 'updated_at'], unique=False)
+    op.create_index('ix_contacts_workspace_updated', 'contacts', ['workspace_id', 'updated_at'], unique=False)
+    op.create_index('ix_form_submissions_workspace_updated', 'form_submissions', ['workspace_id', 'updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_form_submissions_workspace_updated', table_name='form_submissions')
+    op.drop_index('ix_contacts_workspace_updated', table_name='contacts')
+    op.drop_index('ix_bookings_workspace_updated', table_name='bookings')
+    op.drop_index('ix_segment_members_contact', table_name='segment_members')
+    op.drop_table('segment_members')
+    op.drop_index(op.f('ix_segments_workspace_id'), table_name='segments')
+    op.drop_table('segments')
@@ -0,0 +1,151 @@
+"""contact tags
+
+Replaces the comma-separated contacts.tags string with tags (one row per
+workspace tag, unique on its case-insensitive key) and contact_tags linking
+them to contacts. Existing strings are split into rows before the column is
+dropped, and the downgrade joins them back.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 13:19:23.923194
+
+"""
+import re
+import uuid
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_ROWS = 5000
+# Tag rules as of this revision, copied rather than imported from
+# app.services.tag_service so that later changes there cannot alter
+# how this migration splits existing tags
+MAX_TAG_LENGTH = 100
+
+
+def clean_tag(name):
+    return ' '.join(str(name or '').split()) or None
+
+
+def tag_key(name):
+    return (clean_tag(name) or '').lower()
+
+
+contacts = sa.table(
+    'contacts',
+    sa.column('id', sa.String),
+    sa.column('workspace_id', sa.String),
+    sa.column('tags', sa.String),
+)
+tags = sa.table(
+    'tags',
+    sa.column('id', sa.String),
+    sa.column('workspace_id', sa.String),
+    sa.column('name', sa.String),
+    sa.column('key', sa.String),
+    sa.column('created_at', sa.DateTime),
+)
+contact_tags = sa.table(
+    'contact_tags',
+    sa.column('contact_id', sa.String),
+    sa.column('tag_id', sa.String),
+    sa.column('created_at', sa.DateTime),
+)
+
+
+def _require_online():
+    if op.get_context().as_sql:
+        # Tags move between contacts.tags and the tag tables, which needs the
+        # existing rows; rendered as offline SQL the column would be dropped
+        # with its data still in it
+        raise RuntimeError('Migration 0010 copies existing tags and must be run against the database, not with --sql')
+
+
+def upgrade() -> None:
+    _require_online()
+    op.create_table('tags',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('workspace_id', sa.String(length=36), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('key', sa.String(length=100), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tags_workspace_key', 'tags', ['workspace_id', 'key'], unique=True)
+    op.create_table('contact_tags',
+    sa.Column('contact_id', sa.String(length=36), nullable=False),
+    sa.Column('tag_id', sa.String(length=36), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['contact_id'], ['contacts.id'], ),
+    sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ),
+    sa.PrimaryKeyConstraint('contact_id', 'tag_id')
+    )
+    op.create_index('ix_contact_tags_tag_contact', 'contact_tags', ['tag_id', 'contact_id'], unique=False)
+
+    conn = op.get_bind()
+    now = datetime.utcnow()
+    tag_ids = {}
+    new_tags, links = [], []
+    for contact_id, workspace_id, value in conn.execute(
+        sa.select(contacts.c.id, contacts.c.workspace_id, contacts.c.tags).where(contacts.c.tags != '')
+    ):
+        linked = set()
+        for part in re.split(r'[,;]', value):
+            name = (clean_tag(part) or '')[:MAX_TAG_LENGTH].strip()
+            if not name:
+                continue
+            key = (workspace_id, tag_key(name))
+            if key not in tag_ids:
+                tag_ids[key] = str(uuid.uuid4())
+                new_tags.append({'id': tag_ids[key], 'workspace_id': workspace_id, 'name': name, 'key': key[1], 'created_at': now})
+            if tag_ids[key] not in linked:
+                linked.add(tag_ids[key])
+                links.append({'contact_id': contact_id, 'tag_id': tag_ids[key], 'created_at': now})
+
+    for rows, table in ((new_tags, tags), (links, contact_tags)):
+        for offset in range(0, len(rows), BATCH_ROWS):
+            conn.execute(table.insert(), rows[offset:offset + BATCH_ROWS])
+
+    with op.batch_alter_table('contacts') as batch_op:
+        batch_op.drop_column('tags')
+
+
+def downgrade() -> None:
+    _require_online()
+    op.add_column('contacts', sa.Column('tags', sa.VARCHAR(length=500), nullable=True))
+
+    conn = op.get_bind()
+    names = {}
+    for contact_id, name in conn.execute(
+        sa.select(contact_tags.c.contact_id, tags.c.name)
+        .select_from(contact_tags.join(tags, tags.c.id == contact_tags.c.tag_id))
+        .order_by(contact_tags.c.contact_id, tags.c.name)
+    ):
+        names.setdefault(contact_id, []).append(name)
+    values = []
+    for contact_id, contact_names in names.items():
+        # The old column holds 500 characters; tags past that are dropped
+        value = ''
+        for name in contact_names:
+            if len(value) + len(name) + 2 > 500:
+                break
+            value = f'{value}, {name}' if value else name
+        values.append({'b_id': contact_id, 'b_tags': value})
+    update = contacts.update().where(contacts.c.id == sa.bindparam('b_id')).values(tags=sa.bindparam('b_tags'))
+    for offset in range(0, len(values), BATCH_ROWS):
+        conn.execute(update, values[offset:offset + BATCH_ROWS])
+
+    op.drop_index('ix_contact_tags_tag_contact', table_name='contact_tags')
+    op.drop_table('contact_tags')
+    op.drop_index('ix_tags_workspace_key', table_name='tags')
+    op.drop_table('tags')
@@ -9,9 +9,40 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "careops-secret-key-change-in-production-2024"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24
+    AUTH_USER_CACHE_TTL_SECONDS: int = 30
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    PASSWORD_HASH_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: Optional[int] = None  # default: one per CPU, minus one for the event loop
 
     # SQLite instead of PostgreSQL - no installation needed
     DATABASE_URL: str = "sqlite:///./careops.db"
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 30
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    # Comma-separated read replica URLs; empty means every read goes to the primary
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_RETRY_SECONDS: float = 10.0
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    # Comma-separated addresses of reverse proxies whose X-Forwarded-For is believed
+    TRUSTED_PROXIES: str = ""
+    # Public booking pages: server-side cache and browser/CDN freshness
+    PUBLIC_CATALOG_CACHE_TTL_SECONDS: int = 300
+    PUBLIC_CATALOG_CACHE_MAX_ENTRIES: int = 1024
+    PUBLIC_CATALOG_MAX_AGE_SECONDS: int = 60
+    AVAILABILITY_SEARCH_MAX_DAYS: int = 62
+    BOOKING_SERIES_MAX_OCCURRENCES: int = 104
+    WAITLIST_HOLD_MINUTES: int = 30
+    EXPORT_BATCH_ROWS: int = 1000
+    IMPORT_CHUNK_ROWS: int = 1000
+    BULK_TAG_MAX_CONTACTS: int = 10000
+    SEGMENT_REFRESH_MINUTES: int = 5
+    SEGMENT_FULL_REFRESH_MINUTES: int = 60
 
     REDIS_URL: str = "redis://localhost:6379/0"
 
@@ -31,6 +62,20 @@ class Settings(BaseSettings):
 
     groq_api_key: str | None = None
 
+    # CareOpsGPT
+    AI_BACKEND: str = "groq"  # "groq" or "fake" (offline, for tests and benchmarks)
+    AI_MODEL: str = "llama-3.1-8b-instant"
+    AI_MAX_TOKENS: int = 800
+    AI_TEMPERATURE: float = 0.7
+    AI_REQUEST_TIMEOUT_SECONDS: float = 30.0
+    AI_MAX_CONCURRENCY_PER_WORKSPACE: int = 4
+    AI_FAKE_TOKEN_DELAY_MS: int = 0
+    AI_CONTEXT_TTL_SECONDS: int = 60
+    AI_CONTEXT_TOKEN_BUDGET: int = 400
+    AI_LOG_SAMPLE_RATE: float = 0.1
+    AI_CACHE_TTL_SECONDS: int = 900
+    AI_CACHE_MAX_ENTRIES: int = 2048
+    AI_CACHE_SIMILARITY_ENABLED: bool = True
 
     class Config:
         env_file = ".env"
@@ -1,36 +1,351 @@
+import hashlib
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from typing import Optional
+from fastapi import Request
 from sqlalchemy import create_engine, event
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.config import settings
+from app.services.cache import TTLCache
 
-# Handle SQLite vs PostgreSQL
-if settings.DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        settings.DATABASE_URL,
-        connect_args={"check_same_thread": False},
-        echo=False
-    )
-    # Enable foreign keys for SQLite
-    @event.listens_for(engine, "connect")
-    def set_sqlite_pragma(dbapi_connection, connection_record):
-        cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.close()
-else:
-    engine = create_engine(
-        settings.DATABASE_URL,
-        pool_pre_ping=True,
-        pool_size=20,
-        max_overflow=30
-    )
+logger = logging.getLogger(__name__)
+
+
+class PoolMetrics:
+    """Checkout wait and in-use counters for one connection pool"""
+
+    def __init__(self, samples: int = 1024):
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self._waits = deque(maxlen=samples)
+        self._lock = threading.Lock()
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self._waits.append(seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def on_checkout(self, *args) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def on_checkin(self, *args) -> None:
+        with self._lock:
+            self.checkins += 1
+            self.in_use = max(self.in_use - 1, 0)
+
+    def on_connect(self, *args) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def on_invalidate(self, *args) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            result = {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use
+            }
+        result["checkout_wait_ms"] = {
+            "samples": len(waits),
+            "avg": round(sum(waits) / len(waits) * 1000, 3) if waits else 0.0,
+            "p95": round(waits[int(len(waits) * 0.95)] * 1000, 3) if waits else 0.0,
+            "max": round(waits[-1] * 1000, 3) if waits else 0.0
+        }
+        return result
+
+
+def _timed_pool(base, metrics: PoolMetrics):
+    """Pool subclass that times how long each checkout waits for a connection"""
+
+    class TimedPool(base):
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except PoolTimeoutError:
+                metrics.record_wait(time.perf_counter() - start, timed_out=True)
+                raise
+            metrics.record_wait(time.perf_counter() - start)
+            return connection
+
+    TimedPool.__name__ = f"Timed{base.__name__}"
+    return TimedPool
+
+
+def async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto its async driver (aiosqlite / asyncpg)"""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    for prefix in ("postgresql+psycopg2:", "postgresql:", "postgres:"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg:" + url[len(prefix):]
+    return url
+
+
+def _set_sqlite_pragma(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    # WAL lets readers run while a write is in progress; with WAL, synchronous=NORMAL
+    # skips an fsync per commit without risking corruption
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.close()
+
+
+def _pool_options(url: str) -> dict:
+    if url.startswith("sqlite") and ":memory:" in url:
+        return {}  # in-memory SQLite uses a per-thread pool
+    options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS
+    }
+    if not url.startswith("sqlite"):
+        options["pool_pre_ping"] = settings.DB_POOL_PRE_PING
+    return options
+
+
+def _instrument(sync_engine, metrics: PoolMetrics):
+    event.listen(sync_engine, "checkout", metrics.on_checkout)
+    event.listen(sync_engine, "checkin", metrics.on_checkin)
+    event.listen(sync_engine, "connect", metrics.on_connect)
+    event.listen(sync_engine, "invalidate", metrics.on_invalidate)
+    if sync_engine.url.get_backend_name() == "sqlite":
+        event.listen(sync_engine, "connect", _set_sqlite_pragma)
+
+
+def build_engine(url: str):
+    options = _pool_options(url)
+    if url.startswith("sqlite"):
+        options["connect_args"] = {"check_same_thread": False}
+    metrics = PoolMetrics()
+    if "pool_size" in options:
+        options["poolclass"] = _timed_pool(QueuePool, metrics)
+    engine = create_engine(url, echo=False, **options)
+    _instrument(engine, metrics)
+    return engine, metrics
+
+
+def build_async_engine(url: str):
+    options = _pool_options(url)
+    metrics = PoolMetrics()
+    if "pool_size" in options:
+        options["poolclass"] = _timed_pool(AsyncAdaptedQueuePool, metrics)
+    engine = create_async_engine(async_database_url(url), echo=False, **options)
+    _instrument(engine.sync_engine, metrics)
+    return engine, metrics
+
+
+engine, pool_metrics = build_engine(settings.DATABASE_URL)
+async_engine, async_pool_metrics = build_async_engine(settings.DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: attribute access after commit would otherwise need
+# an implicit (sync) refresh, which an AsyncSession cannot do
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 
+class Replica:
+    """One read replica with its own sync and async engines"""
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.engine, self.metrics = build_engine(url)
+        self.async_engine, self.async_metrics = build_async_engine(url)
+        self.Session = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.AsyncSession = async_sessionmaker(self.async_engine, autoflush=False, expire_on_commit=False)
+        self.down_until = 0.0
+        self.last_error: Optional[str] = None
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+
+class ReplicaSet:
+    """
+    Round-robin over the healthy read replicas. A replica that fails to hand
+    out a connection is skipped for REPLICA_RETRY_SECONDS; with no healthy
+    replica left, reads go to the primary.
+    """
+
+    def __init__(self, urls: list[str], retry_seconds: float):
+        self.replicas = [Replica(f"replica-{i}", url) for i, url in enumerate(urls)]
+        self.retry_seconds = retry_seconds
+        self._counter = itertools.count()
+
+    def candidates(self) -> list[Replica]:
+        """Healthy replicas, rotated so consecutive calls start on a different one"""
+        if not self.replicas:
+            return []
+        start = next(self._counter) % len(self.replicas)
+        rotated = self.replicas[start:] + self.replicas[:start]
+        return [replica for replica in rotated if replica.healthy]
+
+    def mark_down(self, replica: Replica, error: Exception) -> None:
+        replica.down_until = time.monotonic() + self.retry_seconds
+        replica.last_error = str(error).splitlines()[0] if str(error) else type(error).__name__
+        logger.warning(f"Read replica {replica.name} unavailable, retrying in {self.retry_seconds}s: {replica.last_error}")
+
+
+replica_set = ReplicaSet(
+    [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()],
+    retry_seconds=settings.REPLICA_RETRY_SECONDS
+)
+
+# Clients that wrote recently read from the primary until replication catches up
+_recent_writers = TTLCache(maxsize=10000, ttl=settings.READ_YOUR_WRITES_SECONDS)
+_trusted_proxies = {address.strip() for address in settings.TRUSTED_PROXIES.split(",") if address.strip()}
+
+
+def client_key(request: Request) -> Optional[str]:
+    """
+    Identify the caller: the bearer token for staff; for public visitors the
+    address a trusted proxy forwarded. The address a visitor connects from
+    is not used on its own: behind a proxy every visitor shares it, and one
+    public write would send all public reads to the primary. Visitors that
+    cannot be told apart return None and are not pinned.
+    """
+    authorization = request.headers.get("authorization")
+    if authorization:
+        return hashlib.sha256(authorization.encode()).hexdigest()
+    if not request.client or request.client.host not in _trusted_proxies:
+        return None
+    # The nearest address that is not one of our proxies is the visitor's
+    forwarded = [a.strip() for a in request.headers.get("x-forwarded-for", "").split(",") if a.strip()]
+    for address in reversed(forwarded):
+        if address not in _trusted_proxies:
+            return address
+    return None
+
+
+def mark_recent_write(request: Request) -> None:
+    key = client_key(request)
+    if key is not None:
+        _recent_writers.set(key, True)
+
+
+def _read_replicas(request: Request) -> list[Replica]:
+    if not replica_set.replicas:
+        return []
+    key = client_key(request)
+    if key is not None and _recent_writers.get(key) is not None:
+        return []
+    return replica_set.candidates()
+
+
+def _pool_entry(eng, metrics: PoolMetrics) -> dict:
+    pool = eng.pool
+    entry = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        entry.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "timeout_seconds": pool.timeout()
+        })
+    entry.update(metrics.snapshot())
+    return entry
+
+
+def pool_status() -> dict:
+    """Pool sizing plus checkout metrics for the primary and replica engines"""
+    status = {
+        "sync": _pool_entry(engine, pool_metrics),
+        "async": _pool_entry(async_engine.sync_engine, async_pool_metrics)
+    }
+    if replica_set.replicas:
+        status["replicas"] = {
+            replica.name: {
+                "healthy": replica.healthy,
+                "last_error": replica.last_error,
+                "sync": _pool_entry(replica.engine, replica.metrics),
+                "async": _pool_entry(replica.async_engine.sync_engine, replica.async_metrics)
+            } for replica in replica_set.replicas
+        }
+    return status
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def open_read_session(request: Request):
+    """A Session on a healthy replica, else the primary; the caller closes it"""
+    for replica in _read_replicas(request):
+        db = replica.Session()
+        try:
+            # Check a connection out now, so a dead replica fails over here
+            # rather than in the middle of the endpoint
+            db.connection()
+            return db
+        except (DBAPIError, OSError) as e:
+            db.close()
+            replica_set.mark_down(replica, e)
+    return SessionLocal()
+
+
+def get_read_db(request: Request):
+    """Session for read-only endpoints: a healthy replica, else the primary"""
+    db = open_read_session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    """Async variant of get_read_db"""
+    db = None
+    for replica in _read_replicas(request):
+        db = replica.AsyncSession()
+        try:
+            await db.connection()
+            break
+        except (DBAPIError, OSError) as e:
+            await db.close()
+            db = None
+            replica_set.mark_down(replica, e)
+    if db is None:
+        db = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
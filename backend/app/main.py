@@ -1,14 +1,16 @@
 import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from app.config import settings
-from app.database import engine, Base
+from app.database import pool_status
+from app.middleware.auth import require_owner
+from app.middleware.read_your_writes import ReadYourWritesMiddleware
 from app.routers import (
     auth, workspace, contacts, conversations,
     bookings, services, forms, inventory,
-    staff, dashboard, public, integrations
+    staff, dashboard, public, integrations, waitlist, segments
 )
 from app.routers import calendar as calendar_router
 from app.services.scheduler_service import scheduler_service
@@ -22,9 +24,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Create tables
-Base.metadata.create_all(bind=engine)
-
 # Scheduler
 scheduler = AsyncIOScheduler()
 
@@ -47,6 +46,14 @@ async def lifespan(app: FastAPI):
         scheduler_service.run_missed_message_check,
         'interval', minutes=10, id='missed_messages'
     )
+    scheduler.add_job(
+        scheduler_service.run_waitlist_expiry,
+        'interval', minutes=1, id='waitlist_expiry'
+    )
+    scheduler.add_job(
+        scheduler_service.run_segment_refresh,
+        'interval', minutes=settings.SEGMENT_REFRESH_MINUTES, id='segment_refresh'
+    )
     scheduler.start()
     logger.info("📋 Background scheduler started")
     
@@ -80,6 +87,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ReadYourWritesMiddleware)
 
 # Register routers
 app.include_router(auth.router)
@@ -94,6 +102,8 @@ app.include_router(staff.router)
 app.include_router(dashboard.router)
 app.include_router(public.router)
 app.include_router(integrations.router)
+app.include_router(waitlist.router)
+app.include_router(segments.router)
 app.include_router(calendar_router.router)
 app.include_router(ai.router, prefix="/api")
 
@@ -111,3 +121,9 @@ async def root():
 @app.get("/health")
 async def health():
     return {"status": "healthy", "app": settings.APP_NAME}
+
+
+@app.get("/health/db", dependencies=[Depends(require_owner)])
+async def health_db():
+    """Pool and replica details, including replica errors that can name hosts; owners only"""
+    return {"status": "healthy", "pools": pool_status()}
@@ -1,19 +1,38 @@
+import hashlib
+import time
 from fastapi import Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
 from app.config import settings
 from app.database import get_db
 from app.models.user import User
+from app.services.cache import TTLCache
 
 security = HTTPBearer()
 
+# Verified token claims, keyed by token hash and kept until the token expires
+_claims_cache = TTLCache(maxsize=settings.AUTH_CACHE_MAX_ENTRIES, ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+# Column values of active users. Per process, so a deactivation reaches other
+# workers within AUTH_USER_CACHE_TTL_SECONDS even without explicit invalidation.
+_user_cache = TTLCache(maxsize=settings.AUTH_CACHE_MAX_ENTRIES, ttl=settings.AUTH_USER_CACHE_TTL_SECONDS)
+
+_USER_COLUMNS = [c.key for c in inspect(User).column_attrs]
+
+
+def invalidate_user(user_id) -> None:
+    """Drop a cached user row; call after changing role, permissions, workspace or is_active"""
+    _user_cache.invalidate(str(user_id))
+
+
+def _verify_token(token: str) -> str:
+    token_hash = hashlib.sha256(token.encode()).hexdigest()
+    user_id = _claims_cache.get(token_hash)
+    if user_id is not None:
+        return user_id
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    token = credentials.credentials
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         user_id = payload.get("sub")
@@ -22,7 +41,39 @@ async def get_current_user(
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+    ttl = payload["exp"] - time.time() if payload.get("exp") else None
+    if ttl is None or ttl > 0:
+        _claims_cache.set(token_hash, user_id, ttl=ttl)
+    return user_id
+
+
+def _cached_user(db: Session, user_id: str):
+    cached = _user_cache.get(user_id)
+    if cached is None:
+        return None
+    # Re-attach without a SELECT so routers can still modify and commit the user
+    user = User(**cached)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+def _fetch_user(db: Session, user_id: str):
     user = db.query(User).filter(User.id == user_id).first()
+    if user is not None and user.is_active:
+        _user_cache.set(user_id, {key: getattr(user, key) for key in _USER_COLUMNS})
+    return user
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    user_id = _verify_token(credentials.credentials)
+
+    user = _cached_user(db, user_id)
+    if user is None:
+        # A cache miss queries the database, which must not block the event loop
+        user = await run_in_threadpool(_fetch_user, db, user_id)
     if user is None or not user.is_active:
         raise HTTPException(status_code=401, detail="User not found or inactive")
     return user
@@ -31,4 +82,4 @@ async def get_current_user(
 async def require_owner(user: User = Depends(get_current_user)) -> User:
     if user.role.value != "owner":
         raise HTTPException(status_code=403, detail="Owner access required")
-    return user
\ No newline at end of file
+    return user
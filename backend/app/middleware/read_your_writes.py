@@ -0,0 +1,20 @@
+from starlette.requests import Request
+from app.database import mark_recent_write, replica_set
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class ReadYourWritesMiddleware:
+    """
+    Flags a client as a recent writer as soon as it sends a non-safe request,
+    so its following reads are served by the primary instead of a replica
+    that may not have replicated the write yet.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] not in SAFE_METHODS and replica_set.replicas:
+            mark_recent_write(Request(scope))
+        await self.app(scope, receive, send)
@@ -3,19 +3,23 @@ from app.models.workspace import Workspace, WorkspaceSettings
 from app.models.contact import Contact
 from app.models.conversation import Conversation
 from app.models.message import Message
-from app.models.booking import Booking
-from app.models.service import Service, Availability
+from app.models.booking import Booking, BookingSeries
+from app.models.service import Service, Availability, ServiceResource
 from app.models.form_template import FormTemplate, FormField
 from app.models.form_submission import FormSubmission
 from app.models.inventory import InventoryItem, InventoryLog
 from app.models.automation import AutomationRule, AutomationLog
 from app.models.alert import Alert
+from app.models.waitlist import WaitlistEntry
+from app.models.segment import Segment, SegmentMember
+from app.models.tag import Tag, ContactTag
 
 __all__ = [
     "User", "Workspace", "WorkspaceSettings",
     "Contact", "Conversation", "Message",
-    "Booking", "Service", "Availability",
+    "Booking", "BookingSeries", "Service", "Availability", "ServiceResource",
     "FormTemplate", "FormField", "FormSubmission",
     "InventoryItem", "InventoryLog",
-    "AutomationRule", "AutomationLog", "Alert"
+    "AutomationRule", "AutomationLog", "Alert", "WaitlistEntry",
+    "Segment", "SegmentMember", "Tag", "ContactTag"
 ]
\ No newline at end of file
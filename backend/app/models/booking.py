@@ -1,7 +1,7 @@
 import uuid
 import enum
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Enum as SQLEnum, Index, text
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -20,11 +20,28 @@ class BookingStatus(str, enum.Enum):
 
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        Index("ix_bookings_workspace_date", "workspace_id", "booking_date"),
+        Index("ix_bookings_service_status_date", "service_id", "status", "booking_date"),
+        # Contact profile: a contact's bookings newest first, and their stats
+        Index("ix_bookings_contact_date", "contact_id", "booking_date"),
+        # Segment refresh: bookings changed since the last run
+        Index("ix_bookings_workspace_updated", "workspace_id", "updated_at"),
+        # Reminder job scans confirmed bookings that have not been reminded yet
+        Index(
+            "ix_bookings_reminder_due", "booking_date",
+            postgresql_where=text("status = 'CONFIRMED' AND reminder_sent = 'no'"),
+            sqlite_where=text("status = 'CONFIRMED' AND reminder_sent = 'no'")
+        ),
+    )
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
     workspace_id = Column(String(36), ForeignKey("workspaces.id"), nullable=False)
     contact_id = Column(String(36), ForeignKey("contacts.id"), nullable=False)
     service_id = Column(String(36), ForeignKey("services.id"), nullable=False)
+    # Staff member the booking is assigned to, for services with resources
+    resource_id = Column(String(36), ForeignKey("service_resources.id"), nullable=True)
+    series_id = Column(String(36), ForeignKey("booking_series.id"), nullable=True, index=True)
     status = Column(SQLEnum(BookingStatus), default=BookingStatus.CONFIRMED)
     booking_date = Column(DateTime, nullable=False)
     end_time = Column(DateTime, nullable=False)
@@ -37,4 +54,24 @@ class Booking(Base):
 
     workspace = relationship("Workspace", back_populates="bookings")
     contact = relationship("Contact", back_populates="bookings")
-    service = relationship("Service", back_populates="bookings")
\ No newline at end of file
+    service = relationship("Service", back_populates="bookings")
+    resource = relationship("ServiceResource")
+    series = relationship("BookingSeries", back_populates="bookings")
+
+
+class BookingSeries(Base):
+    """A recurring booking: the rule its occurrences were expanded from"""
+    __tablename__ = "booking_series"
+
+    id = Column(String(36), primary_key=True, default=generate_uuid)
+    workspace_id = Column(String(36), ForeignKey("workspaces.id"), nullable=False)
+    contact_id = Column(String(36), ForeignKey("contacts.id"), nullable=False)
+    service_id = Column(String(36), ForeignKey("services.id"), nullable=False)
+    # RFC 5545 recurrence rule, expanded in the workspace's timezone from `starts_at`
+    rrule = Column(String(500), nullable=False)
+    starts_at = Column(DateTime, nullable=False)
+    notes = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    bookings = relationship("Booking", back_populates="series")
\ No newline at end of file
@@ -1,7 +1,7 @@
 import uuid
 import enum
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Enum as SQLEnum, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -14,10 +14,15 @@ class ContactSource(str, enum.Enum):
     CONTACT_FORM = "contact_form"
     BOOKING = "booking"
     MANUAL = "manual"
+    IMPORT = "import"
 
 
 class Contact(Base):
     __tablename__ = "contacts"
+    __table_args__ = (
+        # Segment refresh: contacts changed since the last run
+        Index("ix_contacts_workspace_updated", "workspace_id", "updated_at"),
+    )
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
     workspace_id = Column(String(36), ForeignKey("workspaces.id"), nullable=False)
@@ -26,7 +31,6 @@ class Contact(Base):
     phone = Column(String(50), nullable=True, index=True)
     notes = Column(Text, nullable=True)
     source = Column(SQLEnum(ContactSource), default=ContactSource.CONTACT_FORM)
-    tags = Column(String(500), nullable=True)
 
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
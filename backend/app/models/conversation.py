@@ -1,7 +1,7 @@
 import uuid
 import enum
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Enum as SQLEnum, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -18,6 +18,10 @@ class ConversationStatus(str, enum.Enum):
 
 class Conversation(Base):
     __tablename__ = "conversations"
+    __table_args__ = (
+        Index("ix_conversations_workspace_status_last", "workspace_id", "status", "last_message_at"),
+        Index("ix_conversations_contact_created", "contact_id", "created_at"),
+    )
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
     workspace_id = Column(String(36), ForeignKey("workspaces.id"), nullable=False)
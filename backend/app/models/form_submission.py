@@ -1,7 +1,7 @@
 import uuid
 import enum
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SQLEnum, JSON
+from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SQLEnum, JSON, Index, text
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -18,6 +18,17 @@ class SubmissionStatus(str, enum.Enum):
 
 class FormSubmission(Base):
     __tablename__ = "form_submissions"
+    __table_args__ = (
+        Index("ix_form_submissions_workspace_status", "workspace_id", "status"),
+        Index("ix_form_submissions_contact_created", "contact_id", "created_at"),
+        Index("ix_form_submissions_workspace_updated", "workspace_id", "updated_at"),
+        # Overdue check only ever looks at pending submissions
+        Index(
+            "ix_form_submissions_pending_due", "due_date",
+            postgresql_where=text("status = 'PENDING'"),
+            sqlite_where=text("status = 'PENDING'")
+        ),
+    )
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
     template_id = Column(String(36), ForeignKey("form_templates.id"), nullable=False)
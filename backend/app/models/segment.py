@@ -0,0 +1,45 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, JSON, Index
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+
+def generate_uuid():
+    return str(uuid.uuid4())
+
+
+class Segment(Base):
+    """A saved contact filter (see segment_service for the definition format)"""
+    __tablename__ = "segments"
+
+    id = Column(String(36), primary_key=True, default=generate_uuid)
+    workspace_id = Column(String(36), ForeignKey("workspaces.id"), nullable=False, index=True)
+    name = Column(String(255), nullable=False)
+    definition = Column(JSON, nullable=False)
+    # Size of the materialized membership as of refreshed_at
+    member_count = Column(Integer, nullable=False, default=0)
+    # Changes up to refreshed_at are reflected in segment_members; the last
+    # full recompute, which also catches time passing, is full_refreshed_at
+    refreshed_at = Column(DateTime, nullable=True)
+    full_refreshed_at = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    members = relationship("SegmentMember", back_populates="segment")
+
+
+class SegmentMember(Base):
+    """Materialized membership of a segment, kept current by the refresh job"""
+    __tablename__ = "segment_members"
+    __table_args__ = (
+        Index("ix_segment_members_contact", "contact_id"),
+    )
+
+    segment_id = Column(String(36), ForeignKey("segments.id"), primary_key=True)
+    contact_id = Column(String(36), ForeignKey("contacts.id"), primary_key=True)
+    added_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    segment = relationship("Segment", back_populates="members")
+    contact = relationship("Contact")
@@ -1,7 +1,7 @@
 import uuid
 import enum
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Text, Boolean, Enum as SQLEnum, JSON
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Text, Boolean, Enum as SQLEnum, JSON, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -31,6 +31,12 @@ class Service(Base):
     color = Column(String(7), default="#3B82F6")
     linked_form_ids = Column(JSON, nullable=True)
     linked_inventory = Column(JSON, nullable=True)
+    # Active availabilities as 5-minute ticks per weekday, rebuilt by set_availability
+    # (see app/services/availability_service.py)
+    availability_bitmap = Column(LargeBinary, nullable=True)
+    # Concurrent bookings per resource (seats in a group class); a service with
+    # several active resources can take capacity x resources at once
+    capacity = Column(Integer, nullable=False, default=1, server_default="1")
 
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -38,10 +44,14 @@ class Service(Base):
     workspace = relationship("Workspace", back_populates="services")
     availabilities = relationship("Availability", back_populates="service")
     bookings = relationship("Booking", back_populates="service")
+    resources = relationship("ServiceResource", back_populates="service")
 
 
 class Availability(Base):
     __tablename__ = "availabilities"
+    __table_args__ = (
+        Index("ix_availabilities_service_day", "service_id", "day_of_week"),
+    )
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
     service_id = Column(String(36), ForeignKey("services.id"), nullable=False)
@@ -50,4 +60,22 @@ class Availability(Base):
     end_time = Column(String(5), nullable=False)
     is_active = Column(Boolean, default=True)
 
-    service = relationship("Service", back_populates="availabilities")
\ No newline at end of file
+    service = relationship("Service", back_populates="availabilities")
+
+
+class ServiceResource(Base):
+    """A staff member who can run a service; bookings are assigned to one"""
+    __tablename__ = "service_resources"
+    __table_args__ = (
+        Index("ix_service_resources_service_user", "service_id", "user_id", unique=True),
+    )
+
+    id = Column(String(36), primary_key=True, default=generate_uuid)
+    service_id = Column(String(36), ForeignKey("services.id"), nullable=False)
+    user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
+    is_active = Column(Boolean, default=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    service = relationship("Service", back_populates="resources")
+    user = relationship("User")
@@ -0,0 +1,42 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+
+def generate_uuid():
+    return str(uuid.uuid4())
+
+
+class Tag(Base):
+    """A workspace's contact tag; key is the name compared case- and space-insensitively"""
+    __tablename__ = "tags"
+    __table_args__ = (
+        Index("ix_tags_workspace_key", "workspace_id", "key", unique=True),
+    )
+
+    id = Column(String(36), primary_key=True, default=generate_uuid)
+    workspace_id = Column(String(36), ForeignKey("workspaces.id"), nullable=False)
+    name = Column(String(100), nullable=False)
+    key = Column(String(100), nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    contacts = relationship("ContactTag", back_populates="tag")
+
+
+class ContactTag(Base):
+    """A tag on a contact"""
+    __tablename__ = "contact_tags"
+    __table_args__ = (
+        # Tag filters and facet counts: the contacts with a tag
+        Index("ix_contact_tags_tag_contact", "tag_id", "contact_id"),
+    )
+
+    contact_id = Column(String(36), ForeignKey("contacts.id"), primary_key=True)
+    tag_id = Column(String(36), ForeignKey("tags.id"), primary_key=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    contact = relationship("Contact")
+    tag = relationship("Tag", back_populates="contacts")
@@ -0,0 +1,51 @@
+import uuid
+import enum
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Text, Enum as SQLEnum, Index
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+
+def generate_uuid():
+    return str(uuid.uuid4())
+
+
+class WaitlistStatus(str, enum.Enum):
+    WAITING = "waiting"
+    OFFERED = "offered"
+    BOOKED = "booked"
+    EXPIRED = "expired"
+    CANCELLED = "cancelled"
+
+
+class WaitlistEntry(Base):
+    """A contact waiting for any slot of a service inside a time window"""
+    __tablename__ = "waitlist_entries"
+    __table_args__ = (
+        # Offer lookup: waiting entries of a service in priority, then arrival, order
+        Index("ix_waitlist_service_status_priority", "service_id", "status", "priority", "created_at"),
+        # Expiry job scans offers whose hold has run out
+        Index("ix_waitlist_status_offer_expires", "status", "offer_expires_at"),
+    )
+
+    id = Column(String(36), primary_key=True, default=generate_uuid)
+    workspace_id = Column(String(36), ForeignKey("workspaces.id"), nullable=False)
+    service_id = Column(String(36), ForeignKey("services.id"), nullable=False)
+    contact_id = Column(String(36), ForeignKey("contacts.id"), nullable=False)
+    status = Column(SQLEnum(WaitlistStatus), nullable=False, default=WaitlistStatus.WAITING)
+    # Higher goes first; equal priorities are served in order of joining
+    priority = Column(Integer, nullable=False, default=0)
+    # Naive UTC bounds a slot has to fall within
+    window_start = Column(DateTime, nullable=False)
+    window_end = Column(DateTime, nullable=False)
+    notes = Column(Text, nullable=True)
+    # The PENDING booking holding the offered slot, until accepted or expired
+    offered_booking_id = Column(String(36), ForeignKey("bookings.id"), nullable=True)
+    offer_expires_at = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    service = relationship("Service")
+    contact = relationship("Contact")
+    offered_booking = relationship("Booking")
@@ -1,10 +1,16 @@
+import json
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.middleware.auth import get_current_user
+from app.middleware.auth import get_current_user, require_owner
 from app.models.user import User
-from app.services.ai.careops_gpt import generate_careops_response
+from app.services.ai.careops_gpt import generate_careops_response, stream_careops_response, request_stats
+from app.services.ai.llm_client import llm_client, LLMBusyError, LLMError, LLMTimeoutError
+from app.services.ai.response_cache import response_cache
+from app.services.metrics_service import metrics_snapshot_service
 
 router = APIRouter(prefix="/ai", tags=["AI"])
 
@@ -14,8 +20,13 @@ class ChatRequest(BaseModel):
     message: str
 
 
+def _sse(data: dict, event: str | None = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
 @router.post("/chat")
-def chat_with_ai(
+async def chat_with_ai(
     request: ChatRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -23,11 +34,62 @@ def chat_with_ai(
     if not request.message:
         raise HTTPException(status_code=400, detail="Message is required")
 
-    response = generate_careops_response(
-    db=db,
-    workspace_id=current_user.workspace_id,
-    user_message=request.message
-)
-
+    try:
+        response = await generate_careops_response(
+            db=db,
+            workspace_id=current_user.workspace_id,
+            user_message=request.message
+        )
+    except LLMBusyError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except LLMTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except LLMError as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
     return {"response": response}
+
+
+@router.post("/chat/stream")
+async def chat_with_ai_stream(
+    request: ChatRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Same as /chat, but streams tokens as Server-Sent Events"""
+    if not request.message:
+        raise HTTPException(status_code=400, detail="Message is required")
+
+    workspace_id = current_user.workspace_id
+    if not llm_client.has_capacity(workspace_id):
+        raise HTTPException(status_code=429, detail="Too many AI requests in progress for this workspace")
+
+    # Load the metrics before streaming starts so the DB session is not held open,
+    # in a worker thread since a snapshot miss runs several aggregate queries
+    snapshot = await run_in_threadpool(metrics_snapshot_service.get_snapshot, db, workspace_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Workspace not found")
+
+    async def event_stream():
+        try:
+            async for delta in stream_careops_response(snapshot, workspace_id, request.message):
+                yield _sse({"delta": delta})
+        except LLMError as e:
+            yield _sse({"detail": str(e)}, event="error")
+            return
+        yield _sse({}, event="done")
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/cache/stats")
+async def get_cache_stats(user: User = Depends(require_owner)):
+    return {
+        "requests": request_stats.snapshot(),
+        "responses": response_cache.stats(),
+        "metrics_snapshots": metrics_snapshot_service.stats()
+    }
@@ -3,15 +3,14 @@ from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from jose import jwt
-from passlib.context import CryptContext
 from app.database import get_db
 from app.config import settings
 from app.models.user import User, UserRole
 from app.schemas.auth import RegisterRequest, LoginRequest, TokenResponse, UserResponse
-from app.middleware.auth import get_current_user
+from app.middleware.auth import get_current_user, invalidate_user
+from app.services.password_service import password_service
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def create_token(user_id: str) -> str:
@@ -28,7 +27,7 @@ async def register(req: RegisterRequest, db: Session = Depends(get_db)):
     user = User(
         id=str(uuid.uuid4()),
         email=req.email,
-        hashed_password=pwd_context.hash(req.password),
+        hashed_password=await password_service.hash(req.password),
         full_name=req.full_name,
         role=UserRole.OWNER,
         is_active=True
@@ -36,6 +35,7 @@ async def register(req: RegisterRequest, db: Session = Depends(get_db)):
     db.add(user)
     db.commit()
     db.refresh(user)
+    invalidate_user(user.id)
 
     token = create_token(str(user.id))
     return TokenResponse(
@@ -53,12 +53,23 @@ async def register(req: RegisterRequest, db: Session = Depends(get_db)):
 @router.post("/login", response_model=TokenResponse)
 async def login(req: LoginRequest, db: Session = Depends(get_db)):
     user = db.query(User).filter(User.email == req.email).first()
-    if not user or not pwd_context.verify(req.password, user.hashed_password):
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    valid, new_hash = await password_service.verify_and_update(req.password, user.hashed_password)
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     if not user.is_active:
         raise HTTPException(status_code=401, detail="Account is deactivated")
 
+    # Cost factor changed since this hash was made - upgrade it transparently
+    if new_hash:
+        user.hashed_password = new_hash
+        db.commit()
+
+    # Start each session from a fresh user row
+    invalidate_user(user.id)
     token = create_token(str(user.id))
     return TokenResponse(
         access_token=token,
@@ -1,17 +1,28 @@
 import uuid
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
-from app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import get_async_db, get_async_read_db, open_read_session
 from app.middleware.auth import get_current_user
 from app.models.user import User
-from app.models.booking import Booking, BookingStatus
+from app.models.booking import Booking, BookingSeries, BookingStatus
 from app.models.contact import Contact
-from app.models.service import Service, Availability
-from app.schemas.booking import BookingCreate, BookingResponse, BookingStatusUpdate
-from app.services.automation_engine import AutomationEngine
+from app.models.service import Service, ServiceResource
+from app.models.workspace import Workspace
+from app.schemas.booking import BookingCreate, BookingResponse, BookingSeriesCreate, BookingStatusUpdate
+from app.services.automation_engine import trigger_automation
+from app.services.availability_service import search_slots, serialize_slot, slot_columns, unpack_week
+from app.services.contact_profile import contact_stats_service
+from app.services.export_service import EXPORT_FORMATS, stream_export
+from app.services.booking_service import (
+    ACTIVE_STATUSES, SlotUnavailableError, allocate_resource, expand_series, plan_series_for_service
+)
+from app.services.timezones import day_bounds_utc, to_local, to_storage
+from app.services.waitlist_service import waitlist_service
 from app.models.automation import AutomationTrigger
 
 router = APIRouter(prefix="/api/bookings", tags=["Bookings"])
@@ -24,26 +35,29 @@ async def list_bookings(
     date_to: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     user: User = Depends(get_current_user)
 ):
-    query = db.query(Booking).filter(Booking.workspace_id == user.workspace_id)
+    query = select(Booking).where(Booking.workspace_id == user.workspace_id)
 
     if status:
-        query = query.filter(Booking.status == status)
+        query = query.where(Booking.status == status)
     if date_from:
-        query = query.filter(Booking.booking_date >= datetime.fromisoformat(date_from))
+        query = query.where(Booking.booking_date >= datetime.fromisoformat(date_from))
     if date_to:
-        query = query.filter(Booking.booking_date <= datetime.fromisoformat(date_to))
+        query = query.where(Booking.booking_date <= datetime.fromisoformat(date_to))
 
-    total = query.count()
-    bookings = query.order_by(Booking.booking_date.asc()).offset((page - 1) * limit).limit(limit).all()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    # Contact and service come with each booking in the same query
+    rows = (await db.execute(
+        query.add_columns(Contact, Service)
+        .outerjoin(Contact, Contact.id == Booking.contact_id)
+        .outerjoin(Service, Service.id == Booking.service_id)
+        .order_by(Booking.booking_date.asc()).offset((page - 1) * limit).limit(limit)
+    )).all()
 
     result = []
-    for b in bookings:
-        contact = db.query(Contact).filter(Contact.id == b.contact_id).first()
-        service = db.query(Service).filter(Service.id == b.service_id).first()
-
+    for b, contact, service in rows:
         result.append({
             "id": str(b.id),
             "contact": {
@@ -69,30 +83,90 @@ async def list_bookings(
     return {"bookings": result, "total": total, "page": page}
 
 
+@router.get("/export")
+async def export_bookings(
+    request: Request,
+    fmt: str = Query("csv", alias="format", description="csv or ndjson"),
+    date_from: Optional[str] = Query(None, description="First day, YYYY-MM-DD"),
+    date_to: Optional[str] = Query(None, description="Last day (inclusive), YYYY-MM-DD"),
+    status: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    user: User = Depends(get_current_user)
+):
+    """
+    Every booking in a range of days, in the workspace's timezone, with its
+    contact, service and staff member, streamed from one joined query
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Format must be one of: {list(EXPORT_FORMATS)}")
+
+    tz_name = await db.scalar(select(Workspace.timezone).where(Workspace.id == user.workspace_id))
+    query = select(
+        Booking.id.label("booking_id"),
+        Booking.booking_date.label("start"),
+        Booking.end_time.label("end"),
+        Booking.status,
+        Service.name.label("service"),
+        Service.duration_minutes,
+        Service.price,
+        Contact.name.label("contact_name"),
+        Contact.email.label("contact_email"),
+        Contact.phone.label("contact_phone"),
+        User.full_name.label("staff"),
+        Booking.series_id,
+        Booking.notes,
+        Booking.created_at
+    ).join(Service, Service.id == Booking.service_id).join(
+        Contact, Contact.id == Booking.contact_id
+    ).outerjoin(
+        ServiceResource, ServiceResource.id == Booking.resource_id
+    ).outerjoin(
+        User, User.id == ServiceResource.user_id
+    ).where(Booking.workspace_id == user.workspace_id)
+
+    try:
+        if date_from:
+            query = query.where(Booking.booking_date >= day_bounds_utc(datetime.strptime(date_from, "%Y-%m-%d").date(), tz_name)[0])
+        if date_to:
+            query = query.where(Booking.booking_date < day_bounds_utc(datetime.strptime(date_to, "%Y-%m-%d").date(), tz_name)[1])
+        if status:
+            query = query.where(Booking.status == BookingStatus(status))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates must be YYYY-MM-DD and status a booking status")
+
+    filename = f"bookings-{date_from or 'start'}-{date_to or 'end'}"
+    return stream_export(
+        partial(open_read_session, request),
+        query.order_by(Booking.booking_date, Booking.id),
+        tz_name, fmt, filename
+    )
+
+
 @router.get("/today")
 async def get_today_bookings(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user: User = Depends(get_current_user)
 ):
     today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
     today_end = today_start + timedelta(days=1)
 
-    bookings = db.query(Booking).filter(
+    rows = (await db.execute(select(
+        Booking, Contact.name.label("contact_name"), Service.name.label("service_name"), Service.color
+    ).outerjoin(Contact, Contact.id == Booking.contact_id).outerjoin(
+        Service, Service.id == Booking.service_id
+    ).where(
         Booking.workspace_id == user.workspace_id,
         Booking.booking_date >= today_start,
         Booking.booking_date < today_end
-    ).order_by(Booking.booking_date.asc()).all()
+    ).order_by(Booking.booking_date.asc()))).all()
 
     result = []
-    for b in bookings:
-        contact = db.query(Contact).filter(Contact.id == b.contact_id).first()
-        service = db.query(Service).filter(Service.id == b.service_id).first()
-
+    for b, contact_name, service_name, service_color in rows:
         result.append({
             "id": str(b.id),
-            "contact_name": contact.name if contact else "Unknown",
-            "service_name": service.name if service else "Unknown",
-            "service_color": service.color if service else "#3B82F6",
+            "contact_name": contact_name or "Unknown",
+            "service_name": service_name or "Unknown",
+            "service_color": service_color if service_name else "#3B82F6",
             "status": b.status.value,
             "booking_date": str(b.booking_date),
             "end_time": str(b.end_time)
@@ -104,53 +178,54 @@ async def get_today_bookings(
 @router.post("/", response_model=BookingResponse)
 async def create_booking(
     req: BookingCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user: User = Depends(get_current_user)
 ):
-    service = db.query(Service).filter(
+    service = await db.scalar(select(Service).where(
         Service.id == req.service_id,
         Service.workspace_id == user.workspace_id
-    ).first()
+    ))
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
 
-    # Check for conflicting bookings
-    end_time = req.booking_date + timedelta(minutes=service.duration_minutes)
-    conflicts = db.query(Booking).filter(
-        Booking.workspace_id == user.workspace_id,
-        Booking.service_id == req.service_id,
-        Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING]),
-        Booking.booking_date < end_time,
-        Booking.end_time > req.booking_date
-    ).count()
-
-    if conflicts > 0:
+    # Stored as naive UTC; a naive request value is wall-clock time in the workspace's zone
+    tz_name = None
+    if req.booking_date.tzinfo is None:
+        tz_name = await db.scalar(select(Workspace.timezone).where(Workspace.id == user.workspace_id))
+    booking_date = to_storage(req.booking_date, tz_name)
+
+    # Check the service still has capacity and pick the staff member to assign
+    end_time = booking_date + timedelta(minutes=service.duration_minutes)
+    try:
+        resource_id = await allocate_resource(db, service, booking_date, end_time)
+    except SlotUnavailableError:
         raise HTTPException(status_code=409, detail="Time slot already booked")
 
-    contact = db.query(Contact).filter(
+    contact = await db.scalar(select(Contact).where(
         Contact.id == req.contact_id,
         Contact.workspace_id == user.workspace_id
-    ).first()
+    ))
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
 
     booking = Booking(
-        id=uuid.uuid4(),
+        id=str(uuid.uuid4()),
         workspace_id=user.workspace_id,
         contact_id=contact.id,
         service_id=service.id,
+        resource_id=resource_id,
         status=BookingStatus.CONFIRMED,
-        booking_date=req.booking_date,
+        booking_date=booking_date,
         end_time=end_time,
         notes=req.notes
     )
     db.add(booking)
-    db.commit()
-    db.refresh(booking)
+    await db.commit()
+    await db.refresh(booking)
+    contact_stats_service.invalidate(contact.id)
 
     # Trigger automation
-    engine = AutomationEngine(db)
-    await engine.trigger(user.workspace_id, AutomationTrigger.BOOKING_CREATED, {
+    await trigger_automation(user.workspace_id, AutomationTrigger.BOOKING_CREATED, {
         "booking": booking,
         "contact": contact,
         "service": service
@@ -159,17 +234,158 @@ async def create_booking(
     return booking
 
 
+@router.post("/series")
+async def create_booking_series(
+    req: BookingSeriesCreate,
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_user)
+):
+    """
+    Book every occurrence of a recurrence rule (RFC 5545 RRULE, e.g.
+    "FREQ=WEEKLY;COUNT=12") at once. All occurrences are checked against
+    one range query of existing bookings and inserted in one transaction,
+    and the contact gets a single confirmation listing them. If any
+    occurrence is taken the series is rejected with the conflicts, unless
+    skip_conflicts books the rest.
+    """
+    service = await db.scalar(select(Service).where(
+        Service.id == req.service_id,
+        Service.workspace_id == user.workspace_id
+    ))
+    if not service:
+        raise HTTPException(status_code=404, detail="Service not found")
+
+    contact = await db.scalar(select(Contact).where(
+        Contact.id == req.contact_id,
+        Contact.workspace_id == user.workspace_id
+    ))
+    if not contact:
+        raise HTTPException(status_code=404, detail="Contact not found")
+
+    # Occurrences repeat in wall-clock time, so an aware start is moved into the workspace's zone
+    tz_name = await db.scalar(select(Workspace.timezone).where(Workspace.id == user.workspace_id))
+    local_start = to_local(to_storage(req.starts_at, tz_name), tz_name).replace(tzinfo=None)
+    try:
+        occurrences = expand_series(
+            req.rrule, local_start, service.duration_minutes, tz_name, settings.BOOKING_SERIES_MAX_OCCURRENCES
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid recurrence rule: {e}")
+    if not occurrences:
+        raise HTTPException(status_code=400, detail="Recurrence rule has no occurrences")
+
+    placed, conflicts = await plan_series_for_service(db, service, occurrences)
+    skipped = [{"start": to_local(start, tz_name).isoformat(), "end": to_local(end, tz_name).isoformat()} for start, end in conflicts]
+    if conflicts and (not req.skip_conflicts or not placed):
+        raise HTTPException(status_code=409, detail={
+            "message": f"{len(conflicts)} of {len(occurrences)} occurrences are already booked",
+            "conflicts": skipped
+        })
+
+    series = BookingSeries(
+        id=str(uuid.uuid4()),
+        workspace_id=user.workspace_id,
+        contact_id=contact.id,
+        service_id=service.id,
+        rrule=req.rrule,
+        starts_at=occurrences[0][0],
+        notes=req.notes
+    )
+    db.add(series)
+    await db.flush()
+
+    rows = [{
+        "id": str(uuid.uuid4()),
+        "workspace_id": user.workspace_id,
+        "contact_id": contact.id,
+        "service_id": service.id,
+        "resource_id": resource_id,
+        "series_id": series.id,
+        "status": BookingStatus.CONFIRMED,
+        "booking_date": start,
+        "end_time": end,
+        "notes": req.notes
+    } for start, end, resource_id in placed]
+    await db.execute(insert(Booking), rows)
+    await db.commit()
+    contact_stats_service.invalidate(contact.id)
+
+    # One automation run for the whole series
+    await trigger_automation(user.workspace_id, AutomationTrigger.BOOKING_CREATED, {
+        "series": series,
+        "contact": contact,
+        "service": service
+    })
+
+    return {
+        "series_id": series.id,
+        "created": len(rows),
+        "bookings": [{
+            "id": row["id"],
+            "booking_date": to_local(row["booking_date"], tz_name).isoformat(),
+            "end_time": to_local(row["end_time"], tz_name).isoformat(),
+            "resource_id": row["resource_id"]
+        } for row in rows],
+        "skipped": skipped
+    }
+
+
+@router.delete("/series/{series_id}")
+async def cancel_booking_series(
+    series_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_user)
+):
+    """
+    Cancel the upcoming occurrences of a series; past ones keep their status.
+    Each freed slot is offered to the service's waitlist, as a single
+    cancellation is.
+    """
+    series = await db.scalar(select(BookingSeries).where(
+        BookingSeries.id == series_id,
+        BookingSeries.workspace_id == user.workspace_id
+    ))
+    if not series:
+        raise HTTPException(status_code=404, detail="Series not found")
+
+    now = datetime.utcnow()
+    upcoming = (await db.execute(select(
+        Booking.id, Booking.service_id, Booking.booking_date, Booking.end_time
+    ).where(
+        Booking.series_id == series.id,
+        Booking.status.in_(ACTIVE_STATUSES),
+        Booking.booking_date >= now
+    ).order_by(Booking.booking_date))).all()
+    result = await db.execute(update(Booking).where(
+        Booking.id.in_([b.id for b in upcoming]),
+        Booking.status.in_(ACTIVE_STATUSES)
+    ).values(status=BookingStatus.CANCELLED, updated_at=now))
+    await waitlist_service.close_offers_for(db, [b.id for b in upcoming])
+    await db.commit()
+    contact_stats_service.invalidate(series.contact_id)
+
+    offered = 0
+    for booking in upcoming:
+        if await waitlist_service.offer_slot(
+            db, booking.service_id, booking.booking_date, booking.end_time,
+            exclude_contact_id=series.contact_id
+        ):
+            offered += 1
+
+    return {"status": "success", "cancelled": result.rowcount, "offered": offered}
+
+
 @router.put("/{booking_id}/status")
 async def update_booking_status(
     booking_id: str,
     req: BookingStatusUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user: User = Depends(get_current_user)
 ):
-    booking = db.query(Booking).filter(
+    booking = await db.scalar(select(Booking).where(
         Booking.id == booking_id,
         Booking.workspace_id == user.workspace_id
-    ).first()
+    ))
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
 
@@ -177,8 +393,19 @@ async def update_booking_status(
     if req.status not in valid_statuses:
         raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {valid_statuses}")
 
+    previous = booking.status
     booking.status = BookingStatus(req.status)
-    db.commit()
+    if booking.status == BookingStatus.CANCELLED:
+        await waitlist_service.close_offers_for(db, [booking.id])
+    await db.commit()
+    contact_stats_service.invalidate(booking.contact_id)
+
+    # A cancelled slot is offered to the next customer on the service's waitlist
+    if booking.status == BookingStatus.CANCELLED and previous in ACTIVE_STATUSES:
+        await waitlist_service.offer_slot(
+            db, booking.service_id, booking.booking_date, booking.end_time,
+            exclude_contact_id=booking.contact_id
+        )
 
     return {"status": "success", "booking_status": booking.status.value}
 
@@ -187,53 +414,35 @@ async def update_booking_status(
 async def get_available_slots(
     service_id: str,
     date: str = Query(..., description="Date in YYYY-MM-DD format"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Public endpoint to get available time slots for a service"""
-    service = db.query(Service).filter(Service.id == service_id, Service.is_active == True).first()
+    service = (await db.execute(select(
+        *slot_columns(), Workspace.timezone
+    ).join(Workspace, Workspace.id == Service.workspace_id).where(
+        Service.id == service_id,
+        Service.is_active == True
+    ))).first()
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
 
-    target_date = datetime.strptime(date, "%Y-%m-%d")
-    day_of_week = target_date.weekday()
-
-    # Get availability for this day
-    availabilities = db.query(Availability).filter(
-        Availability.service_id == service.id,
-        Availability.day_of_week == day_of_week,
-        Availability.is_active == True
-    ).all()
-
-    if not availabilities:
+    # `date` is a day in the workspace's timezone
+    target_date = datetime.strptime(date, "%Y-%m-%d").date()
+    if not unpack_week(service.availability_bitmap)[target_date.weekday()]:
         return {"slots": [], "message": "No availability on this day"}
 
-    # Generate slots
-    slots = []
-    for avail in availabilities:
-        start_hour, start_min = map(int, avail.start_time.split(":"))
-        end_hour, end_min = map(int, avail.end_time.split(":"))
-
-        current = target_date.replace(hour=start_hour, minute=start_min, second=0, microsecond=0)
-        end = target_date.replace(hour=end_hour, minute=end_min, second=0, microsecond=0)
-
-        while current + timedelta(minutes=service.duration_minutes) <= end:
-            slot_end = current + timedelta(minutes=service.duration_minutes)
-
-            # Check if slot is already booked
-            conflict = db.query(Booking).filter(
-                Booking.service_id == service.id,
-                Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING]),
-                Booking.booking_date < slot_end,
-                Booking.end_time > current
-            ).count()
-
-            if conflict == 0 and current > datetime.utcnow():
-                slots.append({
-                    "start": str(current),
-                    "end": str(slot_end),
-                    "display": current.strftime("%I:%M %p")
-                })
-
-            current += timedelta(minutes=service.duration_minutes)
+    # One query for the day's bookings, then slot generation is bitwise
+    day_start, day_end = day_bounds_utc(target_date, service.timezone)
+    booked = (await db.execute(select(Booking.service_id, Booking.booking_date, Booking.end_time).where(
+        Booking.service_id == service.id,
+        Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING]),
+        Booking.booking_date < day_end,
+        Booking.end_time > day_start
+    ))).all()
+
+    slots = [
+        serialize_slot(start, end, service.timezone, remaining)
+        for start, end, _svc, remaining in search_slots([service], booked, target_date, 1, datetime.utcnow(), service.timezone)
+    ]
 
     return {"slots": slots, "date": date, "service": service.name}
\ No newline at end of file
@@ -1,28 +1,57 @@
+import io
 import uuid
 from datetime import datetime
+from functools import partial
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from app.database import get_db
+from sqlalchemy import func, or_, select
+from app.config import settings
+from app.database import get_db, get_read_db, open_read_session
 from app.middleware.auth import get_current_user
 from app.models.user import User
+from app.models.booking import Booking
 from app.models.contact import Contact, ContactSource
 from app.models.conversation import Conversation, ConversationStatus
+from app.models.form_submission import FormSubmission
 from app.models.message import Message, MessageType, MessageDirection, MessageStatus
-from app.schemas.contact import ContactCreate, ContactResponse
+from app.models.segment import Segment, SegmentMember
+from app.models.tag import ContactTag, Tag
+from app.models.workspace import Workspace
+from app.schemas.contact import ContactCreate, ContactResponse, ContactTagsBulk
+from app.services.contact_profile import contact_stats_service
+from app.services.export_service import EXPORT_FORMATS, stream_export
+from app.services.import_service import IMPORT_FORMATS, ContactImporter, parse_rows, spool, welcome_in_background
+from app.services.metrics_service import metrics_snapshot_service
+from app.services.pagination import keyset_page
+from app.services.tag_service import (
+    FACET_LIMIT, add_tags, remove_tags, split_tags, tag_counts, tag_key, tag_names, with_tags
+)
 from app.services.automation_engine import AutomationEngine
 from app.models.automation import AutomationTrigger
 
 router = APIRouter(prefix="/api/contacts", tags=["Contacts"])
 
 
+def _responses(db: Session, contacts: list[Contact]) -> list[ContactResponse]:
+    names = tag_names(db, [c.id for c in contacts])
+    responses = []
+    for contact in contacts:
+        response = ContactResponse.from_orm(contact)
+        response.tags = names.get(contact.id, [])
+        responses.append(response)
+    return responses
+
+
 @router.get("/")
 async def list_contacts(
     search: Optional[str] = Query(None),
+    tag: list[str] = Query([], description="Only contacts with every one of these tags"),
+    facets: bool = Query(False, description="Also count the matching contacts under each tag"),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user: User = Depends(get_current_user)
 ):
     query = db.query(Contact).filter(Contact.workspace_id == user.workspace_id)
@@ -36,53 +65,271 @@ async def list_contacts(
             )
         )
 
+    if tag:
+        query = query.filter(with_tags(user.workspace_id, tag))
+
     total = query.count()
     contacts = query.order_by(Contact.created_at.desc()).offset((page - 1) * limit).limit(limit).all()
 
-    return {
-        "contacts": [ContactResponse.from_orm(c) for c in contacts],
+    result = {
+        "contacts": _responses(db, contacts),
         "total": total,
         "page": page,
         "pages": (total + limit - 1) // limit
     }
+    if facets:
+        result["facets"] = tag_counts(
+            db, user.workspace_id, contacts=query.with_entities(Contact.id).statement, limit=FACET_LIMIT
+        )
+    return result
 
 
-@router.get("/{contact_id}")
-async def get_contact(
-    contact_id: str,
+@router.get("/export")
+async def export_contacts(
+    request: Request,
+    fmt: str = Query("csv", alias="format", description="csv or ndjson"),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user)
+):
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Format must be one of: {list(EXPORT_FORMATS)}")
+
+    tz_name = db.query(Workspace.timezone).filter(Workspace.id == user.workspace_id).scalar()
+    tags = select(func.aggregate_strings(Tag.name, ", ")).join(
+        ContactTag, ContactTag.tag_id == Tag.id
+    ).where(ContactTag.contact_id == Contact.id).scalar_subquery()
+    query = select(
+        Contact.id.label("contact_id"),
+        Contact.name,
+        Contact.email,
+        Contact.phone,
+        Contact.source,
+        tags.label("tags"),
+        Contact.notes,
+        Contact.created_at
+    ).where(Contact.workspace_id == user.workspace_id).order_by(Contact.created_at, Contact.id)
+
+    return stream_export(partial(open_read_session, request), query, tz_name, fmt, "contacts")
+
+
+@router.post("/import")
+async def import_contacts(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    fmt: str = Query("csv", alias="format", description="csv or ndjson"),
+    welcome: bool = Query(False, description="Open a conversation with each new contact and send the welcome automation"),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user)
+):
+    """
+    Bulk upsert contacts from the request body: CSV with a header row or
+    NDJSON, with name (or first_name/last_name), email, phone, notes and tags.
+    With welcome, new contacts are welcomed in the background after the
+    summary is returned.
+    """
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Format must be one of: {list(IMPORT_FORMATS)}")
+
+    upload = await spool(request.stream())
+    try:
+        lines = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+        importer = ContactImporter(db, user.workspace_id)
+        # Parsing and the chunked writes are blocking, so they run off the event loop
+        summary = await run_in_threadpool(importer.run, parse_rows(lines, fmt))
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="The file must be UTF-8 encoded")
+    finally:
+        upload.close()
+
+    if welcome:
+        # Opening a conversation and sending a welcome per new contact takes
+        # minutes for a large file, so it runs after the summary is returned
+        summary["welcoming"] = len(importer.created_ids)
+        if importer.created_ids:
+            background_tasks.add_task(welcome_in_background, user.workspace_id, importer.created_ids)
+    metrics_snapshot_service.invalidate(user.workspace_id)
+    return summary
+
+
+@router.get("/tags")
+async def list_tags(
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user)
+):
+    """Every tag of the workspace with its number of contacts"""
+    return {"tags": tag_counts(db, user.workspace_id)}
+
+
+@router.post("/tags/bulk")
+async def bulk_tag_contacts(
+    req: ContactTagsBulk,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user)
 ):
+    """
+    Add and remove tags on many contacts at once, given by id (up to
+    BULK_TAG_MAX_CONTACTS) or as the current members of a segment
+    """
+    try:
+        add, remove = split_tags(req.add), split_tags(req.remove)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not add and not remove:
+        raise HTTPException(status_code=400, detail="Give tags to add or remove")
+    if {tag_key(t) for t in add} & {tag_key(t) for t in remove}:
+        raise HTTPException(status_code=400, detail="A tag cannot be both added and removed")
+    if (req.contact_ids is None) == (req.segment_id is None):
+        raise HTTPException(status_code=400, detail="Give either contact_ids or segment_id")
+
+    if req.segment_id is not None:
+        segment = db.query(Segment.id).filter(
+            Segment.id == req.segment_id,
+            Segment.workspace_id == user.workspace_id
+        ).first()
+        if not segment:
+            raise HTTPException(status_code=404, detail="Segment not found")
+        contacts = select(SegmentMember.contact_id).where(SegmentMember.segment_id == req.segment_id)
+    else:
+        if len(req.contact_ids) > settings.BULK_TAG_MAX_CONTACTS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {settings.BULK_TAG_MAX_CONTACTS} contact_ids per request; tag a segment for more"
+            )
+        contacts = select(Contact.id).where(
+            Contact.workspace_id == user.workspace_id,
+            Contact.id.in_(set(req.contact_ids))
+        )
+
+    removed = remove_tags(db, user.workspace_id, contacts, remove) if remove else 0
+    added = add_tags(db, user.workspace_id, contacts, add) if add else 0
+    db.commit()
+    return {"added": added, "removed": removed}
+
+
+@router.delete("/tags/{tag_id}")
+async def delete_tag(
+    tag_id: str,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user)
+):
+    """Delete a tag, taking it off every contact"""
+    tag = db.query(Tag).filter(Tag.id == tag_id, Tag.workspace_id == user.workspace_id).first()
+    if not tag:
+        raise HTTPException(status_code=404, detail="Tag not found")
+    contacts = select(Contact.id).where(Contact.workspace_id == user.workspace_id)
+    removed = remove_tags(db, user.workspace_id, contacts, [tag.name])
+    db.delete(tag)
+    db.commit()
+    return {"message": "Tag deleted", "removed": removed}
+
+
+def _get_contact(db: Session, contact_id: str, user: User) -> Contact:
     contact = db.query(Contact).filter(
         Contact.id == contact_id,
         Contact.workspace_id == user.workspace_id
     ).first()
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
+    return contact
+
+
+def _page(query, sort_column, id_column, cursor: Optional[str], limit: int):
+    try:
+        return keyset_page(query, sort_column, id_column, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 
-    # Get related data
-    conversations = db.query(Conversation).filter(
+def _conversations_page(db: Session, contact: Contact, cursor: Optional[str], limit: int) -> tuple[list, Optional[str]]:
+    conversations, next_cursor = _page(db.query(Conversation).filter(
+        Conversation.workspace_id == contact.workspace_id,
         Conversation.contact_id == contact.id
-    ).all()
+    ), Conversation.created_at, Conversation.id, cursor, limit)
+    return [{"id": str(c.id), "status": c.status.value, "last_message_at": str(c.last_message_at)} for c in conversations], next_cursor
 
-    from app.models.booking import Booking
-    bookings = db.query(Booking).filter(
+
+def _bookings_page(db: Session, contact: Contact, cursor: Optional[str], limit: int) -> tuple[list, Optional[str]]:
+    bookings, next_cursor = _page(db.query(Booking).filter(
+        Booking.workspace_id == contact.workspace_id,
         Booking.contact_id == contact.id
-    ).order_by(Booking.booking_date.desc()).all()
+    ), Booking.booking_date, Booking.id, cursor, limit)
+    return [{"id": str(b.id), "status": b.status.value, "date": str(b.booking_date), "service_id": str(b.service_id)} for b in bookings], next_cursor
+
 
-    from app.models.form_submission import FormSubmission
-    forms = db.query(FormSubmission).filter(
+def _forms_page(db: Session, contact: Contact, cursor: Optional[str], limit: int) -> tuple[list, Optional[str]]:
+    forms, next_cursor = _page(db.query(FormSubmission).filter(
+        FormSubmission.workspace_id == contact.workspace_id,
         FormSubmission.contact_id == contact.id
-    ).all()
+    ), FormSubmission.created_at, FormSubmission.id, cursor, limit)
+    return [{"id": str(f.id), "status": f.status.value, "template_id": str(f.template_id)} for f in forms], next_cursor
+
+
+@router.get("/{contact_id}")
+async def get_contact(
+    contact_id: str,
+    limit: int = Query(10, ge=1, le=50, description="Items per list"),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user)
+):
+    """
+    The contact, its booking and form stats and the most recent conversations,
+    bookings and forms; next_cursors continue each list on its own endpoint
+    """
+    contact = _get_contact(db, contact_id, user)
+    conversations, conversations_cursor = _conversations_page(db, contact, None, limit)
+    bookings, bookings_cursor = _bookings_page(db, contact, None, limit)
+    forms, forms_cursor = _forms_page(db, contact, None, limit)
 
     return {
-        "contact": ContactResponse.from_orm(contact),
-        "conversations": [{"id": str(c.id), "status": c.status.value, "last_message_at": str(c.last_message_at)} for c in conversations],
-        "bookings": [{"id": str(b.id), "status": b.status.value, "date": str(b.booking_date), "service_id": str(b.service_id)} for b in bookings],
-        "forms": [{"id": str(f.id), "status": f.status.value, "template_id": str(f.template_id)} for f in forms]
+        "contact": _responses(db, [contact])[0],
+        "stats": contact_stats_service.get(db, user.workspace_id, contact.id),
+        "conversations": conversations,
+        "bookings": bookings,
+        "forms": forms,
+        "next_cursors": {
+            "conversations": conversations_cursor,
+            "bookings": bookings_cursor,
+            "forms": forms_cursor
+        }
     }
 
 
+@router.get("/{contact_id}/conversations")
+async def list_contact_conversations(
+    contact_id: str,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user)
+):
+    conversations, next_cursor = _conversations_page(db, _get_contact(db, contact_id, user), cursor, limit)
+    return {"conversations": conversations, "next_cursor": next_cursor}
+
+
+@router.get("/{contact_id}/bookings")
+async def list_contact_bookings(
+    contact_id: str,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user)
+):
+    bookings, next_cursor = _bookings_page(db, _get_contact(db, contact_id, user), cursor, limit)
+    return {"bookings": bookings, "next_cursor": next_cursor}
+
+
+@router.get("/{contact_id}/forms")
+async def list_contact_forms(
+    contact_id: str,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user)
+):
+    forms, next_cursor = _forms_page(db, _get_contact(db, contact_id, user), cursor, limit)
+    return {"forms": forms, "next_cursor": next_cursor}
+
+
 @router.post("/", response_model=ContactResponse)
 async def create_contact(
     req: ContactCreate,
@@ -90,7 +337,7 @@ async def create_contact(
     user: User = Depends(get_current_user)
 ):
     contact = Contact(
-        id=uuid.uuid4(),
+        id=str(uuid.uuid4()),
         workspace_id=user.workspace_id,
         name=req.name,
         email=req.email,
@@ -102,7 +349,7 @@ async def create_contact(
 
     # Create conversation
     conversation = Conversation(
-        id=uuid.uuid4(),
+        id=str(uuid.uuid4()),
         workspace_id=user.workspace_id,
         contact_id=contact.id,
         subject=f"Conversation with {req.name}",
@@ -120,7 +367,7 @@ async def create_contact(
         "conversation": conversation
     })
 
-    return contact
+    return _responses(db, [contact])[0]
 
 
 @router.put("/{contact_id}", response_model=ContactResponse)
@@ -147,4 +394,4 @@ async def update_contact(
 
     db.commit()
     db.refresh(contact)
-    return contact
\ No newline at end of file
+    return _responses(db, [contact])[0]
\ No newline at end of file
@@ -2,14 +2,16 @@ import uuid
 from datetime import datetime
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
-from app.database import get_db
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from app.database import get_async_db, get_async_read_db
 from app.middleware.auth import get_current_user
 from app.models.user import User
 from app.models.contact import Contact
 from app.models.conversation import Conversation, ConversationStatus
 from app.models.message import Message, MessageType, MessageDirection, MessageStatus
-from app.services.automation_engine import AutomationEngine
+from app.services.automation_engine import trigger_automation
 from app.services.email_service import EmailService
 from app.services.sms_service import SMSService
 from app.models.automation import AutomationTrigger
@@ -22,34 +24,34 @@ async def list_conversations(
     status: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     user: User = Depends(get_current_user)
 ):
-    query = db.query(Conversation).filter(
+    query = select(Conversation).where(
         Conversation.workspace_id == user.workspace_id
     )
 
     if status:
-        query = query.filter(Conversation.status == status)
+        query = query.where(Conversation.status == status)
 
-    total = query.count()
-    conversations = query.options(
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    conversations = (await db.scalars(query.options(
         joinedload(Conversation.contact)
     ).order_by(
         Conversation.last_message_at.desc().nullslast()
-    ).offset((page - 1) * limit).limit(limit).all()
+    ).offset((page - 1) * limit).limit(limit))).all()
 
     result = []
     for conv in conversations:
-        last_message = db.query(Message).filter(
+        last_message = await db.scalar(select(Message).where(
             Message.conversation_id == conv.id
-        ).order_by(Message.created_at.desc()).first()
+        ).order_by(Message.created_at.desc()).limit(1))
 
-        unread_count = db.query(Message).filter(
+        unread_count = await db.scalar(select(func.count()).select_from(Message).where(
             Message.conversation_id == conv.id,
             Message.direction == MessageDirection.INBOUND,
             Message.status != MessageStatus.DELIVERED
-        ).count()
+        ))
 
         result.append({
             "id": str(conv.id),
@@ -79,21 +81,21 @@ async def list_conversations(
 @router.get("/{conversation_id}")
 async def get_conversation(
     conversation_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user: User = Depends(get_current_user)
 ):
-    conv = db.query(Conversation).filter(
+    conv = await db.scalar(select(Conversation).where(
         Conversation.id == conversation_id,
         Conversation.workspace_id == user.workspace_id
-    ).first()
+    ))
     if not conv:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    contact = db.query(Contact).filter(Contact.id == conv.contact_id).first()
+    contact = await db.scalar(select(Contact).where(Contact.id == conv.contact_id))
 
-    messages = db.query(Message).filter(
+    messages = (await db.scalars(select(Message).where(
         Message.conversation_id == conv.id
-    ).order_by(Message.created_at.asc()).all()
+    ).order_by(Message.created_at.asc()))).all()
 
     return {
         "conversation": {
@@ -126,17 +128,17 @@ async def get_conversation(
 async def reply_to_conversation(
     conversation_id: str,
     body: dict,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user: User = Depends(get_current_user)
 ):
-    conv = db.query(Conversation).filter(
+    conv = await db.scalar(select(Conversation).where(
         Conversation.id == conversation_id,
         Conversation.workspace_id == user.workspace_id
-    ).first()
+    ))
     if not conv:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    contact = db.query(Contact).filter(Contact.id == conv.contact_id).first()
+    contact = await db.scalar(select(Contact).where(Contact.id == conv.contact_id))
 
     content = body.get("content", "")
     channel = body.get("channel", "email")  # email or sms
@@ -146,7 +148,7 @@ async def reply_to_conversation(
 
     # Create message
     message = Message(
-        id=uuid.uuid4(),
+        id=str(uuid.uuid4()),
         conversation_id=conv.id,
         sender_id=user.id,
         message_type=MessageType.EMAIL if channel == "email" else MessageType.SMS,
@@ -160,11 +162,11 @@ async def reply_to_conversation(
     # Update conversation
     conv.status = ConversationStatus.REPLIED
     conv.last_message_at = datetime.utcnow()
-    db.commit()
+    await db.commit()
 
     # Send through channel
     from app.models.workspace import Workspace
-    workspace = db.query(Workspace).filter(Workspace.id == user.workspace_id).first()
+    workspace = await db.scalar(select(Workspace).where(Workspace.id == user.workspace_id))
 
     if channel == "email" and contact.email:
         email_svc = EmailService({"provider": workspace.email_provider})
@@ -174,8 +176,7 @@ async def reply_to_conversation(
         await sms_svc.send_sms(contact.phone, content)
 
     # Trigger staff reply automation (pause further automation)
-    engine = AutomationEngine(db)
-    await engine.trigger(user.workspace_id, AutomationTrigger.STAFF_REPLY, {
+    await trigger_automation(user.workspace_id, AutomationTrigger.STAFF_REPLY, {
         "conversation_id": conv.id
     })
 
@@ -186,19 +187,19 @@ async def reply_to_conversation(
 async def update_conversation_status(
     conversation_id: str,
     body: dict,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user: User = Depends(get_current_user)
 ):
-    conv = db.query(Conversation).filter(
+    conv = await db.scalar(select(Conversation).where(
         Conversation.id == conversation_id,
         Conversation.workspace_id == user.workspace_id
-    ).first()
+    ))
     if not conv:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
     new_status = body.get("status")
     if new_status in [s.value for s in ConversationStatus]:
         conv.status = ConversationStatus(new_status)
-        db.commit()
+        await db.commit()
 
     return {"status": "success"}
\ No newline at end of file
@@ -1,8 +1,8 @@
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.database import get_db
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db, get_async_read_db
 from app.middleware.auth import get_current_user
 from app.models.user import User
 from app.models.booking import Booking, BookingStatus
@@ -17,7 +17,7 @@ router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
 
 @router.get("/")
 async def get_dashboard(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     user: User = Depends(get_current_user)
 ):
     workspace_id = user.workspace_id
@@ -27,90 +27,90 @@ async def get_dashboard(
     week_end = today_start + timedelta(days=7)
 
     # === Booking Overview ===
-    todays_bookings = db.query(Booking).filter(
+    todays_bookings = await db.scalar(select(func.count()).select_from(Booking).where(
         Booking.workspace_id == workspace_id,
         Booking.booking_date >= today_start,
         Booking.booking_date < today_end
-    ).count()
+    ))
 
-    upcoming_bookings = db.query(Booking).filter(
+    upcoming_bookings = await db.scalar(select(func.count()).select_from(Booking).where(
         Booking.workspace_id == workspace_id,
         Booking.booking_date >= now,
         Booking.booking_date < week_end,
         Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING])
-    ).count()
+    ))
 
-    completed_bookings = db.query(Booking).filter(
+    completed_bookings = await db.scalar(select(func.count()).select_from(Booking).where(
         Booking.workspace_id == workspace_id,
         Booking.status == BookingStatus.COMPLETED
-    ).count()
+    ))
 
-    no_show_bookings = db.query(Booking).filter(
+    no_show_bookings = await db.scalar(select(func.count()).select_from(Booking).where(
         Booking.workspace_id == workspace_id,
         Booking.status == BookingStatus.NO_SHOW
-    ).count()
+    ))
 
     # === Leads & Conversations ===
-    new_inquiries = db.query(Contact).filter(
+    new_inquiries = await db.scalar(select(func.count()).select_from(Contact).where(
         Contact.workspace_id == workspace_id,
         Contact.created_at >= today_start
-    ).count()
+    ))
 
-    open_conversations = db.query(Conversation).filter(
+    open_conversations = await db.scalar(select(func.count()).select_from(Conversation).where(
         Conversation.workspace_id == workspace_id,
         Conversation.status == ConversationStatus.OPEN
-    ).count()
+    ))
 
-    unanswered = db.query(Conversation).filter(
+    unanswered = await db.scalar(select(func.count()).select_from(Conversation).where(
         Conversation.workspace_id == workspace_id,
         Conversation.status == ConversationStatus.OPEN
-    ).count()
+    ))
 
-    total_contacts = db.query(Contact).filter(
+    total_contacts = await db.scalar(select(func.count()).select_from(Contact).where(
         Contact.workspace_id == workspace_id
-    ).count()
+    ))
 
     # === Forms Status ===
-    pending_forms = db.query(FormSubmission).filter(
+    pending_forms = await db.scalar(select(func.count()).select_from(FormSubmission).where(
         FormSubmission.workspace_id == workspace_id,
         FormSubmission.status == SubmissionStatus.PENDING
-    ).count()
+    ))
 
-    overdue_forms = db.query(FormSubmission).filter(
+    overdue_forms = await db.scalar(select(func.count()).select_from(FormSubmission).where(
         FormSubmission.workspace_id == workspace_id,
         FormSubmission.status == SubmissionStatus.OVERDUE
-    ).count()
+    ))
 
-    completed_forms = db.query(FormSubmission).filter(
+    completed_forms = await db.scalar(select(func.count()).select_from(FormSubmission).where(
         FormSubmission.workspace_id == workspace_id,
         FormSubmission.status == SubmissionStatus.COMPLETED
-    ).count()
+    ))
 
     # === Inventory Alerts ===
-    low_stock_items = db.query(InventoryItem).filter(
+    low_stock_items = (await db.scalars(select(InventoryItem).where(
         InventoryItem.workspace_id == workspace_id,
         InventoryItem.is_active == True,
         InventoryItem.quantity <= InventoryItem.low_stock_threshold
-    ).all()
+    ))).all()
 
     # === Key Alerts ===
-    recent_alerts = db.query(Alert).filter(
+    recent_alerts = (await db.scalars(select(Alert).where(
         Alert.workspace_id == workspace_id,
         Alert.is_read == False
-    ).order_by(Alert.created_at.desc()).limit(10).all()
+    ).order_by(Alert.created_at.desc()).limit(10))).all()
 
     # === Today's Schedule ===
-    todays_schedule = db.query(Booking).filter(
+    todays_schedule = (await db.scalars(select(Booking).where(
         Booking.workspace_id == workspace_id,
         Booking.booking_date >= today_start,
         Booking.booking_date < today_end
-    ).order_by(Booking.booking_date.asc()).all()
+    ).order_by(Booking.booking_date.asc()))).all()
 
     schedule_items = []
     for b in todays_schedule:
         from app.models.service import Service
-        contact = db.query(Contact).filter(Contact.id == b.contact_id).first()
-        service = db.query(Service).filter(Service.id == b.service_id).first()
+        contact = await db.scalar(select(Contact).where(Contact.id == b.contact_id))
+        service = await db.scalar(select(Service).where(Service.id == b.service_id))
         schedule_items.append({
             "id": str(b.id),
             "time": b.booking_date.strftime("%I:%M %p"),
@@ -166,27 +166,27 @@ async def get_dashboard(
 @router.post("/alerts/{alert_id}/read")
 async def mark_alert_read(
     alert_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user: User = Depends(get_current_user)
 ):
-    alert = db.query(Alert).filter(
+    alert = await db.scalar(select(Alert).where(
         Alert.id == alert_id,
         Alert.workspace_id == user.workspace_id
-    ).first()
+    ))
     if alert:
         alert.is_read = True
-        db.commit()
+        await db.commit()
     return {"status": "success"}
 
 
 @router.post("/alerts/read-all")
 async def mark_all_alerts_read(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user: User = Depends(get_current_user)
 ):
-    db.query(Alert).filter(
+    await db.execute(update(Alert).where(
         Alert.workspace_id == user.workspace_id,
         Alert.is_read == False
-    ).update({Alert.is_read: True})
-    db.commit()
+    ).values(is_read=True))
+    await db.commit()
     return {"status": "success"}
\ No newline at end of file
@@ -1,14 +1,19 @@
 import uuid
 from datetime import datetime
+from functools import partial
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db, open_read_session
 from app.middleware.auth import get_current_user, require_owner
 from app.models.user import User
 from app.models.form_template import FormTemplate
 from app.models.form_submission import FormSubmission, SubmissionStatus
+from app.models.contact import Contact
+from app.models.workspace import Workspace
 from app.schemas.forms import FormTemplateCreate, FormTemplateResponse, FormSubmissionCreate
+from app.services.export_service import EXPORT_FORMATS, stream_export
 
 router = APIRouter(prefix="/api/forms", tags=["Forms"])
 
@@ -17,7 +22,7 @@ router = APIRouter(prefix="/api/forms", tags=["Forms"])
 
 @router.get("/templates")
 async def list_templates(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user: User = Depends(get_current_user)
 ):
     templates = db.query(FormTemplate).filter(
@@ -97,7 +102,7 @@ async def list_submissions(
     status: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user: User = Depends(get_current_user)
 ):
     query = db.query(FormSubmission).filter(
@@ -112,7 +117,6 @@ async def list_submissions(
 
     result = []
     for s in submissions:
-        from app.models.contact import Contact
         contact = db.query(Contact).filter(Contact.id == s.contact_id).first()
         template = db.query(FormTemplate).filter(FormTemplate.id == s.template_id).first()
 
@@ -138,6 +142,45 @@ async def list_submissions(
     return {"submissions": result, "total": total, "page": page}
 
 
+@router.get("/submissions/export")
+async def export_submissions(
+    request: Request,
+    fmt: str = Query("csv", alias="format", description="csv or ndjson"),
+    status: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user)
+):
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Format must be one of: {list(EXPORT_FORMATS)}")
+
+    tz_name = db.query(Workspace.timezone).filter(Workspace.id == user.workspace_id).scalar()
+    query = select(
+        FormSubmission.id.label("submission_id"),
+        FormTemplate.name.label("form"),
+        Contact.name.label("contact_name"),
+        Contact.email.label("contact_email"),
+        FormSubmission.booking_id,
+        FormSubmission.status,
+        FormSubmission.due_date,
+        FormSubmission.submitted_at,
+        FormSubmission.data,
+        FormSubmission.created_at
+    ).join(FormTemplate, FormTemplate.id == FormSubmission.template_id).join(
+        Contact, Contact.id == FormSubmission.contact_id
+    ).where(FormSubmission.workspace_id == user.workspace_id)
+    if status:
+        try:
+            query = query.where(FormSubmission.status == SubmissionStatus(status))
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {[s.value for s in SubmissionStatus]}")
+
+    return stream_export(
+        partial(open_read_session, request),
+        query.order_by(FormSubmission.created_at, FormSubmission.id),
+        tz_name, fmt, "form-submissions"
+    )
+
+
 @router.get("/submissions/stats")
 async def get_submission_stats(
     db: Session = Depends(get_db),
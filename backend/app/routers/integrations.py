@@ -1,7 +1,7 @@
 import uuid
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.middleware.auth import require_owner
 from app.models.user import User
 from app.models.workspace import Workspace, WorkspaceSettings
@@ -13,7 +13,7 @@ router = APIRouter(prefix="/api/integrations", tags=["Integrations"])
 
 @router.get("/")
 async def list_integrations(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user: User = Depends(require_owner)
 ):
     workspace = db.query(Workspace).filter(Workspace.id == user.workspace_id).first()
@@ -1,7 +1,7 @@
 import uuid
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.middleware.auth import get_current_user, require_owner
 from app.models.user import User
 from app.models.inventory import InventoryItem, InventoryLog
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/api/inventory", tags=["Inventory"])
 
 @router.get("/")
 async def list_inventory(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user: User = Depends(get_current_user)
 ):
     items = db.query(InventoryItem).filter(
@@ -1,53 +1,75 @@
+import itertools
+import json
 import uuid
 from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import get_db
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import get_async_db, get_async_read_db
 from app.models.workspace import Workspace
 from app.models.contact import Contact, ContactSource
 from app.models.conversation import Conversation, ConversationStatus
 from app.models.message import Message, MessageType, MessageDirection, MessageStatus
 from app.models.booking import Booking, BookingStatus
-from app.models.service import Service, Availability
+from app.models.service import Service
 from app.models.form_template import FormTemplate
 from app.models.form_submission import FormSubmission, SubmissionStatus
+from app.models.waitlist import WaitlistEntry, WaitlistStatus
 from app.schemas.contact import PublicContactForm
 from app.schemas.booking import BookingCreate
-from app.services.automation_engine import AutomationEngine
+from app.schemas.waitlist import WaitlistJoin
+from app.services.automation_engine import trigger_automation
+from app.services.availability_service import search_slots, serialize_slot, slot_columns
+from app.services.booking_service import SlotUnavailableError, allocate_resource
+from app.services.contact_profile import contact_stats_service
+from app.services.public_catalog import public_catalog
+from app.services.timezones import day_bounds_utc, to_local, to_storage
+from app.services.waitlist_service import waitlist_service
 from app.models.automation import AutomationTrigger
 
 router = APIRouter(prefix="/api/public", tags=["Public"])
 
 
+def _cacheable(request: Request, response: Response, page: dict):
+    """Serve a cached public page with validators, or a bare 304 if the client has it"""
+    headers = {
+        "ETag": page["etag"],
+        "Cache-Control": f"public, max-age={settings.PUBLIC_CATALOG_MAX_AGE_SECONDS}"
+    }
+    if request.headers.get("if-none-match") == page["etag"]:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return page["body"]
+
+
+# Cache misses read from the primary: a replica lagging behind an invalidation
+# would otherwise put the old page back into the cache for the whole TTL
 @router.get("/workspace/{slug}")
-async def get_public_workspace(slug: str, db: Session = Depends(get_db)):
-    workspace = db.query(Workspace).filter(
-        Workspace.slug == slug,
-        Workspace.is_active == True
-    ).first()
-    if not workspace:
+async def get_public_workspace(
+    slug: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    entry = await public_catalog.get(db, slug)
+    if not entry:
         raise HTTPException(status_code=404, detail="Workspace not found")
-
-    return {
-        "name": workspace.name,
-        "slug": workspace.slug,
-        "address": workspace.address,
-        "timezone": workspace.timezone,
-        "contact_email": workspace.contact_email,
-        "phone": workspace.phone
-    }
+    return _cacheable(request, response, entry["workspace"])
 
 
 @router.post("/contact/{slug}")
 async def submit_contact_form(
     slug: str,
     form: PublicContactForm,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    workspace = db.query(Workspace).filter(
+    workspace = await db.scalar(select(Workspace).where(
         Workspace.slug == slug,
         Workspace.is_active == True
-    ).first()
+    ))
     if not workspace:
         raise HTTPException(status_code=404, detail="Workspace not found")
 
@@ -57,21 +79,21 @@ async def submit_contact_form(
     # Check for existing contact
     existing = None
     if form.email:
-        existing = db.query(Contact).filter(
+        existing = await db.scalar(select(Contact).where(
             Contact.workspace_id == workspace.id,
             Contact.email == form.email
-        ).first()
+        ))
     if not existing and form.phone:
-        existing = db.query(Contact).filter(
+        existing = await db.scalar(select(Contact).where(
             Contact.workspace_id == workspace.id,
             Contact.phone == form.phone
-        ).first()
+        ))
 
     if existing:
         contact = existing
     else:
         contact = Contact(
-            id=uuid.uuid4(),
+            id=str(uuid.uuid4()),
             workspace_id=workspace.id,
             name=form.name,
             email=form.email,
@@ -81,15 +103,15 @@ async def submit_contact_form(
         db.add(contact)
 
     # Create or find conversation
-    conversation = db.query(Conversation).filter(
+    conversation = await db.scalar(select(Conversation).where(
         Conversation.contact_id == contact.id,
         Conversation.workspace_id == workspace.id,
         Conversation.status != ConversationStatus.CLOSED
-    ).first()
+    ))
 
     if not conversation:
         conversation = Conversation(
-            id=uuid.uuid4(),
+            id=str(uuid.uuid4()),
             workspace_id=workspace.id,
             contact_id=contact.id,
             subject=f"Inquiry from {form.name}",
@@ -101,7 +123,7 @@ async def submit_contact_form(
     # Add message if provided
     if form.message:
         message = Message(
-            id=uuid.uuid4(),
+            id=str(uuid.uuid4()),
             conversation_id=conversation.id,
             message_type=MessageType.EMAIL if form.email else MessageType.SMS,
             direction=MessageDirection.INBOUND,
@@ -112,12 +134,11 @@ async def submit_contact_form(
         db.add(message)
         conversation.last_message_at = datetime.utcnow()
 
-    db.commit()
+    await db.commit()
 
     # Trigger automation
     if not existing:
-        engine = AutomationEngine(db)
-        await engine.trigger(workspace.id, AutomationTrigger.CONTACT_CREATED, {
+        await trigger_automation(workspace.id, AutomationTrigger.CONTACT_CREATED, {
             "contact": contact,
             "conversation": conversation
         })
@@ -129,93 +150,128 @@ async def submit_contact_form(
 
 
 @router.get("/booking/{slug}")
-async def get_booking_page(slug: str, db: Session = Depends(get_db)):
-    workspace = db.query(Workspace).filter(
+async def get_booking_page(
+    slug: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    entry = await public_catalog.get(db, slug)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Workspace not found")
+    return _cacheable(request, response, entry["booking_page"])
+
+
+@router.get("/availability/{slug}")
+async def search_availability(
+    slug: str,
+    date_from: str = Query(..., alias="from", description="First day, YYYY-MM-DD"),
+    date_to: str = Query(..., alias="to", description="Last day (inclusive), YYYY-MM-DD"),
+    service_ids: Optional[str] = Query(None, description="Comma-separated service ids; all active services if omitted"),
+    earliest_only: bool = False,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Free slots across services over a range of days in the workspace's
+    timezone, streamed as NDJSON in start time order. With earliest_only the
+    stream stops after the first slot.
+    """
+    try:
+        first_day = datetime.strptime(date_from, "%Y-%m-%d").date()
+        last_day = datetime.strptime(date_to, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates must be in YYYY-MM-DD format")
+    days = (last_day - first_day).days + 1
+    if days < 1:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    if days > settings.AVAILABILITY_SEARCH_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range is limited to {settings.AVAILABILITY_SEARCH_MAX_DAYS} days")
+
+    workspace = await db.scalar(select(Workspace).where(
         Workspace.slug == slug,
         Workspace.is_active == True
-    ).first()
+    ))
     if not workspace:
         raise HTTPException(status_code=404, detail="Workspace not found")
 
-    services = db.query(Service).filter(
+    query = select(*slot_columns()).where(
         Service.workspace_id == workspace.id,
         Service.is_active == True
-    ).all()
-
-    result = []
-    for svc in services:
-        avails = db.query(Availability).filter(
-            Availability.service_id == svc.id,
-            Availability.is_active == True
-        ).all()
-
-        result.append({
-            "id": str(svc.id),
-            "name": svc.name,
-            "description": svc.description,
-            "duration_minutes": svc.duration_minutes,
-            "service_type": svc.service_type.value,
-            "location": svc.location,
-            "price": svc.price,
-            "color": svc.color,
-            "availabilities": [{
-                "day_of_week": a.day_of_week,
-                "start_time": a.start_time,
-                "end_time": a.end_time
-            } for a in avails]
-        })
-
-    return {
-        "workspace": {
-            "name": workspace.name,
-            "address": workspace.address,
-            "timezone": workspace.timezone
-        },
-        "services": result
-    }
+    )
+    if service_ids:
+        query = query.where(Service.id.in_([sid.strip() for sid in service_ids.split(",") if sid.strip()]))
+    services = (await db.execute(query)).all()
+
+    range_start, _ = day_bounds_utc(first_day, workspace.timezone)
+    _, range_end = day_bounds_utc(last_day, workspace.timezone)
+    bookings = (await db.execute(select(Booking.service_id, Booking.booking_date, Booking.end_time).where(
+        Booking.service_id.in_([svc.id for svc in services]),
+        Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING]),
+        Booking.booking_date < range_end,
+        Booking.end_time > range_start
+    ))).all() if services else []
+
+    # Everything is loaded before streaming starts, so the generator never
+    # touches the session
+    tz_name = workspace.timezone
+    slots = search_slots(services, bookings, first_day, days, datetime.utcnow(), tz_name)
+    if earliest_only:
+        slots = itertools.islice(slots, 1)
+
+    def lines():
+        # One chunk per day: Starlette runs each step of a sync iterator in the
+        # threadpool, so a chunk per slot would cost a thread hop per line
+        for _day, day_slots in itertools.groupby(slots, key=lambda slot: slot[0].date()):
+            yield "".join(json.dumps({
+                "service_id": svc.id,
+                "service": svc.name,
+                **serialize_slot(start, end, tz_name, remaining)
+            }) + "\n" for start, end, svc, remaining in day_slots)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @router.post("/booking/{slug}")
 async def create_public_booking(
     slug: str,
     req: BookingCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    workspace = db.query(Workspace).filter(
+    workspace = await db.scalar(select(Workspace).where(
         Workspace.slug == slug,
         Workspace.is_active == True
-    ).first()
+    ))
     if not workspace:
         raise HTTPException(status_code=404, detail="Workspace not found")
 
-    service = db.query(Service).filter(
+    service = await db.scalar(select(Service).where(
         Service.id == req.service_id,
         Service.workspace_id == workspace.id,
         Service.is_active == True
-    ).first()
+    ))
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
 
     # Create or find contact
     contact = None
     if req.customer_email:
-        contact = db.query(Contact).filter(
+        contact = await db.scalar(select(Contact).where(
             Contact.workspace_id == workspace.id,
             Contact.email == req.customer_email
-        ).first()
+        ))
 
     if not contact and req.customer_phone:
-        contact = db.query(Contact).filter(
+        contact = await db.scalar(select(Contact).where(
             Contact.workspace_id == workspace.id,
             Contact.phone == req.customer_phone
-        ).first()
+        ))
 
     if not contact:
         if not req.customer_name:
             raise HTTPException(status_code=400, detail="Customer name is required")
 
         contact = Contact(
-            id=uuid.uuid4(),
+            id=str(uuid.uuid4()),
             workspace_id=workspace.id,
             name=req.customer_name,
             email=req.customer_email,
@@ -223,42 +279,38 @@ async def create_public_booking(
             source=ContactSource.BOOKING
         )
         db.add(contact)
-        db.flush()
-
-    # Check availability
-    end_time = req.booking_date + timedelta(minutes=service.duration_minutes)
-    conflict = db.query(Booking).filter(
-        Booking.workspace_id == workspace.id,
-        Booking.service_id == service.id,
-        Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING]),
-        Booking.booking_date < end_time,
-        Booking.end_time > req.booking_date
-    ).count()
-
-    if conflict > 0:
+        await db.flush()
+
+    # Check availability against the service's capacity
+    booking_date = to_storage(req.booking_date, workspace.timezone)
+    end_time = booking_date + timedelta(minutes=service.duration_minutes)
+    try:
+        resource_id = await allocate_resource(db, service, booking_date, end_time)
+    except SlotUnavailableError:
         raise HTTPException(status_code=409, detail="This time slot is no longer available")
 
     booking = Booking(
-        id=uuid.uuid4(),
+        id=str(uuid.uuid4()),
         workspace_id=workspace.id,
         contact_id=contact.id,
         service_id=service.id,
+        resource_id=resource_id,
         status=BookingStatus.CONFIRMED,
-        booking_date=req.booking_date,
+        booking_date=booking_date,
         end_time=end_time,
         notes=req.notes
     )
     db.add(booking)
 
         # Create conversation if new contact
-    conversation = db.query(Conversation).filter(
+    conversation = await db.scalar(select(Conversation).where(
         Conversation.contact_id == contact.id,
         Conversation.workspace_id == workspace.id
-    ).first()
+    ))
 
     if not conversation:
         conversation = Conversation(
-            id=uuid.uuid4(),
+            id=str(uuid.uuid4()),
             workspace_id=workspace.id,
             contact_id=contact.id,
             subject=f"Booking - {service.name}",
@@ -267,12 +319,153 @@ async def create_public_booking(
         )
         db.add(conversation)
 
-    db.commit()
-    db.refresh(booking)
+    await db.commit()
+    await db.refresh(booking)
+    contact_stats_service.invalidate(contact.id)
 
     # Trigger automation
-    engine = AutomationEngine(db)
-    await engine.trigger(workspace.id, AutomationTrigger.BOOKING_CREATED, {
+    await trigger_automation(workspace.id, AutomationTrigger.BOOKING_CREATED, {
+        "booking": booking,
+        "contact": contact,
+        "service": service
+    })
+
+    return {
+        "status": "success",
+        "message": "Your booking has been confirmed!",
+        "booking": {
+            "id": str(booking.id),
+            "service": service.name,
+            "date": str(booking.booking_date),
+            "end_time": str(booking.end_time)
+        }
+    }
+
+
+@router.post("/waitlist/{slug}")
+async def join_waitlist(
+    slug: str,
+    req: WaitlistJoin,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Join a service's waitlist for a range of days; a freed slot in it is offered by email or SMS"""
+    workspace = await db.scalar(select(Workspace).where(
+        Workspace.slug == slug,
+        Workspace.is_active == True
+    ))
+    if not workspace:
+        raise HTTPException(status_code=404, detail="Workspace not found")
+
+    if req.date_to < req.date_from:
+        raise HTTPException(status_code=400, detail="'date_to' must not be before 'date_from'")
+    if not req.customer_email and not req.customer_phone:
+        raise HTTPException(status_code=400, detail="Email or phone is required")
+
+    service = await db.scalar(select(Service).where(
+        Service.id == req.service_id,
+        Service.workspace_id == workspace.id,
+        Service.is_active == True
+    ))
+    if not service:
+        raise HTTPException(status_code=404, detail="Service not found")
+
+    # Create or find contact
+    contact = None
+    if req.customer_email:
+        contact = await db.scalar(select(Contact).where(
+            Contact.workspace_id == workspace.id,
+            Contact.email == req.customer_email
+        ))
+
+    if not contact and req.customer_phone:
+        contact = await db.scalar(select(Contact).where(
+            Contact.workspace_id == workspace.id,
+            Contact.phone == req.customer_phone
+        ))
+
+    if not contact:
+        if not req.customer_name:
+            raise HTTPException(status_code=400, detail="Customer name is required")
+
+        contact = Contact(
+            id=str(uuid.uuid4()),
+            workspace_id=workspace.id,
+            name=req.customer_name,
+            email=req.customer_email,
+            phone=req.customer_phone,
+            source=ContactSource.BOOKING
+        )
+        db.add(contact)
+        await db.flush()
+
+    waiting = await db.scalar(select(WaitlistEntry.id).where(
+        WaitlistEntry.contact_id == contact.id,
+        WaitlistEntry.service_id == service.id,
+        WaitlistEntry.status.in_([WaitlistStatus.WAITING, WaitlistStatus.OFFERED])
+    ))
+    if waiting:
+        raise HTTPException(status_code=409, detail="You are already on the waitlist for this service")
+
+    entry = WaitlistEntry(
+        id=str(uuid.uuid4()),
+        workspace_id=workspace.id,
+        service_id=service.id,
+        contact_id=contact.id,
+        status=WaitlistStatus.WAITING,
+        window_start=day_bounds_utc(req.date_from, workspace.timezone)[0],
+        window_end=day_bounds_utc(req.date_to, workspace.timezone)[1],
+        notes=req.notes
+    )
+    db.add(entry)
+    await db.commit()
+
+    return {
+        "status": "success",
+        "message": "You're on the waitlist. We'll contact you if a spot opens up.",
+        "entry_id": str(entry.id)
+    }
+
+
+async def _waitlist_offer(db: AsyncSession, entry_id: str):
+    entry = await db.scalar(select(WaitlistEntry).where(WaitlistEntry.id == entry_id))
+    if not entry:
+        raise HTTPException(status_code=404, detail="Waitlist entry not found")
+    return entry
+
+
+@router.get("/waitlist/offer/{entry_id}")
+async def get_waitlist_offer(entry_id: str, db: AsyncSession = Depends(get_async_db)):
+    """Public endpoint for a waitlisted customer to view the slot offered to them"""
+    entry = await _waitlist_offer(db, entry_id)
+    workspace = await db.scalar(select(Workspace).where(Workspace.id == entry.workspace_id))
+    service = await db.scalar(select(Service).where(Service.id == entry.service_id))
+    hold = await db.scalar(select(Booking).where(Booking.id == entry.offered_booking_id)) if entry.offered_booking_id else None
+
+    status = entry.status
+    if status == WaitlistStatus.OFFERED and entry.offer_expires_at < datetime.utcnow():
+        # Past its hold, but the expiry job has not released it yet
+        status = WaitlistStatus.EXPIRED
+    offer_open = status == WaitlistStatus.OFFERED
+    return {
+        "status": status.value,
+        "workspace_name": workspace.name if workspace else "",
+        "service": service.name if service else "",
+        "start": to_local(hold.booking_date, workspace.timezone).isoformat() if hold else None,
+        "end": to_local(hold.end_time, workspace.timezone).isoformat() if hold else None,
+        "expires_at": to_local(entry.offer_expires_at, workspace.timezone).isoformat() if offer_open else None
+    }
+
+
+@router.post("/waitlist/offer/{entry_id}/accept")
+async def accept_waitlist_offer(entry_id: str, db: AsyncSession = Depends(get_async_db)):
+    entry = await _waitlist_offer(db, entry_id)
+    booking = await waitlist_service.accept(db, entry)
+    if not booking:
+        raise HTTPException(status_code=410, detail="This offer has expired")
+
+    contact = await db.scalar(select(Contact).where(Contact.id == booking.contact_id))
+    service = await db.scalar(select(Service).where(Service.id == booking.service_id))
+    await trigger_automation(booking.workspace_id, AutomationTrigger.BOOKING_CREATED, {
         "booking": booking,
         "contact": contact,
         "service": service
@@ -290,31 +483,41 @@ async def create_public_booking(
     }
 
 
+@router.post("/waitlist/offer/{entry_id}/decline")
+async def decline_waitlist_offer(entry_id: str, db: AsyncSession = Depends(get_async_db)):
+    """Turn down an offer; the slot goes to the next customer on the waitlist"""
+    entry = await _waitlist_offer(db, entry_id)
+    if entry.status != WaitlistStatus.OFFERED:
+        raise HTTPException(status_code=410, detail="This offer is no longer open")
+    await waitlist_service.release(db, entry, WaitlistStatus.CANCELLED)
+    return {"status": "success"}
+
+
 @router.get("/form/{submission_id}")
-async def get_public_form(submission_id: str, db: Session = Depends(get_db)):
+async def get_public_form(submission_id: str, db: AsyncSession = Depends(get_async_db)):
     """Public endpoint for customers to view and fill forms"""
-    submission = db.query(FormSubmission).filter(
+    submission = await db.scalar(select(FormSubmission).where(
         FormSubmission.id == submission_id
-    ).first()
+    ))
     if not submission:
         raise HTTPException(status_code=404, detail="Form not found")
 
     if submission.status == SubmissionStatus.COMPLETED:
         return {"status": "completed", "message": "This form has already been submitted."}
 
-    template = db.query(FormTemplate).filter(
+    template = await db.scalar(select(FormTemplate).where(
         FormTemplate.id == submission.template_id
-    ).first()
+    ))
     if not template:
         raise HTTPException(status_code=404, detail="Form template not found")
 
-    workspace = db.query(Workspace).filter(
+    workspace = await db.scalar(select(Workspace).where(
         Workspace.id == submission.workspace_id
-    ).first()
+    ))
 
-    contact = db.query(Contact).filter(
+    contact = await db.scalar(select(Contact).where(
         Contact.id == submission.contact_id
-    ).first()
+    ))
 
     return {
         "submission_id": str(submission.id),
@@ -336,12 +539,12 @@ async def get_public_form(submission_id: str, db: Session = Depends(get_db)):
 async def submit_public_form(
     submission_id: str,
     data: dict,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Public endpoint for customers to submit forms"""
-    submission = db.query(FormSubmission).filter(
+    submission = await db.scalar(select(FormSubmission).where(
         FormSubmission.id == submission_id
-    ).first()
+    ))
     if not submission:
         raise HTTPException(status_code=404, detail="Form not found")
 
@@ -351,7 +554,8 @@ async def submit_public_form(
     submission.data = data.get("fields", data)
     submission.status = SubmissionStatus.COMPLETED
     submission.submitted_at = datetime.utcnow()
-    db.commit()
+    await db.commit()
+    contact_stats_service.invalidate(submission.contact_id)
 
     return {
         "status": "success",
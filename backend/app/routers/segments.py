@@ -0,0 +1,157 @@
+import uuid
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db, get_async_read_db
+from app.middleware.auth import get_current_user
+from app.models.user import User
+from app.models.contact import Contact
+from app.models.segment import Segment, SegmentMember
+from app.schemas.segment import SegmentCreate, SegmentPreview
+from app.services.pagination import keyset_result, keyset_statement
+from app.services.segment_service import (
+    FIELDS, OPERATORS, SegmentDefinitionError, compile_segment, segment_service, serialize_segment
+)
+
+router = APIRouter(prefix="/api/segments", tags=["Segments"])
+
+
+def _validate(definition: dict, workspace_id: str):
+    try:
+        return compile_segment(definition, workspace_id)
+    except SegmentDefinitionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def _get_segment(db: AsyncSession, segment_id: str, user: User) -> Segment:
+    segment = await db.scalar(select(Segment).where(
+        Segment.id == segment_id,
+        Segment.workspace_id == user.workspace_id
+    ))
+    if not segment:
+        raise HTTPException(status_code=404, detail="Segment not found")
+    return segment
+
+
+@router.get("/fields")
+async def list_segment_fields(user: User = Depends(get_current_user)):
+    """The fields and operators a segment definition can use"""
+    return {"fields": {name: {"type": kind, "operators": OPERATORS[kind]} for name, (kind, _source) in FIELDS.items()}}
+
+
+@router.get("/")
+async def list_segments(
+    db: AsyncSession = Depends(get_async_read_db),
+    user: User = Depends(get_current_user)
+):
+    """Segments with their member counts as of the last refresh"""
+    segments = (await db.scalars(select(Segment).where(
+        Segment.workspace_id == user.workspace_id
+    ).order_by(Segment.created_at))).all()
+    return {"segments": [serialize_segment(s) for s in segments]}
+
+
+@router.post("/preview")
+async def preview_segment(
+    req: SegmentPreview,
+    db: AsyncSession = Depends(get_async_read_db),
+    user: User = Depends(get_current_user)
+):
+    """Count the contacts a definition matches right now, without saving it"""
+    query = _validate(req.definition, user.workspace_id)
+    count = await db.scalar(select(func.count()).select_from(query.subquery()))
+    return {"count": count}
+
+
+@router.post("/")
+async def create_segment(
+    req: SegmentCreate,
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_user)
+):
+    _validate(req.definition, user.workspace_id)
+    segment = Segment(
+        id=str(uuid.uuid4()),
+        workspace_id=user.workspace_id,
+        name=req.name,
+        definition=req.definition
+    )
+    db.add(segment)
+    await db.commit()
+    await segment_service.refresh(db, segment, full=True)
+    return serialize_segment(segment)
+
+
+@router.get("/{segment_id}")
+async def get_segment(
+    segment_id: str,
+    db: AsyncSession = Depends(get_async_read_db),
+    user: User = Depends(get_current_user)
+):
+    return serialize_segment(await _get_segment(db, segment_id, user))
+
+
+@router.put("/{segment_id}")
+async def update_segment(
+    segment_id: str,
+    req: SegmentCreate,
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_user)
+):
+    segment = await _get_segment(db, segment_id, user)
+    segment.name = req.name
+    if req.definition != segment.definition:
+        _validate(req.definition, user.workspace_id)
+        segment.definition = req.definition
+        await db.commit()
+        await segment_service.refresh(db, segment, full=True)
+    else:
+        await db.commit()
+    return serialize_segment(segment)
+
+
+@router.delete("/{segment_id}")
+async def delete_segment(
+    segment_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_user)
+):
+    segment = await _get_segment(db, segment_id, user)
+    await db.execute(delete(SegmentMember).where(SegmentMember.segment_id == segment.id))
+    await db.delete(segment)
+    await db.commit()
+    return {"status": "success"}
+
+
+@router.get("/{segment_id}/members")
+async def list_segment_members(
+    segment_id: str,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_read_db),
+    user: User = Depends(get_current_user)
+):
+    """Members as of the last refresh, most recently added first"""
+    segment = await _get_segment(db, segment_id, user)
+    query = select(
+        SegmentMember.contact_id, SegmentMember.added_at, Contact.name, Contact.email, Contact.phone
+    ).join(Contact, Contact.id == SegmentMember.contact_id).where(SegmentMember.segment_id == segment.id)
+    try:
+        statement = keyset_statement(query, SegmentMember.added_at, SegmentMember.contact_id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    rows, next_cursor = keyset_result((await db.execute(statement)).all(), SegmentMember.added_at, SegmentMember.contact_id, limit)
+
+    return {
+        "members": [{
+            "contact_id": str(row.contact_id),
+            "name": row.name,
+            "email": row.email,
+            "phone": row.phone,
+            "added_at": str(row.added_at)
+        } for row in rows],
+        "member_count": segment.member_count,
+        "refreshed_at": str(segment.refreshed_at) if segment.refreshed_at else None,
+        "next_cursor": next_cursor
+    }
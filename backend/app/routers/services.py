@@ -1,43 +1,33 @@
 import uuid
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.middleware.auth import get_current_user, require_owner
 from app.models.user import User
-from app.models.service import Service, ServiceType, Availability
-from app.schemas.booking import ServiceCreate, ServiceResponse, AvailabilityCreate
+from app.models.service import Service, ServiceType, Availability, ServiceResource
+from app.schemas.booking import ServiceCreate, ServiceResponse, ServiceResourcesUpdate, AvailabilityCreate
+from app.services.availability_service import catalog_statement, pack_week, serialize_service, weekly_bitmap
+from app.services.public_catalog import public_catalog
 
 router = APIRouter(prefix="/api/services", tags=["Services"])
 
 
 @router.get("/")
 async def list_services(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user: User = Depends(get_current_user)
 ):
-    services = db.query(Service).filter(
-        Service.workspace_id == user.workspace_id,
-        Service.is_active == True
-    ).all()
-
-    result = []
-    for svc in services:
-        availabilities = db.query(Availability).filter(
-            Availability.service_id == svc.id,
-            Availability.is_active == True
-        ).all()
+    services = db.scalars(catalog_statement(user.workspace_id)).all()
 
-        result.append({
-            **ServiceResponse.from_orm(svc).dict(),
-            "availabilities": [{
-                "id": str(a.id),
-                "day_of_week": a.day_of_week,
-                "start_time": a.start_time,
-                "end_time": a.end_time
-            } for a in availabilities]
-        })
-
-    return {"services": result}
+    return {"services": [{
+        **serialize_service(svc),
+        "availabilities": [{
+            "id": str(a.id),
+            "day_of_week": a.day_of_week,
+            "start_time": a.start_time,
+            "end_time": a.end_time
+        } for a in svc.availabilities]
+    } for svc in services]}
 
 
 @router.post("/", response_model=ServiceResponse)
@@ -47,7 +37,7 @@ async def create_service(
     user: User = Depends(require_owner)
 ):
     service = Service(
-        id=uuid.uuid4(),
+        id=str(uuid.uuid4()),
         workspace_id=user.workspace_id,
         name=req.name,
         description=req.description,
@@ -56,12 +46,14 @@ async def create_service(
         location=req.location,
         price=req.price,
         color=req.color,
+        capacity=req.capacity,
         linked_form_ids=req.linked_form_ids,
         linked_inventory=req.linked_inventory
     )
     db.add(service)
     db.commit()
     db.refresh(service)
+    public_catalog.invalidate_workspace(user.workspace_id)
     return service
 
 
@@ -88,6 +80,7 @@ async def update_service(
 
     db.commit()
     db.refresh(service)
+    public_catalog.invalidate_workspace(user.workspace_id)
     return service
 
 
@@ -106,6 +99,7 @@ async def delete_service(
 
     service.is_active = False
     db.commit()
+    public_catalog.invalidate_workspace(user.workspace_id)
     return {"status": "success"}
 
 
@@ -123,13 +117,18 @@ async def set_availability(
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
 
+    try:
+        bitmap = pack_week(weekly_bitmap(availabilities))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Times must be in HH:MM format")
+
     # Clear existing availabilities
     db.query(Availability).filter(Availability.service_id == service.id).delete()
 
     # Add new ones
     for avail in availabilities:
         a = Availability(
-            id=uuid.uuid4(),
+            id=str(uuid.uuid4()),
             service_id=service.id,
             day_of_week=avail.day_of_week,
             start_time=avail.start_time,
@@ -137,8 +136,10 @@ async def set_availability(
             is_active=True
         )
         db.add(a)
+    service.availability_bitmap = bitmap
 
     db.commit()
+    public_catalog.invalidate_workspace(user.workspace_id)
 
     # Update workspace onboarding step
     from app.models.workspace import Workspace
@@ -147,4 +148,78 @@ async def set_availability(
         workspace.onboarding_step = "forms"
         db.commit()
 
-    return {"status": "success", "count": len(availabilities)}
\ No newline at end of file
+    return {"status": "success", "count": len(availabilities)}
+
+
+def _serialize_resources(db: Session, service_id: str) -> list[dict]:
+    rows = db.query(ServiceResource, User).join(User, User.id == ServiceResource.user_id).filter(
+        ServiceResource.service_id == service_id,
+        ServiceResource.is_active == True
+    ).order_by(ServiceResource.created_at).all()
+    return [{
+        "id": str(resource.id),
+        "user_id": str(staff.id),
+        "full_name": staff.full_name,
+        "email": staff.email
+    } for resource, staff in rows]
+
+
+@router.get("/{service_id}/resources")
+async def list_resources(
+    service_id: str,
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user)
+):
+    service = db.query(Service).filter(
+        Service.id == service_id,
+        Service.workspace_id == user.workspace_id
+    ).first()
+    if not service:
+        raise HTTPException(status_code=404, detail="Service not found")
+
+    return {"capacity": service.capacity, "resources": _serialize_resources(db, service.id)}
+
+
+@router.put("/{service_id}/resources")
+async def set_resources(
+    service_id: str,
+    req: ServiceResourcesUpdate,
+    db: Session = Depends(get_db),
+    user: User = Depends(require_owner)
+):
+    """
+    Set the team members who run a service. Each one takes up to
+    service.capacity bookings at a time. Removed members are deactivated
+    rather than deleted, so the bookings already assigned to them keep
+    their resource.
+    """
+    service = db.query(Service).filter(
+        Service.id == service_id,
+        Service.workspace_id == user.workspace_id
+    ).first()
+    if not service:
+        raise HTTPException(status_code=404, detail="Service not found")
+
+    user_ids = set(req.user_ids)
+    members = db.query(User.id).filter(
+        User.id.in_(user_ids),
+        User.workspace_id == user.workspace_id,
+        User.is_active == True
+    ).all()
+    unknown = user_ids - {m.id for m in members}
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown team members: {sorted(unknown)}")
+
+    existing = {r.user_id: r for r in db.query(ServiceResource).filter(ServiceResource.service_id == service.id)}
+    for user_id, resource in existing.items():
+        resource.is_active = user_id in user_ids
+    for user_id in user_ids - existing.keys():
+        db.add(ServiceResource(
+            id=str(uuid.uuid4()),
+            service_id=service.id,
+            user_id=user_id,
+            is_active=True
+        ))
+
+    db.commit()
+    return {"capacity": service.capacity, "resources": _serialize_resources(db, service.id)}
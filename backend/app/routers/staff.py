@@ -1,19 +1,18 @@
 import uuid
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
-from app.database import get_db
-from app.middleware.auth import require_owner
+from app.database import get_db, get_read_db
+from app.middleware.auth import require_owner, invalidate_user
+from app.services.password_service import password_service
 from app.models.user import User, UserRole
 from app.schemas.staff import StaffInvite, StaffUpdate, StaffResponse
 
 router = APIRouter(prefix="/api/staff", tags=["Staff"])
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 @router.get("/")
 async def list_staff(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user: User = Depends(require_owner)
 ):
     staff = db.query(User).filter(
@@ -35,9 +34,9 @@ async def invite_staff(
         raise HTTPException(status_code=400, detail="Email already in use")
 
     staff_user = User(
-        id=uuid.uuid4(),
+        id=str(uuid.uuid4()),
         email=req.email,
-        hashed_password=pwd_context.hash(req.password),
+        hashed_password=await password_service.hash(req.password),
         full_name=req.full_name,
         role=UserRole.STAFF,
         workspace_id=user.workspace_id,
@@ -74,6 +73,7 @@ async def update_staff(
 
     db.commit()
     db.refresh(staff_user)
+    invalidate_user(staff_user.id)
     return staff_user
 
 
@@ -93,4 +93,5 @@ async def remove_staff(
 
     staff_user.is_active = False
     db.commit()
+    invalidate_user(staff_user.id)
     return {"status": "success"}
\ No newline at end of file
@@ -0,0 +1,111 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db, get_async_read_db
+from app.middleware.auth import get_current_user
+from app.models.user import User
+from app.models.contact import Contact
+from app.models.service import Service
+from app.models.waitlist import WaitlistEntry, WaitlistStatus
+from app.models.workspace import Workspace
+from app.schemas.waitlist import WaitlistCreate
+from app.services.timezones import day_bounds_utc
+from app.services.waitlist_service import serialize_entry, waitlist_service
+
+router = APIRouter(prefix="/api/waitlist", tags=["Waitlist"])
+
+
+@router.get("/")
+async def list_waitlist(
+    service_id: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    page: int = Query(1, ge=1),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_read_db),
+    user: User = Depends(get_current_user)
+):
+    query = select(WaitlistEntry).where(WaitlistEntry.workspace_id == user.workspace_id)
+    if service_id:
+        query = query.where(WaitlistEntry.service_id == service_id)
+    if status:
+        try:
+            query = query.where(WaitlistEntry.status == WaitlistStatus(status))
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {[s.value for s in WaitlistStatus]}")
+
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    entries = (await db.scalars(query.order_by(
+        WaitlistEntry.priority.desc(), WaitlistEntry.created_at
+    ).offset((page - 1) * limit).limit(limit))).all()
+    tz_name = await db.scalar(select(Workspace.timezone).where(Workspace.id == user.workspace_id))
+
+    return {"entries": [serialize_entry(e, tz_name) for e in entries], "total": total, "page": page}
+
+
+@router.post("/")
+async def add_to_waitlist(
+    req: WaitlistCreate,
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_user)
+):
+    """Add a contact to a service's waitlist for a range of days in the workspace's timezone"""
+    if req.date_to < req.date_from:
+        raise HTTPException(status_code=400, detail="'date_to' must not be before 'date_from'")
+
+    service = await db.scalar(select(Service).where(
+        Service.id == req.service_id,
+        Service.workspace_id == user.workspace_id
+    ))
+    if not service:
+        raise HTTPException(status_code=404, detail="Service not found")
+
+    contact = await db.scalar(select(Contact).where(
+        Contact.id == req.contact_id,
+        Contact.workspace_id == user.workspace_id
+    ))
+    if not contact:
+        raise HTTPException(status_code=404, detail="Contact not found")
+
+    tz_name = await db.scalar(select(Workspace.timezone).where(Workspace.id == user.workspace_id))
+    entry = WaitlistEntry(
+        id=str(uuid.uuid4()),
+        workspace_id=user.workspace_id,
+        service_id=service.id,
+        contact_id=contact.id,
+        status=WaitlistStatus.WAITING,
+        priority=req.priority,
+        window_start=day_bounds_utc(req.date_from, tz_name)[0],
+        window_end=day_bounds_utc(req.date_to, tz_name)[1],
+        notes=req.notes
+    )
+    db.add(entry)
+    await db.commit()
+    await db.refresh(entry)
+    return serialize_entry(entry, tz_name)
+
+
+@router.delete("/{entry_id}")
+async def remove_from_waitlist(
+    entry_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_user)
+):
+    """Take an entry off the waitlist; an open offer is released to the next entry"""
+    entry = await db.scalar(select(WaitlistEntry).where(
+        WaitlistEntry.id == entry_id,
+        WaitlistEntry.workspace_id == user.workspace_id
+    ))
+    if not entry:
+        raise HTTPException(status_code=404, detail="Waitlist entry not found")
+
+    if entry.status == WaitlistStatus.OFFERED:
+        await waitlist_service.release(db, entry, WaitlistStatus.CANCELLED)
+    elif entry.status == WaitlistStatus.WAITING:
+        entry.status = WaitlistStatus.CANCELLED
+        entry.updated_at = datetime.utcnow()
+        await db.commit()
+
+    return {"status": "success"}
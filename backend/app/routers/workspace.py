@@ -3,11 +3,13 @@ import re
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.middleware.auth import get_current_user, require_owner
+from app.middleware.auth import get_current_user, require_owner, invalidate_user
 from app.models.user import User
 from app.models.workspace import Workspace
 from app.models.automation import AutomationRule, AutomationTrigger
 from app.schemas.workspace import WorkspaceCreate, WorkspaceUpdate, CommunicationSetup, WorkspaceResponse
+from app.services.public_catalog import public_catalog
+from app.services.timezones import is_valid_zone
 
 router = APIRouter(prefix="/api/workspace", tags=["Workspace"])
 
@@ -25,6 +27,8 @@ async def create_workspace(
 ):
     if user.workspace_id:
         raise HTTPException(status_code=400, detail="You already have a workspace")
+    if not is_valid_zone(req.timezone):
+        raise HTTPException(status_code=400, detail=f"Unknown timezone: {req.timezone}")
 
     slug = generate_slug(req.name)
     existing = db.query(Workspace).filter(Workspace.slug == slug).first()
@@ -46,6 +50,7 @@ async def create_workspace(
     user.workspace_id = workspace.id
     db.commit()
     db.refresh(workspace)
+    invalidate_user(user.id)
 
     # Create default automation rules
     default_rules = [
@@ -96,11 +101,14 @@ async def update_workspace(
         raise HTTPException(status_code=404, detail="Workspace not found")
 
     update_data = req.dict(exclude_unset=True)
+    if "timezone" in update_data and not is_valid_zone(update_data["timezone"] or ""):
+        raise HTTPException(status_code=400, detail=f"Unknown timezone: {update_data['timezone']}")
     for key, value in update_data.items():
         setattr(workspace, key, value)
 
     db.commit()
     db.refresh(workspace)
+    public_catalog.invalidate_workspace(workspace.id)
     return workspace
 
 
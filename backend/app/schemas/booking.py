@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 
@@ -11,6 +11,7 @@ class ServiceCreate(BaseModel):
     location: Optional[str] = None
     price: Optional[int] = None
     color: str = "#3B82F6"
+    capacity: int = Field(1, ge=1)
     linked_form_ids: Optional[List[str]] = None
     linked_inventory: Optional[List[dict]] = None
 
@@ -24,6 +25,7 @@ class ServiceResponse(BaseModel):
     location: Optional[str] = None
     price: Optional[int] = None
     color: str
+    capacity: int = Field(1, ge=1)
     is_active: bool
     linked_form_ids: Optional[List[str]] = None
     linked_inventory: Optional[List[dict]] = None
@@ -32,6 +34,10 @@ class ServiceResponse(BaseModel):
         from_attributes = True
 
 
+class ServiceResourcesUpdate(BaseModel):
+    user_ids: List[str]
+
+
 class AvailabilityCreate(BaseModel):
     day_of_week: int
     start_time: str
@@ -48,11 +54,22 @@ class BookingCreate(BaseModel):
     customer_phone: Optional[str] = None
 
 
+class BookingSeriesCreate(BaseModel):
+    contact_id: str
+    service_id: str
+    starts_at: datetime
+    rrule: str
+    notes: Optional[str] = None
+    # Book the occurrences that fit instead of rejecting the whole series
+    skip_conflicts: bool = False
+
+
 class BookingResponse(BaseModel):
     id: str
     workspace_id: str
     contact_id: str
     service_id: str
+    resource_id: Optional[str] = None
     status: str
     booking_date: datetime
     end_time: datetime
@@ -19,12 +19,21 @@ class ContactResponse(BaseModel):
     phone: Optional[str] = None
     notes: Optional[str] = None
     source: str
+    tags: list[str] = []
     created_at: datetime
 
     class Config:
         from_attributes = True
 
 
+class ContactTagsBulk(BaseModel):
+    add: list[str] = []
+    remove: list[str] = []
+    # The contacts: listed by id, or the members of a segment
+    contact_ids: Optional[list[str]] = None
+    segment_id: Optional[str] = None
+
+
 class PublicContactForm(BaseModel):
     name: str
     email: Optional[str] = None
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import Any
+
+
+class SegmentCreate(BaseModel):
+    name: str
+    definition: dict[str, Any]
+
+
+class SegmentPreview(BaseModel):
+    definition: dict[str, Any]
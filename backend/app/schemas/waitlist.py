@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import date
+
+
+class WaitlistCreate(BaseModel):
+    contact_id: str
+    service_id: str
+    date_from: date
+    date_to: date
+    priority: int = 0
+    notes: Optional[str] = None
+
+
+class WaitlistJoin(BaseModel):
+    service_id: str
+    date_from: date
+    date_to: date
+    customer_name: Optional[str] = None
+    customer_email: Optional[str] = None
+    customer_phone: Optional[str] = None
+    notes: Optional[str] = None
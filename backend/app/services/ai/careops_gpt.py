@@ -1,71 +1,165 @@
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import deque
+from typing import AsyncIterator, Optional
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from app.services.ai.groq_client import generate_response
-
-
-def generate_careops_response(db: Session, workspace_id: str, user_message: str):
-
-    print("INSIDE generate_careops_response")
-
-    from app.models.workspace import Workspace
-    from app.models.booking import Booking
-    from app.models.user import User
-
-    workspace = db.query(Workspace).filter(
-        Workspace.id == workspace_id
-    ).first()
-
-    if not workspace:
-        return "Workspace not found."
-
-    total_bookings = db.query(Booking).filter(
-        Booking.workspace_id == workspace_id
-    ).count()
-
-    total_users = db.query(User).filter(
-        User.workspace_id == workspace_id
-    ).count()
-
-    business_context = f"""
-    Business Name: {workspace.name}
-    Total Bookings: {total_bookings}
-    Total Users: {total_users}
-    Active: {workspace.is_active}
+from app.config import settings
+from app.services.ai.llm_client import LLMError, llm_client
+from app.services.ai.prompt_builder import build_messages, estimate_tokens
+from app.services.ai.response_cache import response_cache, normalize_prompt
+from app.services.metrics_service import metrics_snapshot_service
+
+logger = logging.getLogger(__name__)
+
+
+class AIRequestStats:
+    """Rolling per-process counters for CareOpsGPT requests"""
+
+    def __init__(self, window: int = 500):
+        self.requests = 0
+        self.cached = 0
+        self.coalesced = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._latencies_ms = deque(maxlen=window)
+
+    def record(self, prompt_tokens: int, completion_tokens: int, latency_ms: float, source: str) -> None:
+        self.requests += 1
+        self.cached += source == "cache"
+        self.coalesced += source == "coalesced"
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self._latencies_ms.append(latency_ms)
+
+    def snapshot(self) -> dict:
+        latencies = sorted(self._latencies_ms)
+        return {
+            "requests": self.requests,
+            "cached": self.cached,
+            "coalesced": self.coalesced,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "latency_ms_p50": round(latencies[len(latencies) // 2], 1) if latencies else None,
+            "latency_ms_p95": round(latencies[int(len(latencies) * 0.95)], 1) if latencies else None
+        }
+
+
+request_stats = AIRequestStats()
+
+# Requests for the same workspace, metrics version and prompt share one completion
+_in_flight: dict[tuple, asyncio.Future] = {}
+
+
+def _record(workspace_id: str, messages: list[dict], response: str, started: float, source: str) -> None:
+    prompt_tokens = sum(estimate_tokens(m["content"]) for m in messages) if messages else 0
+    completion_tokens = estimate_tokens(response)
+    latency_ms = (time.perf_counter() - started) * 1000
+    request_stats.record(prompt_tokens, completion_tokens, latency_ms, source)
+
+    if random.random() < settings.AI_LOG_SAMPLE_RATE:
+        logger.info("careops_gpt_request " + json.dumps({
+            "workspace_id": workspace_id,
+            "source": source,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "latency_ms": round(latency_ms, 1)
+        }))
+
+
+async def _lead_or_follow(key: tuple) -> tuple[Optional[asyncio.Future], Optional[str]]:
     """
-
-    final_prompt = f"""
-    You are CareOpsGPT — an elite AI Business Intelligence Advisor for high-growth service businesses. 
-    
-    You ONLY answer in the context of managing service businesses.
-
-    If the user asks about forms, bookings, customers, revenue,
-    always respond with practical fields and structured output.
-
-    Business Metrics:
-    {business_context}
-
-    User Request:
-    {user_message}
-
-    Response Rules:
-- Write in premium executive tone.
-- Use structured bullet points.
-- Use relevant but minimal emojis (not too many).
-- Provide deeper strategic insights (not obvious statements).
-- Highlight risks, opportunities, and growth levers.
-- Keep it concise but powerful.
-- Format sections like this:
-
-📊 Executive Snapshot
-📈 Performance Insights
-⚠️ Risk Signals
-🚀 Growth Opportunities
-🎯 Strategic Focus
-
-Make it feel like a McKinsey-style business brief.
-Avoid generic advice.
-Be specific and strategic.
+    (future, None) when this request is to run the completion and settle
+    the future, or (None, response) with the answer another request got.
+    A leader that gives up settles with None, and its followers try again,
+    one of them taking over as leader.
     """
+    while True:
+        leader = _in_flight.get(key)
+        if leader is None:
+            future = asyncio.get_running_loop().create_future()
+            _in_flight[key] = future
+            return future, None
+        response = await asyncio.shield(leader)
+        if response is not None:
+            return None, response
+
+
+def _settle(key: tuple, future: asyncio.Future, result: str = None, error: BaseException = None) -> None:
+    if _in_flight.get(key) is future:
+        del _in_flight[key]
+    if future.done():
+        return
+    if isinstance(error, LLMError):
+        future.set_exception(error)
+        future.exception()  # followers re-raise it; don't warn if there are none
+    else:
+        # Anything else, e.g. the leader's client disconnecting (CancelledError,
+        # GeneratorExit), is the leader's own business: followers retry
+        future.set_result(None if error is not None else result)
+
+
+async def generate_careops_response(db: Session, workspace_id: str, user_message: str) -> str:
+    started = time.perf_counter()
+    # A snapshot miss runs the aggregate queries on the sync session; keep them off the event loop
+    snapshot = await run_in_threadpool(metrics_snapshot_service.get_snapshot, db, workspace_id)
+    if snapshot is None:
+        return "Workspace not found."
 
-    print("FINAL PROMPT:", final_prompt)  # Debug
-
-    return generate_response(final_prompt)
+    cached = response_cache.get(workspace_id, snapshot["version"], user_message)
+    if cached is not None:
+        _record(workspace_id, [], cached, started, "cache")
+        return cached
+
+    key = (workspace_id, snapshot["version"], normalize_prompt(user_message))
+    future, response = await _lead_or_follow(key)
+    if future is None:
+        _record(workspace_id, [], response, started, "coalesced")
+        return response
+
+    messages = build_messages(snapshot, user_message, settings.AI_CONTEXT_TOKEN_BUDGET)
+    try:
+        response = await llm_client.complete(workspace_id, messages)
+    except BaseException as e:
+        _settle(key, future, error=e)
+        raise
+    _settle(key, future, result=response)
+
+    response_cache.set(workspace_id, snapshot["version"], user_message, response)
+    _record(workspace_id, messages, response, started, "llm")
+    return response
+
+
+async def stream_careops_response(snapshot: dict, workspace_id: str, user_message: str) -> AsyncIterator[str]:
+    """Stream an answer; cached and coalesced answers are sent as a single chunk"""
+    started = time.perf_counter()
+    cached = response_cache.get(workspace_id, snapshot["version"], user_message)
+    if cached is not None:
+        _record(workspace_id, [], cached, started, "cache")
+        yield cached
+        return
+
+    key = (workspace_id, snapshot["version"], normalize_prompt(user_message))
+    future, response = await _lead_or_follow(key)
+    if future is None:
+        _record(workspace_id, [], response, started, "coalesced")
+        yield response
+        return
+
+    messages = build_messages(snapshot, user_message, settings.AI_CONTEXT_TOKEN_BUDGET)
+    parts = []
+    try:
+        async for delta in llm_client.stream(workspace_id, messages):
+            parts.append(delta)
+            yield delta
+    except BaseException as e:
+        _settle(key, future, error=e)
+        raise
+    response = "".join(parts)
+    _settle(key, future, result=response)
+
+    response_cache.set(workspace_id, snapshot["version"], user_message, response)
+    _record(workspace_id, messages, response, started, "llm")
@@ -1,35 +1,62 @@
-from app.models.booking import Booking
-from app.models.contact import Contact
-from app.models.service import Service
-from app.models.workspace import Workspace
+from app.services.metrics_service import metrics_snapshot_service
+
+
+def business_context_lines(snapshot: dict) -> list[str]:
+    """Context lines, most important first, so a token budget can cut from the end"""
+    bookings = snapshot["bookings"]
+    forms = snapshot["forms"]
+    response_times = snapshot["response_times"]
+
+    lines = [
+        f"Business Overview for {snapshot['workspace']['name']}:",
+        f"- Active: {snapshot['workspace']['is_active']}",
+        f"- Total Bookings: {bookings['total']}",
+        "- Bookings by Status: " + ", ".join(
+            f"{status} {count}" for status, count in bookings["by_status"].items()
+        ),
+    ]
+
+    if snapshot["top_services"]:
+        lines.append("- Top Services (90 days): " + ", ".join(
+            f"{svc['name']} ({svc['bookings']})" for svc in snapshot["top_services"]
+        ))
+
+    if snapshot["inventory"]["low_stock"]:
+        lines.append("- Low Stock: " + ", ".join(
+            f"{item['name']} ({item['quantity']} {item['unit']}, threshold {item['threshold']})"
+            for item in snapshot["inventory"]["low_stock"]
+        ))
+
+    if forms["total"]:
+        lines.append(
+            f"- Forms: {forms['completed']}/{forms['total']} completed "
+            f"({forms['completion_rate']:.0%}), {forms['pending']} pending, {forms['overdue']} overdue"
+        )
+
+    if response_times["avg_first_reply_minutes"] is not None:
+        lines.append(
+            f"- First Reply Time (30 days): avg {response_times['avg_first_reply_minutes']} min, "
+            f"median {response_times['median_first_reply_minutes']} min "
+            f"over {response_times['conversations_replied']} conversations"
+        )
+
+    lines += [
+        "- Bookings by Week: " + ", ".join(
+            f"{week['week_start']}: {week['count']}" for week in bookings["by_week"]
+        ),
+        f"- Total Clients: {snapshot['contacts']}",
+        f"- Total Users: {snapshot['users']}",
+        f"- Total Services: {snapshot['services']}",
+    ]
+    return lines
+
+
+def format_business_context(snapshot: dict) -> str:
+    return "\n".join(business_context_lines(snapshot))
 
 
 def build_business_context(db, workspace_id):
-
-    workspace = db.query(Workspace).filter_by(id=workspace_id).first()
-
-    total_bookings = (
-        db.query(Booking)
-        .filter_by(workspace_id=workspace_id)
-        .count()
-    )
-
-    total_contacts = (
-        db.query(Contact)
-        .filter_by(workspace_id=workspace_id)
-        .count()
-    )
-
-    total_services = (
-        db.query(Service)
-        .filter_by(workspace_id=workspace_id)
-        .count()
-    )
-
-    return f"""
-    Business Overview for {workspace.name}:
-
-    - Total Bookings: {total_bookings}
-    - Total Clients: {total_contacts}
-    - Total Services: {total_services}
-    """
+    snapshot = metrics_snapshot_service.get_snapshot(db, workspace_id)
+    if snapshot is None:
+        return None
+    return format_business_context(snapshot)
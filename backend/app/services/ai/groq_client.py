@@ -1,17 +1,29 @@
-from groq import Groq
+from typing import AsyncIterator
 from app.config import settings
+from app.services.providers import providers
 
-client = Groq(api_key=settings.groq_api_key)
 
-def generate_response(prompt: str) -> str:
-    completion = client.chat.completions.create(
-        model="llama-3.1-8b-instant",   # ✅ Updated model
-        messages=[
-            {"role": "system", "content": "You are CareOpsGPT, an AI business operations expert."},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.7,
-        max_tokens=800,
+async def generate_response(messages: list[dict], max_tokens: int = 800) -> str:
+    completion = await providers.get("groq").chat.completions.create(
+        model=settings.AI_MODEL,
+        messages=messages,
+        temperature=settings.AI_TEMPERATURE,
+        max_tokens=max_tokens,
     )
 
     return completion.choices[0].message.content
+
+
+async def stream_response(messages: list[dict], max_tokens: int = 800) -> AsyncIterator[str]:
+    stream = await providers.get("groq").chat.completions.create(
+        model=settings.AI_MODEL,
+        messages=messages,
+        temperature=settings.AI_TEMPERATURE,
+        max_tokens=max_tokens,
+        stream=True,
+    )
+
+    async for chunk in stream:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if delta:
+            yield delta
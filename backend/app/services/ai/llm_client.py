@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from app.config import settings
+from app.services.ai import groq_client
+from app.services.providers import ProviderNotConfiguredError
+
+logger = logging.getLogger(__name__)
+
+
+class LLMError(Exception):
+    """Base error for AI completion failures"""
+
+
+class LLMBusyError(LLMError):
+    """Raised when a workspace already has the maximum number of requests in flight"""
+
+
+class LLMTimeoutError(LLMError):
+    """Raised when a completion does not finish within the request timeout"""
+
+
+class LLMBackend:
+    """Interface every completion provider implements"""
+
+    name = "base"
+
+    async def complete(self, messages: list[dict], max_tokens: int) -> str:
+        raise NotImplementedError
+
+    async def stream(self, messages: list[dict], max_tokens: int) -> AsyncIterator[str]:
+        raise NotImplementedError
+        yield  # pragma: no cover
+
+
+class GroqBackend(LLMBackend):
+    """
+    Groq completions; the SDK client comes from the provider registry on first
+    call. SDK errors (API, rate limit, connection) are raised as LLMError so
+    callers handle them like any other failed completion.
+    """
+
+    name = "groq"
+
+    @staticmethod
+    def _error(e: Exception) -> Optional[LLMError]:
+        if isinstance(e, ProviderNotConfiguredError):
+            return LLMError(f"AI provider is not configured: {e}")
+        from groq import APIError, APITimeoutError
+        if isinstance(e, APITimeoutError):
+            return LLMTimeoutError(f"AI provider timed out: {e}")
+        if isinstance(e, APIError):
+            return LLMError(f"AI provider error: {e}")
+        return None
+
+    async def complete(self, messages, max_tokens):
+        try:
+            return await groq_client.generate_response(messages, max_tokens=max_tokens)
+        except Exception as e:
+            error = self._error(e)
+            if error is None:
+                raise
+            raise error from e
+
+    async def stream(self, messages, max_tokens):
+        try:
+            async for delta in groq_client.stream_response(messages, max_tokens=max_tokens):
+                yield delta
+        except Exception as e:
+            error = self._error(e)
+            if error is None:
+                raise
+            raise error from e
+
+
+class FakeLLMBackend(LLMBackend):
+    """Offline backend - deterministic canned answer, optionally paced per token"""
+
+    name = "fake"
+
+    def __init__(self, token_delay_ms: int = 0):
+        self.token_delay = token_delay_ms / 1000
+
+    def _answer(self, messages: list[dict]) -> str:
+        prompt_words = sum(len(m["content"].split()) for m in messages)
+        return (
+            "📊 Executive Snapshot\n"
+            f"- Offline answer for a {prompt_words}-word prompt.\n"
+            "🎯 Strategic Focus\n"
+            "- Connect a live AI provider for real insights."
+        )
+
+    async def complete(self, messages, max_tokens):
+        answer = self._answer(messages)
+        if self.token_delay:
+            await asyncio.sleep(self.token_delay * len(answer.split(" ")))
+        return answer
+
+    async def stream(self, messages, max_tokens):
+        words = self._answer(messages).split(" ")
+        for i, word in enumerate(words):
+            if self.token_delay:
+                await asyncio.sleep(self.token_delay)
+            yield word if i == 0 else " " + word
+
+
+def build_backend(name: str) -> LLMBackend:
+    if name == "fake":
+        return FakeLLMBackend(token_delay_ms=settings.AI_FAKE_TOKEN_DELAY_MS)
+    if name == "groq":
+        return GroqBackend()
+    raise ValueError(f"Unknown AI backend: {name}")
+
+
+class LLMClient:
+    """
+    Async front door for completions: caps in-flight requests per workspace and
+    bounds every call (including each streamed chunk) by a single deadline.
+    """
+
+    def __init__(self, backend: LLMBackend, max_concurrency_per_workspace: int = 4, timeout: float = 30.0):
+        self.backend = backend
+        self.max_concurrency = max_concurrency_per_workspace
+        self.timeout = timeout
+        self._in_flight: dict[str, int] = {}
+
+    def has_capacity(self, workspace_id: str) -> bool:
+        return self._in_flight.get(workspace_id, 0) < self.max_concurrency
+
+    @asynccontextmanager
+    async def _slot(self, workspace_id: str):
+        # Reject instead of queueing: a queued chat request is worse than a quick retry hint
+        if not self.has_capacity(workspace_id):
+            raise LLMBusyError("Too many AI requests in progress for this workspace")
+        self._in_flight[workspace_id] = self._in_flight.get(workspace_id, 0) + 1
+        try:
+            yield
+        finally:
+            self._in_flight[workspace_id] -= 1
+            if not self._in_flight[workspace_id]:
+                del self._in_flight[workspace_id]
+
+    async def complete(self, workspace_id: str, messages: list[dict], max_tokens: int | None = None) -> str:
+        async with self._slot(workspace_id):
+            start = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(
+                    self.backend.complete(messages, max_tokens or settings.AI_MAX_TOKENS),
+                    timeout=self.timeout
+                )
+            except asyncio.TimeoutError:
+                raise LLMTimeoutError(f"AI completion timed out after {self.timeout}s")
+            logger.info(f"AI completion ({self.backend.name}) took {time.perf_counter() - start:.2f}s")
+            return result
+
+    async def stream(self, workspace_id: str, messages: list[dict], max_tokens: int | None = None) -> AsyncIterator[str]:
+        async with self._slot(workspace_id):
+            start = time.perf_counter()
+            deadline = start + self.timeout
+            chunks = self.backend.stream(messages, max_tokens or settings.AI_MAX_TOKENS).__aiter__()
+            try:
+                while True:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        raise LLMTimeoutError(f"AI stream timed out after {self.timeout}s")
+                    try:
+                        delta = await asyncio.wait_for(chunks.__anext__(), timeout=remaining)
+                    except StopAsyncIteration:
+                        break
+                    except asyncio.TimeoutError:
+                        raise LLMTimeoutError(f"AI stream timed out after {self.timeout}s")
+                    yield delta
+            finally:
+                await chunks.aclose()
+            logger.info(f"AI stream ({self.backend.name}) took {time.perf_counter() - start:.2f}s")
+
+
+llm_client = LLMClient(
+    build_backend(settings.AI_BACKEND),
+    max_concurrency_per_workspace=settings.AI_MAX_CONCURRENCY_PER_WORKSPACE,
+    timeout=settings.AI_REQUEST_TIMEOUT_SECONDS
+)
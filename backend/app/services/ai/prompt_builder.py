@@ -0,0 +1,56 @@
+from app.services.ai.context_builder import business_context_lines
+
+# Static instructions, sent once as the system message instead of being
+# repeated inside every user prompt.
+SYSTEM_PROMPT = """You are CareOpsGPT — an elite AI Business Intelligence Advisor for high-growth service businesses.
+
+You ONLY answer in the context of managing service businesses.
+
+If the user asks about forms, bookings, customers, revenue,
+always respond with practical fields and structured output.
+
+Response Rules:
+- Write in premium executive tone.
+- Use structured bullet points.
+- Use relevant but minimal emojis (not too many).
+- Provide deeper strategic insights (not obvious statements).
+- Highlight risks, opportunities, and growth levers.
+- Keep it concise but powerful.
+- Format sections like this:
+
+📊 Executive Snapshot
+📈 Performance Insights
+⚠️ Risk Signals
+🚀 Growth Opportunities
+🎯 Strategic Focus
+
+Make it feel like a McKinsey-style business brief.
+Avoid generic advice.
+Be specific and strategic."""
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)"""
+    return len(text) // 4 + 1
+
+
+def compact_context(snapshot: dict, budget_tokens: int) -> str:
+    """Keep context lines in priority order until the token budget is spent"""
+    lines = business_context_lines(snapshot)
+    kept = [lines[0]]
+    used = estimate_tokens(lines[0])
+    for line in lines[1:]:
+        cost = estimate_tokens(line)
+        if used + cost > budget_tokens:
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept)
+
+
+def build_messages(snapshot: dict, user_message: str, context_budget: int) -> list[dict]:
+    context = compact_context(snapshot, context_budget)
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"Business Metrics:\n{context}\n\nUser Request:\n{user_message}"}
+    ]
@@ -0,0 +1,119 @@
+import re
+import threading
+from typing import Optional
+from app.config import settings
+from app.services.cache import TTLCache
+
+# Words that can change between two phrasings of the same question. Every
+# other word, negations, periods ("week", "month") and verbs ("promote",
+# "retire") included, has to be the same for a cached answer to be reused.
+FILLER_WORDS = frozenset("""
+    a an the please me my i we our us you your it its is are was were be
+    do does did can could would should will what which tell show give
+""".split())
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    text = _PUNCTUATION.sub(" ", prompt.lower())
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def content_key(normalized: str) -> tuple:
+    """The distinct non-filler words of a normalized prompt, sorted"""
+    return tuple(sorted(set(normalized.split()) - FILLER_WORDS))
+
+
+class ResponseCache:
+    """
+    CareOpsGPT answer cache keyed by (workspace, metrics snapshot version,
+    normalized prompt). When the workspace's snapshot version moves on, older
+    answers are dropped, so cached advice never outlives the numbers it was
+    based on. Rephrasings are matched within the same workspace and version
+    when they differ only in filler words and word order. Scored similarity
+    would also match prompts that differ in the one word that matters
+    ("promote" / "retire", "week" / "month"), so it is not used.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, similarity: bool = True):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.similarity = similarity
+        self._versions: dict[str, str] = {}
+        # (workspace_id, version) -> {content_key: normalized prompt}
+        self._index: dict[tuple[str, str], dict[tuple, str]] = {}
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+
+    def _sync_version(self, workspace_id: str, version: str) -> None:
+        with self._lock:
+            previous = self._versions.get(workspace_id)
+            if previous == version:
+                return
+            self._versions[workspace_id] = version
+            if previous is not None:
+                self._index.pop((workspace_id, previous), None)
+        if previous is not None:
+            self._entries.invalidate_where(lambda key: key[0] == workspace_id and key[1] != version)
+
+    def get(self, workspace_id: str, version: str, prompt: str) -> Optional[str]:
+        self._sync_version(workspace_id, version)
+        normalized = normalize_prompt(prompt)
+
+        response = self._entries.get((workspace_id, version, normalized))
+        if response is not None:
+            self.exact_hits += 1
+            return response
+
+        if self.similarity:
+            with self._lock:
+                similar = self._index.get((workspace_id, version), {}).get(content_key(normalized))
+            if similar is not None:
+                response = self._entries.get((workspace_id, version, similar))
+                if response is not None:
+                    self.similar_hits += 1
+                    return response
+
+        self.misses += 1
+        return None
+
+    def set(self, workspace_id: str, version: str, prompt: str, response: str) -> None:
+        self._sync_version(workspace_id, version)
+        normalized = normalize_prompt(prompt)
+        self._entries.set((workspace_id, version, normalized), response)
+
+        if self.similarity:
+            with self._lock:
+                index = self._index.setdefault((workspace_id, version), {})
+                index[content_key(normalized)] = normalized
+                # Keep the per-workspace index bounded by the entry cache size
+                if len(index) > self._entries.maxsize:
+                    del index[next(iter(index))]
+
+    def invalidate_workspace(self, workspace_id: str) -> None:
+        with self._lock:
+            self._versions.pop(workspace_id, None)
+            for key in [k for k in self._index if k[0] == workspace_id]:
+                del self._index[key]
+        self._entries.invalidate_where(lambda key: key[0] == workspace_id)
+
+    def stats(self) -> dict:
+        lookups = self.exact_hits + self.similar_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "exact_hits": self.exact_hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.exact_hits + self.similar_hits) / lookups, 4) if lookups else 0.0,
+            "similarity_enabled": self.similarity
+        }
+
+
+response_cache = ResponseCache(
+    maxsize=settings.AI_CACHE_MAX_ENTRIES,
+    ttl=settings.AI_CACHE_TTL_SECONDS,
+    similarity=settings.AI_CACHE_SIMILARITY_ENABLED
+)
@@ -1,16 +1,21 @@
+import asyncio
 import logging
 from datetime import datetime, timedelta
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from app.database import Base, SessionLocal
 from app.models import (
-    AutomationRule, AutomationLog, Conversation, Message, Alert,
+    AutomationRule, AutomationLog, Booking, Conversation, Message, Alert,
     FormSubmission, InventoryItem
 )
 from app.models.automation import AutomationTrigger
 from app.models.message import MessageType, MessageDirection, MessageStatus
 from app.models.alert import AlertType, AlertSeverity
 from app.models.form_submission import SubmissionStatus
+from app.services.contact_profile import contact_stats_service
 from app.services.email_service import EmailService
 from app.services.sms_service import SMSService
+from app.services.timezones import to_local
 import uuid
 
 logger = logging.getLogger(__name__)
@@ -63,7 +68,7 @@ class AutomationEngine:
 
         # Create automated message
         message = Message(
-            id=uuid.uuid4(),
+            id=str(uuid.uuid4()),
             conversation_id=conversation.id if conversation else None,
             message_type=MessageType.EMAIL if contact.email else MessageType.SMS,
             direction=MessageDirection.OUTBOUND,
@@ -90,19 +95,36 @@ class AutomationEngine:
         self._log(workspace_id, None, "contact_created", "send_welcome", "success")
 
     async def _handle_booking_created(self, workspace_id, context):
-        """Send confirmation and forms when booking is created"""
+        """
+        Send confirmation and forms when a booking is created. For a series
+        the context carries "series" instead of "booking", and the contact
+        gets one confirmation listing every occurrence.
+        """
         from app.models import Workspace, Service
         workspace = self.db.query(Workspace).filter(Workspace.id == workspace_id).first()
         if not workspace:
             return
 
-        booking = context.get("booking")
+        series = context.get("series")
+        if series is not None:
+            bookings = self.db.query(Booking).filter(
+                Booking.series_id == series.id
+            ).order_by(Booking.booking_date).all()
+        else:
+            bookings = [context.get("booking")]
+        booking = bookings[0]
         contact = context.get("contact")
         service = self.db.query(Service).filter(Service.id == booking.service_id).first()
 
+        def when(b):
+            return to_local(b.booking_date, workspace.timezone).strftime('%B %d, %Y at %I:%M %p')
+
         confirmation_msg = workspace.booking_confirmation_message or "Your booking has been confirmed!"
         confirmation_msg += f"\n\nService: {service.name if service else 'N/A'}"
-        confirmation_msg += f"\nDate: {booking.booking_date.strftime('%B %d, %Y at %I:%M %p')}"
+        if len(bookings) == 1:
+            confirmation_msg += f"\nDate: {when(booking)}"
+        else:
+            confirmation_msg += f"\nDates ({len(bookings)}):\n" + "\n".join(f"- {when(b)}" for b in bookings)
 
         # Send confirmation
         if contact.email and workspace.email_connected:
@@ -117,11 +139,12 @@ class AutomationEngine:
             sms_svc = SMSService({"provider": workspace.sms_provider})
             await sms_svc.send_sms(contact.phone, confirmation_msg)
 
-        # Create form submissions if service has linked forms
+        # Create form submissions if service has linked forms; a series fills
+        # them in once, before its first occurrence
         if service and service.linked_form_ids:
             for form_id in service.linked_form_ids:
                 submission = FormSubmission(
-                    id=uuid.uuid4(),
+                    id=str(uuid.uuid4()),
                     template_id=form_id,
                     contact_id=contact.id,
                     booking_id=booking.id,
@@ -148,13 +171,20 @@ class AutomationEngine:
                     InventoryItem.id == inv.get("item_id")
                 ).first()
                 if item:
-                    item.quantity -= inv.get("quantity_per_booking", 1)
+                    item.quantity -= inv.get("quantity_per_booking", 1) * len(bookings)
                     if item.quantity <= item.low_stock_threshold:
                         await self.trigger(workspace_id, AutomationTrigger.INVENTORY_LOW, {"item": item})
 
-        booking.confirmation_sent = "yes"
+        for b in bookings:
+            b.confirmation_sent = "yes"
+        contact_id = contact.id
         self.db.commit()
-        self._log(workspace_id, None, "booking_created", "send_confirmation", "success")
+        # The form submissions above count towards the contact's profile stats
+        contact_stats_service.invalidate(contact_id)
+        self._log(
+            workspace_id, None, "booking_created", "send_confirmation", "success",
+            f"Series {series.id}: {len(bookings)} bookings" if series is not None else None
+        )
 
     async def _handle_form_pending(self, workspace_id, context):
         """Send reminder for pending forms"""
@@ -182,7 +212,7 @@ class AutomationEngine:
 
         severity = AlertSeverity.CRITICAL if item.quantity <= 0 else AlertSeverity.WARNING
         alert = Alert(
-            id=uuid.uuid4(),
+            id=str(uuid.uuid4()),
             workspace_id=workspace_id,
             alert_type=AlertType.LOW_INVENTORY,
             severity=severity,
@@ -208,7 +238,7 @@ class AutomationEngine:
 
     def _log(self, workspace_id, rule_id, trigger, action, status, details=None):
         log = AutomationLog(
-            id=uuid.uuid4(),
+            id=str(uuid.uuid4()),
             workspace_id=workspace_id,
             rule_id=rule_id,
             trigger=trigger,
@@ -217,4 +247,26 @@ class AutomationEngine:
             details=details
         )
         self.db.add(log)
-        self.db.commit()
\ No newline at end of file
+        self.db.commit()
+
+
+def _run_trigger(workspace_id, trigger_type: str, context: dict):
+    db = SessionLocal()
+    try:
+        context = {
+            key: db.merge(value) if isinstance(value, Base) else value
+            for key, value in context.items()
+        }
+        asyncio.run(AutomationEngine(db).trigger(workspace_id, trigger_type, context))
+    finally:
+        db.close()
+
+
+async def trigger_automation(workspace_id, trigger_type: str, context: dict):
+    """
+    Run a trigger from code that holds an AsyncSession. The engine works on a
+    sync Session and sends through blocking provider clients, so it runs in
+    the threadpool on its own Session, with any ORM objects in the context
+    merged into it.
+    """
+    await run_in_threadpool(_run_trigger, workspace_id, trigger_type, context)
@@ -0,0 +1,253 @@
+import heapq
+import itertools
+import math
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Iterable, Iterator, Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import selectinload
+from app.models.service import Service, Availability, ServiceResource
+from app.services.timezones import local_to_utc, to_local, utc_to_local_minutes
+
+# Weekly availability as one int bitmask per weekday, one bit per 5-minute tick.
+# Stored on Service.availability_bitmap as 7 x 36 little-endian bytes.
+TICK_MINUTES = 5
+TICKS_PER_DAY = 24 * 60 // TICK_MINUTES
+DAYS_PER_WEEK = 7
+DAY_BYTES = TICKS_PER_DAY // 8
+MINUTES_PER_DAY = 24 * 60
+
+
+def catalog_statement(workspace_id: str):
+    """
+    Active services of a workspace with their active availabilities loaded in
+    one extra SELECT ... IN query, so the catalog costs two queries however
+    many services there are. Works with both Session and AsyncSession.
+    """
+    return select(Service).options(
+        selectinload(Service.availabilities.and_(Availability.is_active == True))
+    ).where(
+        Service.workspace_id == workspace_id,
+        Service.is_active == True
+    )
+
+
+def resource_count():
+    """Active resources of each selected service, as a correlated subquery labelled `resources`"""
+    return select(func.count(ServiceResource.id)).where(
+        ServiceResource.service_id == Service.id,
+        ServiceResource.is_active == True
+    ).correlate(Service).scalar_subquery().label("resources")
+
+
+def slot_columns() -> tuple:
+    """The Service columns search_slots needs, for a select that skips the ORM objects"""
+    return (
+        Service.id, Service.name, Service.duration_minutes, Service.availability_bitmap,
+        Service.capacity, resource_count()
+    )
+
+
+def effective_capacity(capacity: Optional[int], resources: Optional[int]) -> int:
+    """Bookings a service can take at once: capacity per resource, one resource if none are set"""
+    return max(capacity or 1, 1) * max(resources or 0, 1)
+
+
+def parse_minutes(hhmm: str) -> int:
+    hours, minutes = hhmm.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def _tick_range(start: int, end: int) -> int:
+    start, end = max(start, 0), min(end, TICKS_PER_DAY)
+    if end <= start:
+        return 0
+    return ((1 << (end - start)) - 1) << start
+
+
+def window_mask(start_minutes: int, end_minutes: int) -> int:
+    """Bits for the ticks fully inside [start, end)"""
+    return _tick_range(-(-start_minutes // TICK_MINUTES), end_minutes // TICK_MINUTES)
+
+
+def span_mask(start_minutes: int, end_minutes: int) -> int:
+    """Bits for every tick that [start, end) touches"""
+    return _tick_range(start_minutes // TICK_MINUTES, -(-end_minutes // TICK_MINUTES))
+
+
+def weekly_bitmap(availabilities) -> list[int]:
+    """Merge availability rows into one tick mask per weekday (Monday first)"""
+    week = [0] * DAYS_PER_WEEK
+    for a in availabilities:
+        if 0 <= a.day_of_week < DAYS_PER_WEEK:
+            week[a.day_of_week] |= window_mask(parse_minutes(a.start_time), parse_minutes(a.end_time))
+    return week
+
+
+def pack_week(week: list[int]) -> bytes:
+    return b"".join(day.to_bytes(DAY_BYTES, "little") for day in week)
+
+
+def unpack_week(data: Optional[bytes]) -> list[int]:
+    """Services without a stored bitmap have no availability"""
+    if not data:
+        return [0] * DAYS_PER_WEEK
+    return [
+        int.from_bytes(data[day * DAY_BYTES:(day + 1) * DAY_BYTES], "little")
+        for day in range(DAYS_PER_WEEK)
+    ]
+
+
+def _tick_span(start: float, end: float) -> tuple[int, int]:
+    start = int(max(math.floor(start), 0))
+    end = int(min(math.ceil(end), MINUTES_PER_DAY))
+    return start // TICK_MINUTES, -(-end // TICK_MINUTES)
+
+
+def booked_mask(intervals: Iterable[tuple[float, float]]) -> int:
+    """Ticks of one day touched by any (start, end) interval, in minutes from local midnight"""
+    mask = 0
+    for start, end in intervals:
+        mask |= _tick_range(*_tick_span(start, end))
+    return mask
+
+
+def tick_load(intervals: Iterable[tuple[float, float]]) -> list[int]:
+    """
+    Number of (start, end) intervals touching each tick of one day, from a
+    sweep over the interval endpoints rather than a count per tick
+    """
+    delta = [0] * (TICKS_PER_DAY + 1)
+    for start, end in intervals:
+        first, last = _tick_span(start, end)
+        if first < last:
+            delta[first] += 1
+            delta[last] -= 1
+    return list(itertools.accumulate(delta[:TICKS_PER_DAY]))
+
+
+def full_mask(load: list[int], capacity: int) -> int:
+    """Ticks whose load has reached capacity"""
+    mask = 0
+    for tick, count in enumerate(load):
+        if count >= capacity:
+            mask |= 1 << tick
+    return mask
+
+
+def slot_starts(day_mask: int, booked: int, duration_minutes: int) -> list[int]:
+    """
+    Start minutes of the free slots of one day. Slots are laid back to back
+    from the start of each availability window; a slot is free when its ticks
+    are all set in day_mask & ~booked.
+    """
+    free = day_mask & ~booked
+    starts = []
+    for start_tick, end_tick in windows(day_mask):
+        minute = start_tick * TICK_MINUTES
+        end = end_tick * TICK_MINUTES
+        while minute + duration_minutes <= end:
+            slot = span_mask(minute, minute + duration_minutes)
+            if slot & free == slot:
+                starts.append(minute)
+            minute += duration_minutes
+    return starts
+
+
+def windows(day_mask: int) -> list[tuple[int, int]]:
+    """Contiguous (start_tick, end_tick) runs of a day mask"""
+    runs = []
+    tick = 0
+    while day_mask:
+        skip = (day_mask & -day_mask).bit_length() - 1
+        day_mask >>= skip
+        tick += skip
+        length = (~day_mask & (day_mask + 1)).bit_length() - 1
+        runs.append((tick, tick + length))
+        day_mask >>= length
+        tick += length
+    return runs
+
+
+def search_slots(services, bookings, first_day: date, days: int, now: datetime, tz_name: Optional[str]) -> Iterator[tuple]:
+    """
+    Free slots of several services over a range of local days, in start time
+    order across services. `services` are rows with the slot_columns();
+    `bookings` are (service_id, start, end) rows in naive UTC covering the
+    whole range, so the caller needs one bookings query. Availability is read
+    as wall-clock time in `tz_name`. A slot is free while the bookings
+    overlapping it stay below the service's effective capacity. Yields naive
+    UTC (start, end, service, remaining) lazily, one day at a time, so a
+    caller that only wants the earliest slot stops after the first day with one.
+    """
+    weeks = {svc.id: unpack_week(svc.availability_bitmap) for svc in services}
+    capacities = {svc.id: effective_capacity(svc.capacity, svc.resources) for svc in services}
+
+    # Split every booking into local-minute intervals of each day it touches
+    booked = defaultdict(list)
+    for service_id, start, end in bookings:
+        first = max((to_local(start, tz_name).date() - first_day).days, 0)
+        last = min((to_local(end - timedelta(microseconds=1), tz_name).date() - first_day).days, days - 1)
+        for offset in range(first, last + 1):
+            day = first_day + timedelta(days=offset)
+            booked[(service_id, offset)].append((
+                utc_to_local_minutes(start, day, tz_name),
+                utc_to_local_minutes(end, day, tz_name)
+            ))
+
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        per_service = []
+        for order, svc in enumerate(services):
+            day_mask = weeks[svc.id][day.weekday()]
+            if not day_mask:
+                continue
+            capacity = capacities[svc.id]
+            intervals = booked.get((svc.id, offset))
+            if not intervals:
+                starts = slot_starts(day_mask, 0, svc.duration_minutes)
+                per_service.append([(minute, order, capacity) for minute in starts])
+            elif capacity == 1:
+                starts = slot_starts(day_mask, booked_mask(intervals), svc.duration_minutes)
+                per_service.append([(minute, order, 1) for minute in starts])
+            else:
+                load = tick_load(intervals)
+                starts = slot_starts(day_mask, full_mask(load, capacity), svc.duration_minutes)
+                per_service.append([
+                    (minute, order, capacity - max(load[slice(*_tick_span(minute, minute + svc.duration_minutes))]))
+                    for minute in starts
+                ])
+        for minute, order, remaining in heapq.merge(*per_service):
+            start = local_to_utc(day, minute, tz_name)
+            if start is not None and start > now:
+                svc = services[order]
+                yield start, start + timedelta(minutes=svc.duration_minutes), svc, remaining
+
+
+def serialize_slot(start: datetime, end: datetime, tz_name: Optional[str], remaining: int) -> dict:
+    """A slot as local ISO 8601 times with their UTC offset, a display label and the bookings it can still take"""
+    local_start = to_local(start, tz_name)
+    return {
+        "start": local_start.isoformat(),
+        "end": to_local(end, tz_name).isoformat(),
+        "display": local_start.strftime("%I:%M %p"),
+        "remaining": remaining
+    }
+
+
+def serialize_service(svc: Service) -> dict:
+    """Same fields as ServiceResponse, without a pydantic round trip per service"""
+    return {
+        "id": str(svc.id),
+        "name": svc.name,
+        "description": svc.description,
+        "duration_minutes": svc.duration_minutes,
+        "service_type": svc.service_type.value,
+        "location": svc.location,
+        "price": svc.price,
+        "color": svc.color,
+        "capacity": svc.capacity,
+        "is_active": svc.is_active,
+        "linked_form_ids": svc.linked_form_ids,
+        "linked_inventory": svc.linked_inventory
+    }
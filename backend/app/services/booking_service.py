@@ -0,0 +1,158 @@
+import itertools
+import logging
+import re
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from dateutil.rrule import rrulestr
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.booking import Booking, BookingStatus
+from app.models.service import Service, ServiceResource
+from app.services.timezones import to_local, to_storage
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = [BookingStatus.CONFIRMED, BookingStatus.PENDING]
+
+
+class SlotUnavailableError(Exception):
+    """Raised when a service has no capacity left for the requested time"""
+
+
+def peak_concurrency(intervals: Iterable[tuple[datetime, datetime]], start: datetime, end: datetime) -> int:
+    """
+    Most intervals overlapping at any instant of [start, end), by a sweep
+    over their sorted endpoints. Intervals are half-open, so one ending as
+    another starts does not overlap it.
+    """
+    events = []
+    for interval_start, interval_end in intervals:
+        interval_start, interval_end = max(interval_start, start), min(interval_end, end)
+        if interval_start < interval_end:
+            events.append((interval_start, 1))
+            events.append((interval_end, -1))
+    # At equal times the -1 sorts first, closing an interval before the next opens
+    events.sort()
+
+    peak = current = 0
+    for _at, delta in events:
+        current += delta
+        peak = max(peak, current)
+    return peak
+
+
+def pick_resource(overlapping, resource_ids: list, capacity: int, start: datetime, end: datetime) -> Optional[str]:
+    """
+    The resource for a booking over [start, end), given the (start, end,
+    resource_id) bookings overlapping it: the active resource with the lowest
+    peak load over that time, ties going to the first in `resource_ids`.
+    None for a service without resources; SlotUnavailableError when full.
+    """
+    total = capacity * max(len(resource_ids), 1)
+    if peak_concurrency([(b[0], b[1]) for b in overlapping], start, end) >= total:
+        raise SlotUnavailableError(f"Service is full at {start}")
+    if not resource_ids:
+        return None
+
+    by_resource = defaultdict(list)
+    for b in overlapping:
+        by_resource[b[2]].append((b[0], b[1]))
+    loads = {resource_id: peak_concurrency(by_resource[resource_id], start, end) for resource_id in resource_ids}
+    resource_id = min(resource_ids, key=loads.__getitem__)
+    if loads[resource_id] >= capacity:
+        # Room overall, but no single resource is free for the whole booking
+        raise SlotUnavailableError(f"No resource is free at {start}")
+    return resource_id
+
+
+async def _active_resources(db: AsyncSession, service: Service) -> list:
+    return (await db.scalars(select(ServiceResource.id).where(
+        ServiceResource.service_id == service.id,
+        ServiceResource.is_active == True
+    ).order_by(ServiceResource.created_at))).all()
+
+
+async def _overlapping(db: AsyncSession, service: Service, start: datetime, end: datetime) -> list:
+    return (await db.execute(select(Booking.booking_date, Booking.end_time, Booking.resource_id).where(
+        Booking.service_id == service.id,
+        Booking.status.in_(ACTIVE_STATUSES),
+        Booking.booking_date < end,
+        Booking.end_time > start
+    ))).all()
+
+
+async def allocate_resource(db: AsyncSession, service: Service, start: datetime, end: datetime) -> Optional[str]:
+    """
+    Check that `service` can take another booking over [start, end) and pick
+    the resource to assign it to (see pick_resource). One query for the
+    resources and one for the overlapping bookings.
+    """
+    resource_ids = await _active_resources(db, service)
+    overlapping = await _overlapping(db, service, start, end)
+    return pick_resource(overlapping, resource_ids, max(service.capacity or 1, 1), start, end)
+
+
+_UTC_UNTIL = re.compile(r"UNTIL=(\d{8}T\d{6})Z", re.IGNORECASE)
+
+
+def _local_until(rule: str, tz_name: Optional[str]) -> str:
+    """The rule with a UTC UNTIL ("...T000000Z") moved to wall-clock time in the workspace's zone"""
+    def local(match):
+        until = to_local(datetime.strptime(match.group(1), "%Y%m%dT%H%M%S"), tz_name)
+        return f"UNTIL={until:%Y%m%dT%H%M%S}"
+    return _UTC_UNTIL.sub(local, rule)
+
+
+def expand_series(rule: str, local_start: datetime, duration_minutes: int, tz_name: Optional[str], limit: int) -> list[tuple]:
+    """
+    Occurrences of an RRULE (e.g. "FREQ=WEEKLY;COUNT=12") from `local_start`,
+    naive wall-clock time in the workspace's zone, as naive UTC (start, end).
+    Expanding in local time keeps a weekly 9:00 at 9:00 across DST changes.
+    Raises ValueError for an invalid rule or one with more than `limit`
+    occurrences, including rules without COUNT or UNTIL.
+    """
+    # A UTC UNTIL, as RFC 5545 clients send it, cannot bound a naive start
+    local_starts = list(itertools.islice(rrulestr(_local_until(rule, tz_name), dtstart=local_start), limit + 1))
+    if len(local_starts) > limit:
+        raise ValueError(f"A series is limited to {limit} occurrences")
+    duration = timedelta(minutes=duration_minutes)
+    return [(start, start + duration) for start in (to_storage(local, tz_name) for local in local_starts)]
+
+
+def plan_series(occurrences: list[tuple], existing, resource_ids: list, capacity: int) -> tuple[list, list]:
+    """
+    Check every (start, end) occurrence against the existing (start, end,
+    resource_id) bookings in one sweep. Both are walked in start order while
+    a working set keeps only the bookings still open at the current
+    occurrence, and each placed occurrence joins it, so occurrences of the
+    same series count against each other too. Returns (placed, conflicts):
+    (start, end, resource_id) for the occurrences that fit and (start, end)
+    for those that do not.
+    """
+    existing = sorted(existing, key=lambda b: b[0])
+    active = []
+    position = 0
+    placed, conflicts = [], []
+    for start, end in sorted(occurrences):
+        while position < len(existing) and existing[position][0] < end:
+            active.append(existing[position])
+            position += 1
+        active = [b for b in active if b[1] > start]
+        try:
+            resource_id = pick_resource(active, resource_ids, capacity, start, end)
+        except SlotUnavailableError:
+            conflicts.append((start, end))
+            continue
+        placed.append((start, end, resource_id))
+        active.append((start, end, resource_id))
+    return placed, conflicts
+
+
+async def plan_series_for_service(db: AsyncSession, service: Service, occurrences: list[tuple]) -> tuple[list, list]:
+    """plan_series with one query for the resources and one range query for every booking the series could touch"""
+    if not occurrences:
+        return [], []
+    resource_ids = await _active_resources(db, service)
+    existing = await _overlapping(db, service, min(o[0] for o in occurrences), max(o[1] for o in occurrences))
+    return plan_series(occurrences, existing, resource_ids, max(service.capacity or 1, 1))
@@ -0,0 +1,73 @@
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from app.models.booking import Booking, BookingStatus
+from app.models.form_submission import FormSubmission, SubmissionStatus
+from app.services.cache import TTLCache
+
+
+def count_where(condition):
+    """SUM of 1 per row matching `condition`, 0 when there are none"""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+class ContactStatsService:
+    """
+    Booking and form aggregates for a contact's profile, one grouped query
+    each, cached per contact. Endpoints that write a contact's bookings or
+    form submissions call invalidate after committing; the TTL bounds how
+    long other worker processes can serve the previous numbers.
+    """
+
+    def __init__(self, ttl: int = 300, maxsize: int = 4096):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, db: Session, workspace_id: str, contact_id: str) -> dict:
+        stats = self._cache.get(str(contact_id))
+        if stats is None:
+            stats = self._compute(db, workspace_id, contact_id)
+            self._cache.set(str(contact_id), stats)
+        return stats
+
+    def invalidate(self, contact_id) -> None:
+        self._cache.invalidate(str(contact_id))
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+    def _compute(self, db: Session, workspace_id: str, contact_id: str) -> dict:
+        bookings = db.query(
+            func.count(Booking.id).label("total"),
+            count_where(Booking.status == BookingStatus.COMPLETED).label("visits"),
+            count_where(Booking.status == BookingStatus.NO_SHOW).label("no_shows"),
+            count_where(Booking.status == BookingStatus.CANCELLED).label("cancellations"),
+            func.max(case((Booking.status == BookingStatus.COMPLETED, Booking.booking_date))).label("last_visit")
+        ).filter(
+            Booking.workspace_id == workspace_id,
+            Booking.contact_id == contact_id
+        ).one()
+
+        forms = db.query(
+            count_where(FormSubmission.status.in_([SubmissionStatus.PENDING, SubmissionStatus.OVERDUE])).label("outstanding"),
+            count_where(FormSubmission.status == SubmissionStatus.OVERDUE).label("overdue"),
+            count_where(FormSubmission.status == SubmissionStatus.COMPLETED).label("completed")
+        ).filter(
+            FormSubmission.workspace_id == workspace_id,
+            FormSubmission.contact_id == contact_id
+        ).one()
+
+        # Of the bookings that came due, the share the contact did not turn up for
+        attended_or_missed = bookings.visits + bookings.no_shows
+        return {
+            "bookings": bookings.total,
+            "visits": bookings.visits,
+            "no_shows": bookings.no_shows,
+            "cancellations": bookings.cancellations,
+            "no_show_rate": round(bookings.no_shows / attended_or_missed, 3) if attended_or_missed else None,
+            "last_visit": str(bookings.last_visit) if bookings.last_visit else None,
+            "outstanding_forms": forms.outstanding,
+            "overdue_forms": forms.overdue,
+            "completed_forms": forms.completed
+        }
+
+
+contact_stats_service = ContactStatsService()
@@ -1,6 +1,7 @@
 import logging
 from typing import Optional
 from app.config import settings
+from app.services.providers import providers
 
 logger = logging.getLogger(__name__)
 
@@ -31,10 +32,9 @@ class EmailService:
 
     async def _send_sendgrid(self, to_email, subject, body, from_email):
         try:
-            import sendgrid
             from sendgrid.helpers.mail import Mail
 
-            sg = sendgrid.SendGridAPIClient(api_key=settings.SENDGRID_API_KEY)
+            sg = providers.get("sendgrid")
             message = Mail(
                 from_email=from_email or settings.SENDGRID_FROM_EMAIL,
                 to_emails=to_email,
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.booking import Booking, BookingStatus
+from app.models.contact import Contact
+from app.models.conversation import Conversation
+from app.models.form_submission import FormSubmission, SubmissionStatus
+from app.models.inventory import InventoryItem
+from app.models.message import Message, MessageDirection
+from app.models.service import Service
+from app.models.user import User
+from app.models.workspace import Workspace
+from app.services.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+WEEKS_BACK = 4
+TOP_SERVICES_LIMIT = 5
+TOP_SERVICES_WINDOW_DAYS = 90
+RESPONSE_TIME_WINDOW_DAYS = 30
+
+
+class MetricsSnapshotService:
+    """
+    Builds a per-workspace business metrics snapshot in a handful of grouped
+    queries and caches it for a short TTL. Shared by the CareOpsGPT entry points
+    so a chat burst does not re-count the whole workspace on every message.
+    """
+
+    def __init__(self, ttl: int = 60, maxsize: int = 512):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get_snapshot(self, db: Session, workspace_id: str) -> Optional[dict]:
+        """Return the cached snapshot for a workspace, computing it if stale"""
+        snapshot = self._cache.get(workspace_id)
+        if snapshot is None:
+            snapshot = self._compute(db, workspace_id)
+            if snapshot is not None:
+                self._cache.set(workspace_id, snapshot)
+        return snapshot
+
+    def invalidate(self, workspace_id: str) -> None:
+        self._cache.invalidate(workspace_id)
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+    def _compute(self, db: Session, workspace_id: str) -> Optional[dict]:
+        workspace = db.query(Workspace).filter(Workspace.id == workspace_id).first()
+        if not workspace:
+            return None
+
+        now = datetime.utcnow()
+        week_start = (now - timedelta(days=now.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+        # Oldest first: WEEKS_BACK completed weeks, the current week and the next one
+        week_starts = [week_start + timedelta(weeks=i) for i in range(-WEEKS_BACK, 2)]
+
+        # === Bookings: status and weekly buckets in one pass ===
+        booking_columns = [func.count(Booking.id)]
+        booking_columns += [
+            func.sum(case((Booking.status == status, 1), else_=0)) for status in BookingStatus
+        ]
+        booking_columns += [
+            func.sum(case(((Booking.booking_date >= start) & (Booking.booking_date < start + timedelta(weeks=1)), 1), else_=0))
+            for start in week_starts
+        ]
+        row = db.query(*booking_columns).filter(Booking.workspace_id == workspace_id).one()
+        total_bookings = row[0] or 0
+        status_counts = row[1:1 + len(BookingStatus)]
+        week_counts = row[1 + len(BookingStatus):]
+
+        bookings_by_status = {
+            status.value: int(count or 0) for status, count in zip(BookingStatus, status_counts)
+        }
+        bookings_by_week = [
+            {"week_start": start.date().isoformat(), "count": int(count or 0)}
+            for start, count in zip(week_starts, week_counts)
+        ]
+
+        # === Top services ===
+        top_services = db.query(
+            Service.name, func.count(Booking.id).label("bookings")
+        ).join(Booking, Booking.service_id == Service.id).filter(
+            Booking.workspace_id == workspace_id,
+            Booking.booking_date >= now - timedelta(days=TOP_SERVICES_WINDOW_DAYS)
+        ).group_by(Service.id, Service.name).order_by(
+            func.count(Booking.id).desc()
+        ).limit(TOP_SERVICES_LIMIT).all()
+
+        # === Forms ===
+        form_row = db.query(
+            func.count(FormSubmission.id),
+            func.sum(case((FormSubmission.status == SubmissionStatus.COMPLETED, 1), else_=0)),
+            func.sum(case((FormSubmission.status == SubmissionStatus.PENDING, 1), else_=0)),
+            func.sum(case((FormSubmission.status == SubmissionStatus.OVERDUE, 1), else_=0))
+        ).filter(FormSubmission.workspace_id == workspace_id).one()
+        forms_total = form_row[0] or 0
+        forms_completed = int(form_row[1] or 0)
+
+        # === Inventory ===
+        low_stock = db.query(
+            InventoryItem.name, InventoryItem.quantity, InventoryItem.low_stock_threshold, InventoryItem.unit
+        ).filter(
+            InventoryItem.workspace_id == workspace_id,
+            InventoryItem.is_active == True,
+            InventoryItem.quantity <= InventoryItem.low_stock_threshold
+        ).order_by(InventoryItem.quantity.asc()).all()
+
+        # === Headcounts ===
+        counts_row = db.query(
+            db.query(func.count(Contact.id)).filter(Contact.workspace_id == workspace_id).scalar_subquery(),
+            db.query(func.count(User.id)).filter(User.workspace_id == workspace_id).scalar_subquery(),
+            db.query(func.count(Service.id)).filter(
+                Service.workspace_id == workspace_id, Service.is_active == True
+            ).scalar_subquery()
+        ).one()
+
+        # === Staff response times (first human reply per conversation) ===
+        first_replies = db.query(
+            Conversation.created_at, func.min(Message.created_at)
+        ).join(Message, Message.conversation_id == Conversation.id).filter(
+            Conversation.workspace_id == workspace_id,
+            Conversation.created_at >= now - timedelta(days=RESPONSE_TIME_WINDOW_DAYS),
+            Message.direction == MessageDirection.OUTBOUND,
+            Message.is_automated == False
+        ).group_by(Conversation.id, Conversation.created_at).all()
+        response_minutes = sorted(
+            (replied - opened).total_seconds() / 60
+            for opened, replied in first_replies if opened and replied
+        )
+
+        metrics = {
+            "workspace": {
+                "name": workspace.name,
+                "is_active": workspace.is_active,
+                "timezone": workspace.timezone
+            },
+            "bookings": {
+                "total": int(total_bookings),
+                "by_status": bookings_by_status,
+                "by_week": bookings_by_week
+            },
+            "top_services": [{"name": name, "bookings": int(count)} for name, count in top_services],
+            "forms": {
+                "total": int(forms_total),
+                "completed": forms_completed,
+                "pending": int(form_row[2] or 0),
+                "overdue": int(form_row[3] or 0),
+                "completion_rate": round(forms_completed / forms_total, 3) if forms_total else None
+            },
+            "inventory": {
+                "low_stock": [{
+                    "name": name,
+                    "quantity": quantity,
+                    "threshold": threshold,
+                    "unit": unit
+                } for name, quantity, threshold, unit in low_stock]
+            },
+            "contacts": int(counts_row[0] or 0),
+            "users": int(counts_row[1] or 0),
+            "services": int(counts_row[2] or 0),
+            "response_times": {
+                "conversations_replied": len(response_minutes),
+                "avg_first_reply_minutes": round(sum(response_minutes) / len(response_minutes), 1) if response_minutes else None,
+                "median_first_reply_minutes": round(response_minutes[len(response_minutes) // 2], 1) if response_minutes else None
+            }
+        }
+
+        # Stable fingerprint of the numbers, so downstream caches can key on it
+        version = hashlib.sha1(json.dumps(metrics, sort_keys=True).encode()).hexdigest()[:16]
+        snapshot = {**metrics, "version": version, "computed_at": now.isoformat()}
+        logger.info(f"Metrics snapshot computed for workspace {workspace_id} (version {version})")
+        return snapshot
+
+
+metrics_snapshot_service = MetricsSnapshotService(ttl=settings.AI_CONTEXT_TTL_SECONDS)
@@ -0,0 +1,45 @@
+import base64
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(at: datetime, row_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{at.isoformat()}|{row_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Raises ValueError for anything encode_cursor did not produce"""
+    try:
+        at, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(at), row_id
+    except ValueError:
+        raise ValueError("Invalid cursor")
+
+
+def keyset_statement(query, sort_column, id_column, cursor: Optional[str], limit: int):
+    """
+    Newest-first page of a Query or select() after `cursor`. Pages continue
+    after the (sort_column, id) of the previous page's last row rather than
+    at an offset, so each costs the same however deep it is and rows added
+    meanwhile do not shift it. One extra row is fetched to tell whether
+    another page follows; pass the rows to keyset_result.
+    """
+    if cursor:
+        at, row_id = decode_cursor(cursor)
+        query = query.filter(or_(sort_column < at, and_(sort_column == at, id_column < row_id)))
+    return query.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1)
+
+
+def keyset_result(rows: list, sort_column, id_column, limit: int) -> tuple[list, Optional[str]]:
+    """The page and the cursor for the next one, None on the last page"""
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+
+def keyset_page(query, sort_column, id_column, cursor: Optional[str], limit: int) -> tuple[list, Optional[str]]:
+    """keyset_statement and keyset_result for a sync Query"""
+    rows = keyset_statement(query, sort_column, id_column, cursor, limit).all()
+    return keyset_result(rows, sort_column, id_column, limit)
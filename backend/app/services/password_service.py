@@ -0,0 +1,44 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from passlib.context import CryptContext
+from app.config import settings
+
+
+class PasswordService:
+    """
+    bcrypt hashing off the event loop. A bcrypt round costs 100-300 ms of CPU,
+    so hashes run on a small dedicated thread pool (bcrypt releases the GIL)
+    and async handlers only await the result. The pool is bounded so a login
+    storm queues here instead of starving the default executor.
+    """
+
+    def __init__(self, rounds: int = 12, max_workers: Optional[int] = None):
+        if not max_workers:
+            max_workers = max(1, (os.cpu_count() or 2) - 1)
+        self.context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(self.context.verify, password, hashed)
+
+    async def verify_and_update(self, password: str, hashed: str) -> tuple[bool, Optional[str]]:
+        """
+        Verify a password; if it matches but was hashed with a different cost
+        factor, also return a new hash to store (rehash-on-login).
+        """
+        return await self._run(self.context.verify_and_update, password, hashed)
+
+
+password_service = PasswordService(
+    rounds=settings.PASSWORD_HASH_ROUNDS,
+    max_workers=settings.PASSWORD_HASH_WORKERS
+)
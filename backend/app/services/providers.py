@@ -0,0 +1,78 @@
+import logging
+import threading
+from typing import Any, Callable
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderNotConfiguredError(RuntimeError):
+    """Raised when a provider client is requested but its credentials are missing"""
+
+
+class ProviderRegistry:
+    """
+    Third-party SDK clients (AI, email, SMS), imported and constructed on first
+    use and then shared by the whole process. Workers that never send an SMS
+    never import Twilio, and a missing API key only fails the call that needs it.
+    """
+
+    def __init__(self):
+        self._factories: dict[str, Callable[[], Any]] = {}
+        self._clients: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        self._factories[name] = factory
+
+    def get(self, name: str) -> Any:
+        client = self._clients.get(name)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(name)
+            if client is None:
+                if name not in self._factories:
+                    raise KeyError(f"Unknown provider: {name}")
+                client = self._factories[name]()
+                self._clients[name] = client
+                logger.info(f"Provider client '{name}' initialised")
+        return client
+
+    def loaded(self) -> list[str]:
+        return sorted(self._clients)
+
+    def reset(self, name: str | None = None) -> None:
+        """Drop cached clients, e.g. after rotating credentials"""
+        with self._lock:
+            if name is None:
+                self._clients.clear()
+            else:
+                self._clients.pop(name, None)
+
+
+def _groq_client():
+    if not settings.groq_api_key:
+        raise ProviderNotConfiguredError("GROQ_API_KEY is not set")
+    from groq import AsyncGroq
+    return AsyncGroq(api_key=settings.groq_api_key)
+
+
+def _sendgrid_client():
+    if not settings.SENDGRID_API_KEY:
+        raise ProviderNotConfiguredError("SENDGRID_API_KEY is not set")
+    import sendgrid
+    return sendgrid.SendGridAPIClient(api_key=settings.SENDGRID_API_KEY)
+
+
+def _twilio_client():
+    if not settings.TWILIO_ACCOUNT_SID or not settings.TWILIO_AUTH_TOKEN:
+        raise ProviderNotConfiguredError("TWILIO_ACCOUNT_SID / TWILIO_AUTH_TOKEN are not set")
+    from twilio.rest import Client
+    return Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+
+
+providers = ProviderRegistry()
+providers.register("groq", _groq_client)
+providers.register("sendgrid", _sendgrid_client)
+providers.register("twilio", _twilio_client)
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import logging
+import threading
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models.workspace import Workspace
+from app.services.availability_service import catalog_statement
+from app.services.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+def _cached_body(body: dict) -> dict:
+    digest = hashlib.sha1(json.dumps(body, sort_keys=True, default=str).encode()).hexdigest()[:16]
+    return {"body": body, "etag": f'"{digest}"'}
+
+
+class PublicCatalogCache:
+    """
+    Fully serialized public workspace and booking pages, keyed by slug. The
+    owner-side endpoints that change what these pages show call
+    invalidate_workspace after committing; the TTL bounds how long other
+    worker processes can keep serving the previous version.
+    """
+
+    def __init__(self, ttl: int = 300, maxsize: int = 1024):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._slugs: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    async def get(self, db: AsyncSession, slug: str) -> Optional[dict]:
+        """
+        Return {"workspace_id", "workspace", "booking_page"} for an active
+        workspace, each page as {"body", "etag"}; built on a miss
+        """
+        entry = self._cache.get(slug)
+        if entry is None:
+            entry = await self._build(db, slug)
+            if entry is not None:
+                self._cache.set(slug, entry)
+                with self._lock:
+                    self._slugs[entry["workspace_id"]] = slug
+        return entry
+
+    def invalidate_workspace(self, workspace_id: str) -> None:
+        # Looked up by id, so a renamed slug still drops the old entry
+        with self._lock:
+            slug = self._slugs.pop(str(workspace_id), None)
+        if slug is not None:
+            self._cache.invalidate(slug)
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+    async def _build(self, db: AsyncSession, slug: str) -> Optional[dict]:
+        workspace = await db.scalar(select(Workspace).where(
+            Workspace.slug == slug,
+            Workspace.is_active == True
+        ))
+        if not workspace:
+            return None
+
+        services = (await db.scalars(catalog_statement(workspace.id))).all()
+
+        result = [{
+            "id": str(svc.id),
+            "name": svc.name,
+            "description": svc.description,
+            "duration_minutes": svc.duration_minutes,
+            "service_type": svc.service_type.value,
+            "location": svc.location,
+            "price": svc.price,
+            "color": svc.color,
+            "capacity": svc.capacity,
+            "availabilities": [{
+                "day_of_week": a.day_of_week,
+                "start_time": a.start_time,
+                "end_time": a.end_time
+            } for a in svc.availabilities]
+        } for svc in services]
+
+        logger.info(f"Public catalog built for workspace {workspace.id} ({len(result)} services)")
+        return {
+            "workspace_id": str(workspace.id),
+            "workspace": _cached_body({
+                "name": workspace.name,
+                "slug": workspace.slug,
+                "address": workspace.address,
+                "timezone": workspace.timezone,
+                "contact_email": workspace.contact_email,
+                "phone": workspace.phone
+            }),
+            "booking_page": _cached_body({
+                "workspace": {
+                    "name": workspace.name,
+                    "address": workspace.address,
+                    "timezone": workspace.timezone
+                },
+                "services": result
+            })
+        }
+
+
+public_catalog = PublicCatalogCache(
+    ttl=settings.PUBLIC_CATALOG_CACHE_TTL_SECONDS,
+    maxsize=settings.PUBLIC_CATALOG_CACHE_MAX_ENTRIES
+)
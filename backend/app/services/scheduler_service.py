@@ -7,8 +7,11 @@ from app.models.form_submission import FormSubmission, SubmissionStatus
 from app.models.contact import Contact
 from app.models.workspace import Workspace
 from app.models.alert import Alert, AlertType, AlertSeverity
+from app.services.contact_profile import contact_stats_service
 from app.services.email_service import EmailService
+from app.services.segment_service import segment_service
 from app.services.sms_service import SMSService
+from app.services.waitlist_service import waitlist_service
 import uuid
 
 logger = logging.getLogger(__name__)
@@ -19,6 +22,7 @@ class SchedulerService:
     Background scheduler for time-based automations:
     - Booking reminders (24h before)
     - Overdue form detection
+    - Waitlist offer expiry
     - Periodic health checks
     """
 
@@ -96,7 +100,10 @@ class SchedulerService:
                 )
                 db.add(alert)
 
+            contact_ids = {form.contact_id for form in overdue_forms}
             db.commit()
+            for contact_id in contact_ids:
+                contact_stats_service.invalidate(contact_id)
             logger.info(f"Overdue form check: {len(overdue_forms)} marked overdue")
         except Exception as e:
             logger.error(f"Overdue form check failed: {str(e)}")
@@ -146,5 +153,21 @@ class SchedulerService:
         finally:
             db.close()
 
+    async def run_waitlist_expiry(self):
+        """Release waitlist offers whose hold has run out to the next entry"""
+        try:
+            expired = await waitlist_service.expire_offers()
+            logger.info(f"Waitlist expiry: {expired} offers released")
+        except Exception as e:
+            logger.error(f"Waitlist expiry failed: {str(e)}")
+
+    async def run_segment_refresh(self):
+        """Bring segment membership up to date with recent writes"""
+        try:
+            refreshed = await segment_service.refresh_all()
+            logger.info(f"Segment refresh: {refreshed} segments")
+        except Exception as e:
+            logger.error(f"Segment refresh failed: {str(e)}")
+
 
 scheduler_service = SchedulerService()
\ No newline at end of file
@@ -0,0 +1,315 @@
+import logging
+import operator
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import and_, case, delete, false, func, insert, literal, not_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.booking import Booking, BookingStatus
+from app.models.contact import Contact, ContactSource
+from app.models.form_submission import FormSubmission, SubmissionStatus
+from app.models.segment import Segment, SegmentMember
+from app.models.tag import ContactTag, Tag
+from app.services.booking_service import ACTIVE_STATUSES
+from app.services.contact_profile import count_where
+from app.services.tag_service import tag_key
+
+logger = logging.getLogger(__name__)
+
+# Field name: (type, where it comes from). Booking and form fields are
+# aggregates per contact; a contact without bookings has 0 of each count and
+# no last_booking_at.
+FIELDS = {
+    "name": ("text", "contact"),
+    "email": ("text", "contact"),
+    "phone": ("text", "contact"),
+    "source": ("enum", "contact"),
+    "tags": ("tags", "tags"),
+    "created_at": ("datetime", "contact"),
+    "bookings": ("number", "bookings"),
+    "visits": ("number", "bookings"),
+    "no_shows": ("number", "bookings"),
+    "cancellations": ("number", "bookings"),
+    "upcoming_bookings": ("number", "bookings"),
+    "last_booking_at": ("datetime", "bookings"),
+    "last_visit_at": ("datetime", "bookings"),
+    "outstanding_forms": ("number", "forms"),
+    "overdue_forms": ("number", "forms"),
+    "completed_forms": ("number", "forms"),
+}
+
+OPERATORS = {
+    "text": ["eq", "ne", "contains", "starts_with", "is_empty"],
+    "enum": ["eq", "ne", "in"],
+    "number": ["eq", "ne", "gt", "gte", "lt", "lte"],
+    "datetime": ["before", "after", "within_days", "not_within_days", "is_empty"],
+    "tags": ["has_tag", "lacks_tag"],
+}
+
+COMPARISONS = {
+    "eq": operator.eq, "ne": operator.ne,
+    "gt": operator.gt, "gte": operator.ge,
+    "lt": operator.lt, "lte": operator.le,
+}
+
+MAX_CONDITIONS = 50
+MAX_DEPTH = 5
+
+# Changes are looked for from a little before the last refresh, so a write
+# whose transaction committed just after that refresh read is not missed
+CHANGE_OVERLAP = timedelta(minutes=1)
+
+
+class SegmentDefinitionError(ValueError):
+    """Raised for a segment definition that does not compile"""
+
+
+def _booking_stats(workspace_id: str, now: datetime, only):
+    query = select(
+        Booking.contact_id.label("contact_id"),
+        func.count(Booking.id).label("bookings"),
+        count_where(Booking.status == BookingStatus.COMPLETED).label("visits"),
+        count_where(Booking.status == BookingStatus.NO_SHOW).label("no_shows"),
+        count_where(Booking.status == BookingStatus.CANCELLED).label("cancellations"),
+        count_where(and_(Booking.status.in_(ACTIVE_STATUSES), Booking.booking_date >= now)).label("upcoming_bookings"),
+        func.max(case((Booking.status != BookingStatus.CANCELLED, Booking.booking_date))).label("last_booking_at"),
+        func.max(case((Booking.status == BookingStatus.COMPLETED, Booking.booking_date))).label("last_visit_at")
+    ).where(Booking.workspace_id == workspace_id).group_by(Booking.contact_id)
+    if only is not None:
+        query = query.where(Booking.contact_id.in_(only))
+    return query.subquery("booking_stats")
+
+
+def _form_stats(workspace_id: str, only):
+    query = select(
+        FormSubmission.contact_id.label("contact_id"),
+        count_where(FormSubmission.status.in_([SubmissionStatus.PENDING, SubmissionStatus.OVERDUE])).label("outstanding_forms"),
+        count_where(FormSubmission.status == SubmissionStatus.OVERDUE).label("overdue_forms"),
+        count_where(FormSubmission.status == SubmissionStatus.COMPLETED).label("completed_forms")
+    ).where(FormSubmission.workspace_id == workspace_id).group_by(FormSubmission.contact_id)
+    if only is not None:
+        query = query.where(FormSubmission.contact_id.in_(only))
+    return query.subquery("form_stats")
+
+
+def _datetime(value, field: str) -> datetime:
+    """An ISO 8601 date or time as naive UTC; times without an offset are taken as UTC"""
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        raise SegmentDefinitionError(f"{field} needs an ISO 8601 date or time, got {value!r}")
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _number(value, field: str):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise SegmentDefinitionError(f"{field} needs a number, got {value!r}")
+    return value
+
+
+def _text(value, field: str) -> str:
+    if not isinstance(value, str) or not value.strip():
+        raise SegmentDefinitionError(f"{field} needs a non-empty string, got {value!r}")
+    return value.strip().lower()
+
+
+class _Compiler:
+    def __init__(self, workspace_id: str, now: datetime, only):
+        self.now = now
+        self.sources = {"bookings": _booking_stats(workspace_id, now, only), "forms": _form_stats(workspace_id, only)}
+        self.used = set()
+        self.conditions = 0
+
+    def column(self, field: str, source: str):
+        if source == "contact":
+            return getattr(Contact, field)
+        self.used.add(source)
+        column = self.sources[source].c[field]
+        # Contacts without bookings or forms have no row in the aggregate
+        return func.coalesce(column, 0) if FIELDS[field][0] == "number" else column
+
+    def node(self, node, depth: int = 0):
+        if not isinstance(node, dict):
+            raise SegmentDefinitionError("Each part of a definition must be an object")
+        if depth > MAX_DEPTH:
+            raise SegmentDefinitionError(f"Definitions can nest at most {MAX_DEPTH} levels")
+
+        for key, combine in (("all", and_), ("any", or_)):
+            if key in node:
+                children = node[key]
+                if not isinstance(children, list) or not children:
+                    raise SegmentDefinitionError(f"'{key}' needs a non-empty list")
+                return combine(*[self.node(child, depth + 1) for child in children])
+        if "not" in node:
+            # A NULL comparison inside counts as false, so NOT of it is true
+            return not_(func.coalesce(self.node(node["not"], depth + 1), false()))
+        if "field" in node:
+            self.conditions += 1
+            if self.conditions > MAX_CONDITIONS:
+                raise SegmentDefinitionError(f"Definitions can have at most {MAX_CONDITIONS} conditions")
+            return self.condition(node.get("field"), node.get("op"), node.get("value"))
+        raise SegmentDefinitionError("Each part of a definition needs 'all', 'any', 'not' or 'field'")
+
+    def condition(self, field, op, value):
+        if field not in FIELDS:
+            raise SegmentDefinitionError(f"Unknown field {field!r}. Must be one of: {list(FIELDS)}")
+        kind, source = FIELDS[field]
+        if op not in OPERATORS[kind]:
+            raise SegmentDefinitionError(f"Operator {op!r} does not apply to {field}. Must be one of: {OPERATORS[kind]}")
+        if kind == "tags":
+            tagged = select(ContactTag.contact_id).join(Tag, Tag.id == ContactTag.tag_id).where(
+                ContactTag.contact_id == Contact.id,
+                Tag.key == tag_key(_text(value, field))
+            ).exists()
+            return tagged if op == "has_tag" else not_(tagged)
+        column = self.column(field, source)
+
+        if op == "is_empty":
+            empty = or_(column == None, column == "") if kind == "text" else column == None
+            return empty if value is not False else not_(empty)
+
+        if kind == "number":
+            return COMPARISONS[op](column, _number(value, field))
+
+        if kind == "datetime":
+            if op in ("within_days", "not_within_days"):
+                since = self.now - timedelta(days=_number(value, field))
+                return column >= since if op == "within_days" else or_(column == None, column < since)
+            at = _datetime(value, field)
+            return column < at if op == "before" else column > at
+
+        if kind == "enum":
+            values = value if op == "in" else [value]
+            if not isinstance(values, list) or not values:
+                raise SegmentDefinitionError(f"{field} 'in' needs a non-empty list")
+            try:
+                members = [ContactSource(v) for v in values]
+            except ValueError:
+                raise SegmentDefinitionError(f"{field} must be one of: {[s.value for s in ContactSource]}")
+            if op == "in":
+                return column.in_(members)
+            return column == members[0] if op == "eq" else or_(column == None, column != members[0])
+
+        text = _text(value, field)
+        lowered = func.lower(column)
+        if op == "eq":
+            return lowered == text
+        if op == "ne":
+            return or_(column == None, lowered != text)
+        if op == "contains":
+            return lowered.contains(text, autoescape=True)
+        return lowered.startswith(text, autoescape=True)
+
+
+def compile_segment(definition, workspace_id: str, now: datetime = None, only=None):
+    """
+    select(Contact.id) for the workspace's contacts matching a definition.
+    A definition is a tree of {"all": [...]}, {"any": [...]}, {"not": {...}}
+    and conditions {"field": ..., "op": ..., "value": ...}, e.g. contacts
+    with no booking in 90 days and an overdue form:
+
+        {"all": [
+            {"field": "last_booking_at", "op": "not_within_days", "value": 90},
+            {"field": "overdue_forms", "op": "gt", "value": 0}
+        ]}
+
+    Booking and form fields come from one grouped subquery each, joined only
+    when used. `only`, a select of contact ids, limits the contacts and
+    the aggregates alike. Raises SegmentDefinitionError for an invalid
+    definition.
+    """
+    compiler = _Compiler(workspace_id, now or datetime.utcnow(), only)
+    condition = compiler.node(definition)
+    query = select(Contact.id).where(Contact.workspace_id == workspace_id)
+    if only is not None:
+        query = query.where(Contact.id.in_(only))
+    for source in ("bookings", "forms"):
+        if source in compiler.used:
+            stats = compiler.sources[source]
+            query = query.outerjoin(stats, stats.c.contact_id == Contact.id)
+    return query.where(condition)
+
+
+def _changed_contacts(workspace_id: str, since: datetime):
+    """Contacts whose own row, bookings or form submissions were written after `since`"""
+    return select(Contact.id).where(
+        Contact.workspace_id == workspace_id, Contact.updated_at > since
+    ).union(
+        select(Booking.contact_id).where(Booking.workspace_id == workspace_id, Booking.updated_at > since),
+        select(FormSubmission.contact_id).where(FormSubmission.workspace_id == workspace_id, FormSubmission.updated_at > since)
+    )
+
+
+def serialize_segment(segment: Segment) -> dict:
+    return {
+        "id": str(segment.id),
+        "name": segment.name,
+        "definition": segment.definition,
+        "member_count": segment.member_count,
+        "refreshed_at": str(segment.refreshed_at) if segment.refreshed_at else None,
+        "created_at": str(segment.created_at)
+    }
+
+
+class SegmentService:
+    """
+    Keeps segment_members in step with each segment's definition. A refresh
+    normally re-evaluates only the contacts written since the last one, found
+    through the updated_at of contacts (which tagging bumps), bookings and
+    form submissions, and applies the difference with one INSERT ... SELECT
+    and one DELETE. Every SEGMENT_FULL_REFRESH_MINUTES it re-evaluates every
+    contact instead, which catches conditions that change with time alone,
+    like "no booking in 90 days".
+    """
+
+    async def refresh(self, db: AsyncSession, segment: Segment, full: bool = False) -> dict:
+        started = datetime.utcnow()
+        full = full or segment.refreshed_at is None or segment.full_refreshed_at is None or \
+            segment.full_refreshed_at <= started - timedelta(minutes=settings.SEGMENT_FULL_REFRESH_MINUTES)
+
+        changed, scope = None, []
+        if not full:
+            changed = _changed_contacts(segment.workspace_id, segment.refreshed_at - CHANGE_OVERLAP)
+            scope = [SegmentMember.contact_id.in_(changed)]
+        matching = compile_segment(segment.definition, segment.workspace_id, started, only=changed).subquery()
+
+        removed = await db.execute(delete(SegmentMember).where(
+            SegmentMember.segment_id == segment.id,
+            SegmentMember.contact_id.not_in(select(matching.c.id)),
+            *scope
+        ))
+        added = await db.execute(insert(SegmentMember).from_select(
+            ["segment_id", "contact_id", "added_at"],
+            select(literal(segment.id), matching.c.id, literal(started)).where(
+                matching.c.id.not_in(select(SegmentMember.contact_id).where(SegmentMember.segment_id == segment.id))
+            )
+        ))
+
+        segment.member_count = await db.scalar(select(func.count()).select_from(SegmentMember).where(
+            SegmentMember.segment_id == segment.id
+        ))
+        segment.refreshed_at = started
+        if full:
+            segment.full_refreshed_at = started
+        await db.commit()
+
+        result = {"added": added.rowcount, "removed": removed.rowcount, "members": segment.member_count, "full": full}
+        logger.info(f"Segment {segment.id} refreshed: {result}")
+        return result
+
+    async def refresh_all(self) -> int:
+        """Refresh every segment; run by the scheduler"""
+        async with AsyncSessionLocal() as db:
+            segments = (await db.scalars(select(Segment))).all()
+            for segment in segments:
+                try:
+                    await self.refresh(db, segment)
+                except Exception as e:
+                    await db.rollback()
+                    logger.error(f"Segment {segment.id} refresh failed: {str(e)}")
+        return len(segments)
+
+
+segment_service = SegmentService()
@@ -1,6 +1,7 @@
 import logging
 from typing import Optional
 from app.config import settings
+from app.services.providers import providers
 
 logger = logging.getLogger(__name__)
 
@@ -25,8 +26,7 @@ class SMSService:
 
     async def _send_twilio(self, to_phone, message):
         try:
-            from twilio.rest import Client
-            client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+            client = providers.get("twilio")
             msg = client.messages.create(
                 body=message,
                 from_=settings.TWILIO_PHONE_NUMBER,
@@ -0,0 +1,180 @@
+import re
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable, Optional
+from sqlalchemy import DateTime, String, delete, exists, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+from app.models.contact import Contact
+from app.models.tag import ContactTag, Tag
+
+MAX_TAG_LENGTH = 100
+FACET_LIMIT = 50
+
+
+def clean_tag(name) -> Optional[str]:
+    """A tag name with surrounding and repeated whitespace removed"""
+    return " ".join(str(name or "").split()) or None
+
+
+def tag_key(name) -> str:
+    """What tags are compared on: "VIP", "vip" and " Vip " are the same tag"""
+    return (clean_tag(name) or "").lower()
+
+
+def split_tags(value) -> list[str]:
+    """
+    The distinct tags of a list, or of a string separated by commas or
+    semicolons, in order; raises ValueError for one that is too long
+    """
+    parts = value if isinstance(value, list) else re.split(r"[,;]", str(value or ""))
+    tags, seen = [], set()
+    for part in parts:
+        name = clean_tag(part)
+        if not name or name.lower() in seen:
+            continue
+        if len(name) > MAX_TAG_LENGTH:
+            raise ValueError(f"Tags are at most {MAX_TAG_LENGTH} characters")
+        seen.add(name.lower())
+        tags.append(name)
+    return tags
+
+
+def ensure_tags(db: Session, workspace_id: str, names: Iterable[str]) -> dict[str, str]:
+    """
+    Tag id by key for the named tags, creating the missing ones with the
+    first spelling given. Does not commit.
+    """
+    wanted = {}
+    for name in names:
+        wanted.setdefault(tag_key(name), clean_tag(name))
+    wanted.pop("", None)
+    if not wanted:
+        return {}
+
+    found = dict(db.execute(select(Tag.key, Tag.id).where(
+        Tag.workspace_id == workspace_id,
+        Tag.key.in_(list(wanted))
+    )).all())
+    now = datetime.utcnow()
+    missing = [
+        {"id": str(uuid.uuid4()), "workspace_id": workspace_id, "name": name, "key": key, "created_at": now}
+        for key, name in wanted.items() if key not in found
+    ]
+    if missing:
+        # (workspace_id, key) is unique, so a request creating the same tag
+        # at the same moment fails instead of making a duplicate
+        db.execute(insert(Tag), missing)
+        found.update((row["key"], row["id"]) for row in missing)
+    return found
+
+
+def tag_names(db: Session, contact_ids: list[str]) -> dict[str, list[str]]:
+    """Tag names of each contact, in one query"""
+    names = defaultdict(list)
+    if contact_ids:
+        rows = db.execute(select(ContactTag.contact_id, Tag.name).join(
+            Tag, Tag.id == ContactTag.tag_id
+        ).where(ContactTag.contact_id.in_(contact_ids)).order_by(Tag.name))
+        for contact_id, name in rows:
+            names[contact_id].append(name)
+    return names
+
+
+def with_tags(workspace_id: str, names: list[str]):
+    """
+    Condition for contacts having every one of the tags: the contact ids
+    under each tag come off the (tag_id, contact_id) index
+    """
+    keys = list({tag_key(name) for name in names} - {""})
+    return Contact.id.in_(
+        select(ContactTag.contact_id)
+        .join(Tag, Tag.id == ContactTag.tag_id)
+        .where(Tag.workspace_id == workspace_id, Tag.key.in_(keys))
+        .group_by(ContactTag.contact_id)
+        .having(func.count() == len(keys))
+    )
+
+
+def tag_counts(db: Session, workspace_id: str, contacts=None, limit: Optional[int] = None) -> list[dict]:
+    """
+    Contacts per tag in one grouped query, most used first. Without
+    `contacts` (a select of contact ids) every tag of the workspace is
+    listed, unused ones with 0; with it, the tags among those contacts.
+    """
+    count = func.count(ContactTag.contact_id)
+    query = select(Tag.id, Tag.name, count.label("contacts")).where(Tag.workspace_id == workspace_id)
+    if contacts is None:
+        query = query.outerjoin(ContactTag, ContactTag.tag_id == Tag.id)
+    else:
+        query = query.join(ContactTag, ContactTag.tag_id == Tag.id).where(ContactTag.contact_id.in_(contacts))
+    query = query.group_by(Tag.id, Tag.name).order_by(count.desc(), Tag.name)
+    if limit:
+        query = query.limit(limit)
+    return [{"id": row.id, "name": row.name, "contacts": row.contacts} for row in db.execute(query)]
+
+
+def _touch(db: Session, contact_ids, now: datetime):
+    # Segment refresh finds the contacts changed since its last run on updated_at
+    db.execute(update(Contact).where(Contact.id.in_(contact_ids)).values(updated_at=now))
+
+
+def add_tags(db: Session, workspace_id: str, contacts, names: list[str]) -> int:
+    """
+    Tag every contact of `contacts` (a select of the workspace's contact
+    ids) with each of the named tags: one INSERT ... SELECT per tag, skipping
+    contacts that already have it. Returns the links added; does not commit.
+    """
+    now = datetime.utcnow()
+    tag_ids = list(ensure_tags(db, workspace_id, names).values())
+    added = 0
+    for tag_id in tag_ids:
+        target = contacts.subquery()
+        contact_id = target.c[0]
+        added += db.execute(insert(ContactTag).from_select(
+            ["contact_id", "tag_id", "created_at"],
+            select(contact_id, literal(tag_id, String), literal(now, DateTime)).where(~exists().where(
+                ContactTag.contact_id == contact_id,
+                ContactTag.tag_id == tag_id
+            ))
+        )).rowcount
+    if added:
+        _touch(db, select(ContactTag.contact_id).where(
+            ContactTag.tag_id.in_(tag_ids), ContactTag.created_at == now
+        ), now)
+    return added
+
+
+def remove_tags(db: Session, workspace_id: str, contacts, names: list[str]) -> int:
+    """Untag `contacts` with one DELETE; returns the links removed, does not commit"""
+    keys = [tag_key(name) for name in names]
+    links = (
+        ContactTag.tag_id.in_(select(Tag.id).where(Tag.workspace_id == workspace_id, Tag.key.in_(keys))),
+        ContactTag.contact_id.in_(contacts)
+    )
+    _touch(db, select(ContactTag.contact_id).where(*links), datetime.utcnow())
+    return db.execute(delete(ContactTag).where(*links).execution_options(synchronize_session=False)).rowcount
+
+
+def link_tags(db: Session, workspace_id: str, tags_by_contact: dict[str, list[str]]) -> int:
+    """
+    Add tags to contacts by name, as the importer collects them per chunk:
+    one lookup of the links the contacts already have and one executemany
+    INSERT of the rest. Returns the links added; does not commit.
+    """
+    tag_ids = ensure_tags(db, workspace_id, (name for names in tags_by_contact.values() for name in names))
+    if not tag_ids:
+        return 0
+    existing = set(db.execute(select(ContactTag.contact_id, ContactTag.tag_id).where(
+        ContactTag.contact_id.in_(list(tags_by_contact))
+    )).tuples())
+    now = datetime.utcnow()
+    rows = {}
+    for contact_id, names in tags_by_contact.items():
+        for name in names:
+            link = (contact_id, tag_ids[tag_key(name)])
+            if link not in existing:
+                rows[link] = {"contact_id": link[0], "tag_id": link[1], "created_at": now}
+    if rows:
+        db.execute(insert(ContactTag), list(rows.values()))
+    return len(rows)
@@ -0,0 +1,102 @@
+import logging
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+logger = logging.getLogger(__name__)
+
+# Bookings are stored as naive UTC datetimes; availability is wall-clock time
+# in the workspace's zone. Transitions fall on whole 5-minute ticks in every
+# zone in use, so scanning at that resolution finds them exactly.
+SCAN_MINUTES = 5
+MINUTES_PER_DAY = 24 * 60
+
+
+def is_valid_zone(name: str) -> bool:
+    try:
+        ZoneInfo(name)
+        return True
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+
+
+@lru_cache(maxsize=256)
+def workspace_zone(name: Optional[str]) -> ZoneInfo:
+    if name and is_valid_zone(name):
+        return ZoneInfo(name)
+    if name:
+        logger.warning(f"Unknown timezone {name!r}, using UTC")
+    return ZoneInfo("UTC")
+
+
+@lru_cache(maxsize=8192)
+def day_offsets(tz_name: Optional[str], day: date) -> tuple:
+    """
+    UTC offsets in minutes over one local day, as ((from_local_minute, offset), ...).
+    A single entry on all but the DST transition days.
+    """
+    zone = workspace_zone(tz_name)
+    midnight = datetime(day.year, day.month, day.day)
+
+    def offset(minute: int) -> int:
+        local = (midnight + timedelta(minutes=minute)).replace(tzinfo=zone)
+        return int(local.utcoffset().total_seconds() // 60)
+
+    segments = [(0, offset(0))]
+    if offset(MINUTES_PER_DAY - SCAN_MINUTES) != segments[0][1]:
+        for minute in range(SCAN_MINUTES, MINUTES_PER_DAY, SCAN_MINUTES):
+            current = offset(minute)
+            if current != segments[-1][1]:
+                segments.append((minute, current))
+    return tuple(segments)
+
+
+def _to_utc(local: datetime, zone: ZoneInfo) -> datetime:
+    return local.replace(tzinfo=zone).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def local_to_utc(day: date, minute: int, tz_name: Optional[str]) -> Optional[datetime]:
+    """Naive UTC for a local wall-clock minute of `day`; None if a DST change skips it"""
+    midnight = datetime(day.year, day.month, day.day)
+    segments = day_offsets(tz_name, day)
+    if len(segments) == 1:
+        return midnight + timedelta(minutes=minute - segments[0][1])
+
+    zone = workspace_zone(tz_name)
+    local = midnight + timedelta(minutes=minute)
+    utc = _to_utc(local, zone)
+    if to_local(utc, tz_name).replace(tzinfo=None) != local:
+        return None
+    return utc
+
+
+def day_bounds_utc(day: date, tz_name: Optional[str]) -> tuple[datetime, datetime]:
+    """Naive UTC instants of local midnight at the start and end of `day`"""
+    zone = workspace_zone(tz_name)
+    midnight = datetime(day.year, day.month, day.day)
+    return _to_utc(midnight, zone), _to_utc(midnight + timedelta(days=1), zone)
+
+
+def utc_to_local_minutes(utc: datetime, day: date, tz_name: Optional[str]) -> float:
+    """Minutes from local midnight of `day` to a naive UTC instant (may fall outside 0..1440)"""
+    midnight = datetime(day.year, day.month, day.day)
+    segments = day_offsets(tz_name, day)
+    if len(segments) == 1:
+        return (utc - midnight).total_seconds() / 60 + segments[0][1]
+    return (to_local(utc, tz_name).replace(tzinfo=None) - midnight).total_seconds() / 60
+
+
+def to_local(utc: datetime, tz_name: Optional[str]) -> datetime:
+    """Aware local datetime for a naive UTC instant"""
+    return utc.replace(tzinfo=timezone.utc).astimezone(workspace_zone(tz_name))
+
+
+def to_storage(value: datetime, tz_name: Optional[str]) -> datetime:
+    """
+    Naive UTC for storing a datetime from a request: aware values are
+    converted, naive ones are read as wall-clock time in the workspace's zone
+    """
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return _to_utc(value, workspace_zone(tz_name))
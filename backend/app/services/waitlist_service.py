@@ -0,0 +1,216 @@
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.booking import Booking, BookingStatus
+from app.models.contact import Contact
+from app.models.service import Service
+from app.models.waitlist import WaitlistEntry, WaitlistStatus
+from app.models.workspace import Workspace
+from app.services.booking_service import SlotUnavailableError, allocate_resource
+from app.services.contact_profile import contact_stats_service
+from app.services.email_service import EmailService
+from app.services.sms_service import SMSService
+from app.services.timezones import to_local
+
+logger = logging.getLogger(__name__)
+
+# Waiting entries fetched per offer. Each is claimed with a conditional
+# UPDATE, so a batch only runs dry when other offers claim them first.
+CANDIDATE_BATCH = 20
+
+
+def serialize_entry(entry: WaitlistEntry, tz_name: Optional[str]) -> dict:
+    return {
+        "id": str(entry.id),
+        "service_id": str(entry.service_id),
+        "contact_id": str(entry.contact_id),
+        "status": entry.status.value,
+        "priority": entry.priority,
+        "window_start": to_local(entry.window_start, tz_name).isoformat(),
+        "window_end": to_local(entry.window_end, tz_name).isoformat(),
+        "notes": entry.notes,
+        "offered_booking_id": entry.offered_booking_id,
+        "offer_expires_at": to_local(entry.offer_expires_at, tz_name).isoformat() if entry.offer_expires_at else None,
+        "created_at": str(entry.created_at)
+    }
+
+
+class WaitlistService:
+    """
+    Backfills freed slots from the waitlist. A slot goes to the waiting entry
+    with the highest priority (then the earliest) whose window covers it. The
+    slot is held for it by a PENDING booking for WAITLIST_HOLD_MINUTES while
+    the contact is asked to confirm; a declined or expired offer moves on to
+    the next entry.
+    """
+
+    async def offer_slot(
+        self,
+        db: AsyncSession,
+        service_id: str,
+        start: datetime,
+        end: datetime,
+        exclude_contact_id: Optional[str] = None
+    ) -> Optional[WaitlistEntry]:
+        """Offer [start, end) of a service to the next matching entry; None if nobody is waiting for it"""
+        if start <= datetime.utcnow():
+            return None
+
+        query = select(WaitlistEntry.id).where(
+            WaitlistEntry.service_id == service_id,
+            WaitlistEntry.status == WaitlistStatus.WAITING,
+            WaitlistEntry.window_start <= start,
+            WaitlistEntry.window_end >= end
+        )
+        if exclude_contact_id:
+            query = query.where(WaitlistEntry.contact_id != exclude_contact_id)
+        candidates = (await db.scalars(query.order_by(
+            WaitlistEntry.priority.desc(), WaitlistEntry.created_at
+        ).limit(CANDIDATE_BATCH))).all()
+        if not candidates:
+            return None
+
+        service = await db.get(Service, service_id)
+        if not service or not service.is_active:
+            return None
+        try:
+            resource_id = await allocate_resource(db, service, start, end)
+        except SlotUnavailableError:
+            return None
+
+        now = datetime.utcnow()
+        expires_at = now + timedelta(minutes=settings.WAITLIST_HOLD_MINUTES)
+        entry_id = None
+        for candidate in candidates:
+            claimed = await db.execute(update(WaitlistEntry).where(
+                WaitlistEntry.id == candidate,
+                WaitlistEntry.status == WaitlistStatus.WAITING
+            ).values(status=WaitlistStatus.OFFERED, offer_expires_at=expires_at, updated_at=now))
+            if claimed.rowcount == 1:
+                entry_id = candidate
+                break
+        if entry_id is None:
+            await db.rollback()
+            return None
+
+        entry = await db.get(WaitlistEntry, entry_id)
+        hold = Booking(
+            id=str(uuid.uuid4()),
+            workspace_id=entry.workspace_id,
+            contact_id=entry.contact_id,
+            service_id=service.id,
+            resource_id=resource_id,
+            status=BookingStatus.PENDING,
+            booking_date=start,
+            end_time=end,
+            notes="Held for a waitlist offer"
+        )
+        db.add(hold)
+        await db.flush()
+        entry.offered_booking_id = hold.id
+        await db.commit()
+        contact_stats_service.invalidate(entry.contact_id)
+
+        logger.info(f"Waitlist entry {entry.id} offered {service.id} at {start}")
+        await self._send_offer(db, entry, service, start)
+        return entry
+
+    async def accept(self, db: AsyncSession, entry: WaitlistEntry) -> Optional[Booking]:
+        """Confirm the held booking; None if the offer is no longer open"""
+        now = datetime.utcnow()
+        claimed = await db.execute(update(WaitlistEntry).where(
+            WaitlistEntry.id == entry.id,
+            WaitlistEntry.status == WaitlistStatus.OFFERED,
+            WaitlistEntry.offer_expires_at >= now
+        ).values(status=WaitlistStatus.BOOKED, offer_expires_at=None, updated_at=now))
+        if claimed.rowcount != 1:
+            await db.rollback()
+            return None
+
+        # Staff may have cancelled the hold while the offer was open
+        confirmed = await db.execute(update(Booking).where(
+            Booking.id == entry.offered_booking_id,
+            Booking.status == BookingStatus.PENDING
+        ).values(status=BookingStatus.CONFIRMED, updated_at=now))
+        if confirmed.rowcount != 1:
+            await db.rollback()
+            return None
+        await db.commit()
+        booking = await db.get(Booking, entry.offered_booking_id, populate_existing=True)
+        contact_stats_service.invalidate(booking.contact_id)
+        await db.refresh(entry)
+        return booking
+
+    async def release(self, db: AsyncSession, entry: WaitlistEntry, status: WaitlistStatus) -> Optional[WaitlistEntry]:
+        """
+        Close an open offer as declined (CANCELLED) or EXPIRED, free its hold
+        and offer the slot to the next entry, which is returned
+        """
+        now = datetime.utcnow()
+        closed = await db.execute(update(WaitlistEntry).where(
+            WaitlistEntry.id == entry.id,
+            WaitlistEntry.status == WaitlistStatus.OFFERED
+        ).values(status=status, offer_expires_at=None, updated_at=now))
+        if closed.rowcount != 1:
+            await db.rollback()
+            return None
+
+        hold = await db.get(Booking, entry.offered_booking_id)
+        if hold.status == BookingStatus.PENDING:
+            hold.status = BookingStatus.CANCELLED
+        await db.commit()
+        contact_stats_service.invalidate(hold.contact_id)
+
+        return await self.offer_slot(db, hold.service_id, hold.booking_date, hold.end_time, exclude_contact_id=hold.contact_id)
+
+    async def close_offers_for(self, db: AsyncSession, booking_ids: list[str]) -> None:
+        """
+        Close the open offers held by bookings that are being cancelled, so
+        they can no longer be accepted; does not commit
+        """
+        if booking_ids:
+            await db.execute(update(WaitlistEntry).where(
+                WaitlistEntry.offered_booking_id.in_(booking_ids),
+                WaitlistEntry.status == WaitlistStatus.OFFERED
+            ).values(status=WaitlistStatus.CANCELLED, offer_expires_at=None, updated_at=datetime.utcnow()))
+
+    async def expire_offers(self) -> int:
+        """Release every offer whose hold has run out; run by the scheduler"""
+        async with AsyncSessionLocal() as db:
+            expired = (await db.scalars(select(WaitlistEntry).where(
+                WaitlistEntry.status == WaitlistStatus.OFFERED,
+                WaitlistEntry.offer_expires_at < datetime.utcnow()
+            ))).all()
+            for entry in expired:
+                await self.release(db, entry, WaitlistStatus.EXPIRED)
+        return len(expired)
+
+    async def _send_offer(self, db: AsyncSession, entry: WaitlistEntry, service: Service, start: datetime):
+        contact = await db.get(Contact, entry.contact_id)
+        workspace = await db.get(Workspace, entry.workspace_id)
+        if not contact or not workspace:
+            return
+
+        when = to_local(start, workspace.timezone).strftime('%B %d, %Y at %I:%M %p')
+        until = to_local(entry.offer_expires_at, workspace.timezone).strftime('%I:%M %p')
+        link = f"{settings.FRONTEND_URL}/public/waitlist/{entry.id}"
+        message = (
+            f"Good news! A spot opened up for {service.name} on {when}. "
+            f"We're holding it for you until {until}. Confirm here: {link}"
+        )
+
+        if contact.email and workspace.email_connected:
+            email_svc = EmailService({"provider": workspace.email_provider})
+            await email_svc.send_email(contact.email, f"A spot opened up - {workspace.name}", message)
+
+        if contact.phone and workspace.sms_connected:
+            sms_svc = SMSService({"provider": workspace.sms_provider})
+            await sms_svc.send_sms(contact.phone, message)
+
+
+waitlist_service = WaitlistService()
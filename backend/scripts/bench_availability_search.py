@@ -0,0 +1,77 @@
+"""
+Availability search benchmark: the booking widget's loop of
+GET /api/bookings/slots/{service_id}?date= per service per day, against one
+GET /api/public/availability/{slug} over the same range (full and
+earliest_only). Runs in-process against the configured database.
+Run: python scripts/seed_demo.py && python scripts/bench_availability_search.py [slug] [days] [rounds]
+"""
+import sys
+sys.path.insert(0, '.')
+
+import logging
+import statistics
+import time
+from datetime import date, timedelta
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import SessionLocal
+from app.models.service import Service
+from app.models.workspace import Workspace
+
+
+def timed(fn, rounds: int) -> tuple[float, int]:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        slots = fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, slots
+
+
+def main(slug: str, days: int, rounds: int) -> int:
+    logging.disable(logging.INFO)
+    db = SessionLocal()
+    workspace = db.query(Workspace).filter(Workspace.slug == slug).first()
+    if not workspace:
+        print(f"No workspace with slug {slug!r}")
+        return 1
+    service_ids = [svc.id for svc in db.query(Service).filter(
+        Service.workspace_id == workspace.id, Service.is_active == True
+    ).all()]
+    db.close()
+
+    client = TestClient(app)
+    first = date.today()
+    last = first + timedelta(days=days - 1)
+
+    def looped():
+        count = 0
+        for service_id in service_ids:
+            for offset in range(days):
+                day = first + timedelta(days=offset)
+                count += len(client.get(f"/api/bookings/slots/{service_id}?date={day}").json().get("slots", []))
+        return count
+
+    def search(earliest_only=False):
+        url = f"/api/public/availability/{slug}?from={first}&to={last}"
+        if earliest_only:
+            url += "&earliest_only=true"
+        return len(client.get(url).text.splitlines())
+
+    print(f"{len(service_ids)} services x {days} days, median of {rounds} rounds")
+    for name, fn in [
+        ("looped slots calls", looped),
+        ("availability search", search),
+        ("availability search, earliest_only", lambda: search(True)),
+    ]:
+        ms, slots = timed(fn, rounds)
+        print(f"  {name:36s} {ms:8.1f}ms  {slots} slots")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(
+        sys.argv[1] if len(sys.argv) > 1 else "sunrise-wellness",
+        int(sys.argv[2]) if len(sys.argv) > 2 else 7,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    ))
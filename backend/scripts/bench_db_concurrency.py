@@ -0,0 +1,115 @@
+"""
+Side-by-side concurrency benchmark: the dashboard's query set run through the
+sync SessionLocal (blocking the event loop, as the routers used to) and
+through AsyncSessionLocal. A probe task measures event loop lag meanwhile.
+Run: python scripts/bench_db_concurrency.py [concurrency] [rounds]
+"""
+import sys
+sys.path.insert(0, '.')
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from app.database import SessionLocal, AsyncSessionLocal
+from app.models.workspace import Workspace
+from app.models.booking import Booking, BookingStatus
+from app.models.contact import Contact
+from app.models.conversation import Conversation, ConversationStatus
+from app.models.form_submission import FormSubmission, SubmissionStatus
+from app.models.inventory import InventoryItem
+
+PROBE_INTERVAL = 0.005
+
+
+def dashboard_statements(workspace_id):
+    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    statements = [
+        select(func.count()).select_from(Booking).where(
+            Booking.workspace_id == workspace_id, Booking.status == status
+        ) for status in BookingStatus
+    ]
+    statements += [
+        select(func.count()).select_from(Contact).where(Contact.workspace_id == workspace_id),
+        select(func.count()).select_from(Conversation).where(
+            Conversation.workspace_id == workspace_id, Conversation.status == ConversationStatus.OPEN
+        ),
+        select(func.count()).select_from(FormSubmission).where(
+            FormSubmission.workspace_id == workspace_id, FormSubmission.status == SubmissionStatus.PENDING
+        ),
+        select(InventoryItem).where(
+            InventoryItem.workspace_id == workspace_id,
+            InventoryItem.quantity <= InventoryItem.low_stock_threshold
+        ),
+        select(Booking).where(
+            Booking.workspace_id == workspace_id,
+            Booking.booking_date >= today_start,
+            Booking.booking_date < today_start + timedelta(days=1)
+        )
+    ]
+    return statements
+
+
+async def sync_request(statements):
+    db = SessionLocal()
+    try:
+        for stmt in statements:
+            db.execute(stmt).all()
+    finally:
+        db.close()
+
+
+async def async_request(statements):
+    async with AsyncSessionLocal() as db:
+        for stmt in statements:
+            (await db.execute(stmt)).all()
+
+
+async def probe(lags, stop):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append((loop.time() - start - PROBE_INTERVAL) * 1000)
+
+
+async def run(mode, request, statements, concurrency, rounds):
+    lags, stop = [], asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, stop))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(*[request(statements) for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe_task
+
+    lags.sort()
+    total = concurrency * rounds
+    p99 = lags[int(len(lags) * 0.99)] if lags else 0.0
+    print(
+        f"{mode:>5}: {total} requests in {elapsed:.2f}s ({total / elapsed:.0f} req/s), "
+        f"loop lag p50 {lags[len(lags) // 2] if lags else 0.0:.1f}ms "
+        f"p99 {p99:.1f}ms max {lags[-1] if lags else 0.0:.1f}ms"
+    )
+
+
+async def main(concurrency, rounds):
+    async with AsyncSessionLocal() as db:
+        workspace_id = await db.scalar(select(Workspace.id).limit(1))
+    if not workspace_id:
+        print("No workspace found - run scripts/seed_demo.py first")
+        return
+    statements = dashboard_statements(workspace_id)
+
+    # Warm both pools before measuring
+    await sync_request(statements)
+    await async_request(statements)
+
+    await run("sync", sync_request, statements, concurrency, rounds)
+    await run("async", async_request, statements, concurrency, rounds)
+
+
+if __name__ == "__main__":
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    asyncio.run(main(concurrency, rounds))
@@ -0,0 +1,117 @@
+"""
+Mixed read/write benchmark for SQLite journal modes. Writer threads insert
+contacts in small transactions while reader threads run dashboard-style
+counts, once with the rollback journal (DELETE) and once with WAL.
+Run: python scripts/bench_sqlite_wal.py [seconds] [readers] [writers]
+"""
+import sys
+sys.path.insert(0, '.')
+
+import os
+import tempfile
+import threading
+import time
+import uuid
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from app.config import settings
+from app.database import Base, build_engine
+from app.models.contact import Contact, ContactSource
+from app.models.workspace import Workspace
+
+
+def reader(Session, workspace_id, stop, latencies, errors):
+    while not stop.is_set():
+        start = time.perf_counter()
+        db = Session()
+        try:
+            db.scalar(select(func.count()).select_from(Contact).where(Contact.workspace_id == workspace_id))
+            db.execute(select(Contact).where(Contact.workspace_id == workspace_id).order_by(
+                Contact.created_at.desc()).limit(20)).all()
+            latencies.append(time.perf_counter() - start)
+        except OperationalError:
+            errors.append("read")
+        finally:
+            db.close()
+
+
+def writer(Session, workspace_id, stop, latencies, errors):
+    while not stop.is_set():
+        start = time.perf_counter()
+        db = Session()
+        try:
+            db.add(Contact(
+                id=str(uuid.uuid4()),
+                workspace_id=workspace_id,
+                name="Bench Contact",
+                email=f"{uuid.uuid4().hex[:12]}@bench.local",
+                source=ContactSource.MANUAL
+            ))
+            db.commit()
+            latencies.append(time.perf_counter() - start)
+        except OperationalError:
+            db.rollback()
+            errors.append("write")
+        finally:
+            db.close()
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(int(len(values) * pct), len(values) - 1)] * 1000 if values else 0.0
+
+
+def run(journal_mode, seconds, readers, writers):
+    settings.SQLITE_JOURNAL_MODE = journal_mode
+    settings.SQLITE_SYNCHRONOUS = "NORMAL" if journal_mode == "WAL" else "FULL"
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine, metrics = build_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    db = Session()
+    workspace = Workspace(
+        id=str(uuid.uuid4()),
+        name="Bench",
+        slug=f"bench-{uuid.uuid4().hex[:8]}",
+        contact_email="bench@bench.local"
+    )
+    db.add(workspace)
+    db.commit()
+    workspace_id = workspace.id
+    db.close()
+
+    stop = threading.Event()
+    read_latencies, write_latencies, errors = [], [], []
+    threads = [
+        threading.Thread(target=reader, args=(Session, workspace_id, stop, read_latencies, errors))
+        for _ in range(readers)
+    ] + [
+        threading.Thread(target=writer, args=(Session, workspace_id, stop, write_latencies, errors))
+        for _ in range(writers)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    wait = metrics.snapshot()["checkout_wait_ms"]
+    print(
+        f"{journal_mode:>6}: reads {len(read_latencies) / seconds:.0f}/s "
+        f"(p50 {percentile(read_latencies, 0.5):.1f}ms, p99 {percentile(read_latencies, 0.99):.1f}ms), "
+        f"writes {len(write_latencies) / seconds:.0f}/s "
+        f"(p50 {percentile(write_latencies, 0.5):.1f}ms, p99 {percentile(write_latencies, 0.99):.1f}ms), "
+        f"lock errors {len(errors)}, pool wait p95 {wait['p95']:.2f}ms"
+    )
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    readers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    writers = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+    for mode in ("DELETE", "WAL"):
+        run(mode, seconds, readers, writers)
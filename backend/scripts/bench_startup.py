@@ -0,0 +1,94 @@
+"""
+Worker cold-start benchmark:
+- an -X importtime profile of `import app.main`, failing if any provider SDK
+  that should load lazily is imported on boot
+- time from spawning uvicorn to the first successful /health response
+Run: python scripts/bench_startup.py [runs]
+"""
+import sys
+sys.path.insert(0, '.')
+
+import os
+import socket
+import statistics
+import subprocess
+import time
+import urllib.request
+
+POLL_INTERVAL = 0.005
+STARTUP_TIMEOUT = 60
+TOP_IMPORTS = 15
+# Must only be imported on first use (see app/services/providers.py)
+LAZY_PACKAGES = {"groq", "sendgrid", "twilio", "boto3", "numpy"}
+
+
+def import_profile() -> dict[str, int]:
+    """Self import time in microseconds, summed per top-level package"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True, text=True, env=os.environ.copy()
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import app.main failed:\n{result.stderr[-2000:]}")
+
+    packages: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, _cumulative, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(self_time)
+    return packages
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_request() -> float:
+    port = free_port()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        env=os.environ.copy()
+    )
+    try:
+        while time.perf_counter() - start < STARTUP_TIMEOUT:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                if proc.poll() is not None:
+                    raise RuntimeError("uvicorn exited before serving a request")
+                time.sleep(POLL_INTERVAL)
+        raise RuntimeError("uvicorn did not answer within the startup timeout")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main(runs: int) -> int:
+    packages = import_profile()
+    print(f"import app.main: {sum(packages.values()) / 1000:.0f}ms")
+    for package, micros in sorted(packages.items(), key=lambda item: -item[1])[:TOP_IMPORTS]:
+        print(f"  {micros / 1000:7.1f}ms  {package}")
+    eager = sorted(LAZY_PACKAGES & set(packages))
+    if eager:
+        print(f"imported on boot but should be lazy: {', '.join(eager)}")
+
+    timings = [time_to_first_request() for _ in range(runs)]
+    print(
+        f"time to first request over {runs} runs: "
+        f"median {statistics.median(timings) * 1000:.0f}ms, "
+        f"min {min(timings) * 1000:.0f}ms, max {max(timings) * 1000:.0f}ms"
+    )
+    return 1 if eager else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5))
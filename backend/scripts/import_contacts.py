@@ -0,0 +1,75 @@
+"""
+Bulk contact import: upserts a CSV (with a header row) or NDJSON file into a
+workspace through the same importer as POST /api/contacts/import, printing
+progress after every chunk. The format follows the file extension unless
+--format is given; "-" reads standard input.
+Run: python scripts/import_contacts.py <slug> <file.csv|file.ndjson|-> [--format=csv|ndjson] [--welcome]
+"""
+import sys
+sys.path.insert(0, '.')
+
+import asyncio
+import io
+import logging
+from app.database import SessionLocal
+from app.models.workspace import Workspace
+from app.services.import_service import IMPORT_FORMATS, ContactImporter, parse_rows, welcome_contacts
+from app.services.metrics_service import metrics_snapshot_service
+
+
+def print_progress(summary: dict):
+    print(
+        f"  {summary['rows']:>9,} rows  {summary['created']:>9,} created  {summary['updated']:>8,} updated  "
+        f"{summary['duplicates']:>7,} duplicates  {summary['skipped']:>6,} skipped  "
+        f"{summary['rows_per_second']:>7,} rows/s",
+        flush=True
+    )
+
+
+def main(slug: str, path: str, fmt: str, welcome: bool) -> int:
+    logging.disable(logging.INFO)
+    db = SessionLocal()
+    try:
+        workspace = db.query(Workspace).filter(Workspace.slug == slug).first()
+        if not workspace:
+            print(f"No workspace with slug {slug!r}")
+            return 1
+
+        print(f"Importing {path} ({fmt}) into {workspace.name}...")
+        stream = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8-sig", newline="") if path == "-" \
+            else open(path, encoding="utf-8-sig", newline="")
+        with stream:
+            importer = ContactImporter(db, workspace.id, progress=print_progress)
+            summary = importer.run(parse_rows(stream, fmt))
+
+        print(
+            f"Done in {summary['seconds']}s: {summary['created']:,} created, {summary['updated']:,} updated, "
+            f"{summary['duplicates']:,} duplicates merged, {summary['skipped']:,} skipped"
+        )
+        for error in summary["errors"]:
+            print(f"  line {error['line']}: {error['error']}")
+        if summary["skipped"] > len(summary["errors"]):
+            print(f"  ... and {summary['skipped'] - len(summary['errors'])} more")
+
+        if welcome and importer.created_ids:
+            print(f"Sending the welcome automation to {len(importer.created_ids):,} new contacts...")
+            welcomed = asyncio.run(welcome_contacts(db, workspace.id, importer.created_ids))
+            print(f"Welcomed {welcomed:,}")
+        metrics_snapshot_service.invalidate(workspace.id)
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    options = [arg for arg in sys.argv[1:] if arg.startswith("--")]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if len(args) != 2:
+        print(__doc__.strip().splitlines()[-1])
+        sys.exit(2)
+    fmt = next((o.split("=", 1)[1] for o in options if o.startswith("--format=")), None) \
+        or ("ndjson" if args[1].endswith((".ndjson", ".jsonl")) else "csv")
+    if fmt not in IMPORT_FORMATS:
+        print(f"Format must be one of: {list(IMPORT_FORMATS)}")
+        sys.exit(2)
+    sys.exit(main(args[0], args[1], fmt, "--welcome" in options))
@@ -0,0 +1,38 @@
+"""
+Apply database migrations (alembic upgrade head).
+Run: python scripts/migrate.py
+
+Databases created by the old startup-time create_all have tables but no
+alembic_version row; those are stamped at the baseline revision first so
+the upgrade only applies what came after it.
+"""
+import sys
+sys.path.insert(0, '.')
+
+import os
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from app.database import engine
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_REVISION = "0001"
+
+
+def alembic_config() -> Config:
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    return config
+
+
+def migrate(revision: str = "head") -> None:
+    config = alembic_config()
+    tables = set(inspect(engine).get_table_names())
+    if "alembic_version" not in tables and "workspaces" in tables:
+        print(f"Existing schema without migration history - stamping {BASELINE_REVISION}")
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, revision)
+
+
+if __name__ == "__main__":
+    migrate(sys.argv[1] if len(sys.argv) > 1 else "head")
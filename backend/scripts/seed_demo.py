@@ -8,7 +8,7 @@ sys.path.insert(0, '.')
 import uuid
 from datetime import datetime, timedelta
 from passlib.context import CryptContext
-from app.database import SessionLocal, engine, Base
+from app.database import SessionLocal
 from app.models.user import User, UserRole
 from app.models.workspace import Workspace
 from app.models.contact import Contact, ContactSource
@@ -20,14 +20,16 @@ from app.models.form_template import FormTemplate
 from app.models.inventory import InventoryItem
 from app.models.automation import AutomationRule, AutomationTrigger
 from app.models.alert import Alert, AlertType, AlertSeverity
+from app.services.availability_service import pack_week, weekly_bitmap
+from scripts.migrate import migrate
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def seed():
-    # Create all tables
-    print("Creating tables...")
-    Base.metadata.create_all(bind=engine)
+    # Bring the schema up to date
+    print("Running migrations...")
+    migrate()
     
     db = SessionLocal()
     
@@ -118,6 +120,7 @@ def seed():
 
     # Add availability (Mon-Fri 9-5)
     for svc in created_services:
+        availabilities = []
         for day in range(5):
             avail = Availability(
                 id=str(uuid.uuid4()),
@@ -128,6 +131,8 @@ def seed():
                 is_active=True
             )
             db.add(avail)
+            availabilities.append(avail)
+        svc.availability_bitmap = pack_week(weekly_bitmap(availabilities))
 
     # Create contacts
     contacts_data = [
@@ -0,0 +1,25 @@
+"""
+Backend tests. They need no services: the AI backend is the offline fake
+and the database a throwaway SQLite file.
+Run (from backend/): python -m unittest discover -s tests -t .
+"""
+import os
+import tempfile
+
+os.environ.setdefault("AI_BACKEND", "fake")
+# Always a throwaway database, whatever the environment points at
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+
+_seeded = False
+
+
+def seed_demo():
+    """Migrate the throwaway database and load the demo workspace, once per run"""
+    global _seeded
+    if not _seeded:
+        import contextlib
+        import io
+        from scripts.seed_demo import seed
+        with contextlib.redirect_stdout(io.StringIO()):
+            seed()
+        _seeded = True
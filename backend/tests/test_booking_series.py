@@ -0,0 +1,89 @@
+import unittest
+from datetime import date, datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal
+from app.main import app
+from app.middleware.auth import get_current_user
+from app.models.booking import Booking
+from app.models.contact import Contact
+from app.models.service import Service
+from app.models.user import User, UserRole
+from app.models.waitlist import WaitlistEntry, WaitlistStatus
+from app.services.booking_service import expand_series
+from tests import seed_demo
+
+
+class CancelSeriesTest(unittest.TestCase):
+    """Cancelling a series frees its upcoming slots for the waitlist"""
+
+    @classmethod
+    def setUpClass(cls):
+        seed_demo()
+        db = SessionLocal()
+        cls.owner = db.query(User).filter(User.role == UserRole.OWNER).first()
+        workspace_id = cls.owner.workspace_id
+        cls.service_id = db.query(Service.id).filter(Service.workspace_id == workspace_id).first().id
+        cls.contact_ids = [c.id for c in db.query(Contact.id).filter(Contact.workspace_id == workspace_id).limit(2)]
+        db.close()
+        app.dependency_overrides[get_current_user] = lambda: cls.owner
+        cls.client = TestClient(app)
+
+    @classmethod
+    def tearDownClass(cls):
+        app.dependency_overrides.pop(get_current_user, None)
+
+    def test_cancelled_occurrences_are_offered_to_the_waitlist(self):
+        holder, waiting = self.contact_ids
+        day = date.today() + timedelta(days=14)
+        series = self.client.post("/api/bookings/series", json={
+            "service_id": self.service_id,
+            "contact_id": holder,
+            "starts_at": f"{day}T11:00:00",
+            "rrule": "FREQ=WEEKLY;COUNT=3",
+            "skip_conflicts": True
+        }).json()
+        self.assertGreater(series["created"], 0)
+        first = series["bookings"][0]["booking_date"][:10]
+
+        entry = self.client.post("/api/waitlist/", json={
+            "contact_id": waiting,
+            "service_id": self.service_id,
+            "date_from": first,
+            "date_to": first
+        }).json()
+
+        cancelled = self.client.delete(f"/api/bookings/series/{series['series_id']}").json()
+        self.assertEqual(cancelled["cancelled"], series["created"])
+        self.assertEqual(cancelled["offered"], 1)
+
+        db = SessionLocal()
+        try:
+            offered = db.get(WaitlistEntry, entry["id"])
+            self.assertEqual(offered.status, WaitlistStatus.OFFERED)
+            hold = db.get(Booking, offered.offered_booking_id)
+            self.assertEqual(hold.contact_id, waiting)
+            self.assertEqual(hold.booking_date, db.get(Booking, series["bookings"][0]["id"]).booking_date)
+        finally:
+            db.close()
+
+
+class ExpandSeriesTest(unittest.TestCase):
+    def test_a_utc_until_bounds_the_local_occurrences(self):
+        # Tuesdays at 9:00 in Los Angeles; 17:00Z on December 1 is 9:00 PST that day
+        start = datetime(2026, 11, 3, 9, 0)
+        until_nine = expand_series("FREQ=WEEKLY;UNTIL=20261201T170000Z", start, 60, "America/Los_Angeles", 50)
+        until_before = expand_series("FREQ=WEEKLY;UNTIL=20261201T165959Z", start, 60, "America/Los_Angeles", 50)
+
+        self.assertEqual(len(until_nine), 5)
+        self.assertEqual(until_nine[-1][0], datetime(2026, 12, 1, 17, 0))
+        self.assertEqual(len(until_before), 4)
+
+    def test_a_floating_until_is_local_time(self):
+        occurrences = expand_series("FREQ=DAILY;UNTIL=20261105T090000", datetime(2026, 11, 3, 9, 0), 30, "America/Los_Angeles", 50)
+        self.assertEqual(len(occurrences), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import unittest
+from unittest import mock
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.database import SessionLocal, async_engine
+from app.main import app
+from app.middleware.auth import get_current_user
+from app.models.automation import AutomationTrigger
+from app.models.user import User, UserRole
+from app.services import automation_engine
+from tests import seed_demo
+
+
+class ListBookingsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        seed_demo()
+        db = SessionLocal()
+        cls.owner = db.query(User).filter(User.role == UserRole.OWNER).first()
+        db.close()
+        app.dependency_overrides[get_current_user] = lambda: cls.owner
+        cls.client = TestClient(app)
+
+    @classmethod
+    def tearDownClass(cls):
+        app.dependency_overrides.pop(get_current_user, None)
+
+    def test_a_page_of_bookings_takes_two_queries(self):
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append(statement)
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            page = self.client.get("/api/bookings/", params={"limit": 100}).json()
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+        self.assertGreater(len(page["bookings"]), 1)
+        self.assertTrue(all(b["contact"] and b["service"] for b in page["bookings"]))
+        # The total, then the page with its contacts and services
+        self.assertEqual(len(statements), 2)
+
+
+class TriggerAutomationTest(unittest.TestCase):
+    def test_the_engine_runs_off_the_event_loop(self):
+        threads = []
+
+        async def trigger(engine, workspace_id, trigger_type, context):
+            threads.append(threading.get_ident())
+
+        with mock.patch.object(automation_engine.AutomationEngine, "trigger", trigger):
+            asyncio.run(automation_engine.trigger_automation("ws", AutomationTrigger.STAFF_REPLY, {}))
+
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], threading.get_ident())
+
+
+if __name__ == "__main__":
+    unittest.main()
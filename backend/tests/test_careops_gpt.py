@@ -0,0 +1,104 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from app.services.ai import careops_gpt
+from app.services.ai.llm_client import LLMError
+
+SNAPSHOT = {"version": 1}
+
+
+async def run_inline(func, *args):
+    return func(*args)
+
+
+class CoalescingTest(unittest.IsolatedAsyncioTestCase):
+    """Requests for the same prompt share the leader's completion"""
+
+    def setUp(self):
+        careops_gpt._in_flight.clear()
+        cache = mock.patch.object(careops_gpt, "response_cache")
+        self.cache = cache.start()
+        self.cache.get.return_value = None
+        self.addCleanup(cache.stop)
+        build = mock.patch.object(careops_gpt, "build_messages", return_value=[{"role": "user", "content": "q"}])
+        build.start()
+        self.addCleanup(build.stop)
+        snapshot = mock.patch.object(careops_gpt.metrics_snapshot_service, "get_snapshot", return_value=SNAPSHOT)
+        snapshot.start()
+        self.addCleanup(snapshot.stop)
+        # Load the snapshot inline rather than in a worker thread, so the
+        # requests below interleave in a fixed order
+        inline = mock.patch.object(careops_gpt, "run_in_threadpool", run_inline)
+        inline.start()
+        self.addCleanup(inline.stop)
+
+    async def test_follower_takes_over_when_leading_stream_disconnects(self):
+        release = asyncio.Event()
+        calls = []
+
+        async def stream(workspace_id, messages):
+            calls.append(workspace_id)
+            yield "first "
+            await release.wait()
+            yield "second"
+
+        async def collect(chunks):
+            return "".join([chunk async for chunk in chunks])
+
+        with mock.patch.object(careops_gpt.llm_client, "stream", stream):
+            leader = careops_gpt.stream_careops_response(SNAPSHOT, "ws", "How are we doing?")
+            self.assertEqual(await leader.__anext__(), "first ")
+            follower = asyncio.create_task(collect(careops_gpt.stream_careops_response(SNAPSHOT, "ws", "how are we doing?")))
+            await asyncio.sleep(0)
+
+            await leader.aclose()
+            release.set()
+            self.assertEqual(await follower, "first second")
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(careops_gpt._in_flight, {})
+
+    async def test_follower_takes_over_when_leading_request_is_cancelled(self):
+        calls = []
+
+        async def complete(workspace_id, messages):
+            calls.append(workspace_id)
+            if len(calls) == 1:
+                await asyncio.Event().wait()
+            return "answer"
+
+        with mock.patch.object(careops_gpt.llm_client, "complete", complete):
+            leader = asyncio.create_task(careops_gpt.generate_careops_response(None, "ws", "Busiest day?"))
+            await asyncio.sleep(0)
+            follower = asyncio.create_task(careops_gpt.generate_careops_response(None, "ws", "Busiest day?"))
+            await asyncio.sleep(0)
+
+            leader.cancel()
+            self.assertEqual(await follower, "answer")
+            with self.assertRaises(asyncio.CancelledError):
+                await leader
+        self.assertEqual(len(calls), 2)
+
+    async def test_llm_errors_reach_followers(self):
+        release = asyncio.Event()
+        calls = []
+
+        async def complete(workspace_id, messages):
+            calls.append(workspace_id)
+            await release.wait()
+            raise LLMError("upstream failed")
+
+        with mock.patch.object(careops_gpt.llm_client, "complete", complete):
+            leader = asyncio.create_task(careops_gpt.generate_careops_response(None, "ws", "Busiest day?"))
+            await asyncio.sleep(0)
+            follower = asyncio.create_task(careops_gpt.generate_careops_response(None, "ws", "Busiest day?"))
+            await asyncio.sleep(0)
+            release.set()
+            for task in (leader, follower):
+                with self.assertRaises(LLMError):
+                    await task
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
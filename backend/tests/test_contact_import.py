@@ -0,0 +1,51 @@
+import unittest
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal
+from app.main import app
+from app.middleware.auth import get_current_user
+from app.models.contact import Contact
+from app.models.conversation import Conversation
+from app.models.user import User, UserRole
+from app.routers import contacts
+from tests import seed_demo
+
+
+class WelcomeImportTest(unittest.TestCase):
+    """Imported contacts are welcomed after the import has responded"""
+
+    @classmethod
+    def setUpClass(cls):
+        seed_demo()
+        db = SessionLocal()
+        cls.owner = db.query(User).filter(User.role == UserRole.OWNER).first()
+        db.close()
+        app.dependency_overrides[get_current_user] = lambda: cls.owner
+        cls.client = TestClient(app)
+
+    @classmethod
+    def tearDownClass(cls):
+        app.dependency_overrides.pop(get_current_user, None)
+
+    def test_welcomes_run_in_the_background(self):
+        body = "name,email\nAda Import,ada@import.test\nBob Import,bob@import.test\n"
+        with mock.patch.object(contacts, "welcome_in_background", wraps=contacts.welcome_in_background) as welcome:
+            summary = self.client.post("/api/contacts/import", params={"welcome": "true"}, content=body).json()
+
+        self.assertEqual(summary["created"], 2)
+        self.assertEqual(summary["welcoming"], 2)
+        welcome.assert_called_once()
+        db = SessionLocal()
+        try:
+            welcomed = db.query(Conversation).join(Contact, Contact.id == Conversation.contact_id).filter(
+                Contact.email.in_(["ada@import.test", "bob@import.test"])
+            ).count()
+            self.assertEqual(welcomed, 2)
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal
+from app.main import app
+from app.middleware.auth import get_current_user
+from app.models.user import User, UserRole
+from tests import seed_demo
+
+
+class ContactResponseTest(unittest.TestCase):
+    """Contacts come back with their tags from every endpoint"""
+
+    @classmethod
+    def setUpClass(cls):
+        seed_demo()
+        db = SessionLocal()
+        cls.owner = db.query(User).filter(User.role == UserRole.OWNER).first()
+        db.close()
+        app.dependency_overrides[get_current_user] = lambda: cls.owner
+        cls.client = TestClient(app)
+
+    @classmethod
+    def tearDownClass(cls):
+        app.dependency_overrides.pop(get_current_user, None)
+
+    def test_updating_a_tagged_contact_returns_its_tags(self):
+        contact = self.client.post("/api/contacts/", json={"name": "Tagged Contact", "email": "tagged@contacts.test"}).json()
+        self.assertEqual(contact["tags"], [])
+        self.client.post("/api/contacts/tags/bulk", json={"add": ["VIP", "Yoga"], "contact_ids": [contact["id"]]})
+
+        updated = self.client.put(f"/api/contacts/{contact['id']}", json={"name": "Tagged Contact", "notes": "Prefers mornings"}).json()
+        self.assertEqual(updated["tags"], ["VIP", "Yoga"])
+        self.assertEqual(updated["notes"], "Prefers mornings")
+
+
+if __name__ == "__main__":
+    unittest.main()
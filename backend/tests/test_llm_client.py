@@ -0,0 +1,54 @@
+import asyncio
+import unittest
+from unittest import mock
+
+import groq
+import httpx
+
+from app.services.ai import groq_client
+from app.services.ai.llm_client import GroqBackend, LLMError, LLMTimeoutError
+
+REQUEST = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+
+
+def rate_limited():
+    return groq.RateLimitError("Rate limit reached", response=httpx.Response(429, request=REQUEST), body=None)
+
+
+class GroqBackendErrorTest(unittest.TestCase):
+    """Groq SDK failures come out of the backend as LLMError"""
+
+    def complete(self, error):
+        with mock.patch.object(groq_client, "generate_response", mock.AsyncMock(side_effect=error)):
+            asyncio.run(GroqBackend().complete([], 10))
+
+    def stream(self, error):
+        async def failing(messages, max_tokens):
+            yield "partial"
+            raise error
+
+        async def drain():
+            return [delta async for delta in GroqBackend().stream([], 10)]
+
+        with mock.patch.object(groq_client, "stream_response", failing):
+            asyncio.run(drain())
+
+    def test_api_errors_are_llm_errors(self):
+        for error in (rate_limited(), groq.APIConnectionError(request=REQUEST)):
+            with self.subTest(type(error).__name__):
+                with self.assertRaises(LLMError):
+                    self.complete(error)
+                with self.assertRaises(LLMError):
+                    self.stream(error)
+
+    def test_provider_timeouts_are_llm_timeouts(self):
+        with self.assertRaises(LLMTimeoutError):
+            self.complete(groq.APITimeoutError(request=REQUEST))
+
+    def test_other_errors_are_not_wrapped(self):
+        with self.assertRaises(KeyError):
+            self.complete(KeyError("choices"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import uuid
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models import *  # noqa: F401,F403 - registers every table on Base.metadata
+from app.models.service import Service, Availability
+from app.models.workspace import Workspace
+from app.services.availability_service import catalog_statement, weekly_bitmap
+
+
+def seed(db: Session, services: int) -> str:
+    workspace = Workspace(id=str(uuid.uuid4()), name="Bench", slug=f"bench-{uuid.uuid4().hex[:8]}", contact_email="bench@example.com")
+    db.add(workspace)
+    for i in range(services):
+        service = Service(id=str(uuid.uuid4()), workspace_id=workspace.id, name=f"Service {i}", duration_minutes=30)
+        db.add(service)
+        for day in range(5):
+            db.add(Availability(id=str(uuid.uuid4()), service_id=service.id, day_of_week=day, start_time="09:00", end_time="17:00"))
+        # Inactive rows must not be loaded
+        db.add(Availability(id=str(uuid.uuid4()), service_id=service.id, day_of_week=6, start_time="09:00", end_time="12:00", is_active=False))
+    db.commit()
+    return workspace.id
+
+
+class CatalogQueryCountTest(unittest.TestCase):
+    """The service catalog loads in two queries, however many services a workspace has"""
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", lambda *args: self.statements.append(args[2]))
+
+    def test_catalog_takes_two_queries(self):
+        for count in (1, 10, 100):
+            with self.subTest(services=count):
+                with Session(self.engine) as db:
+                    workspace_id = seed(db, count)
+                with Session(self.engine) as db:
+                    self.statements.clear()
+                    services = db.scalars(catalog_statement(workspace_id)).all()
+                    bitmaps = [weekly_bitmap(svc.availabilities) for svc in services]
+                    self.assertEqual(len(self.statements), 2)
+                self.assertEqual(len(services), count)
+                self.assertTrue(all(not week[6] for week in bitmaps))
+
+
+if __name__ == "__main__":
+    unittest.main()
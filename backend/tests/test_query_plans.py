@@ -0,0 +1,123 @@
+import re
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, func, select
+
+from app.database import engine
+from app.models.alert import Alert
+from app.models.booking import Booking, BookingStatus
+from app.models.contact import Contact
+from app.models.conversation import Conversation, ConversationStatus
+from app.models.form_submission import FormSubmission, SubmissionStatus
+from app.models.message import Message
+from app.models.service import Availability, Service
+from scripts.migrate import migrate
+
+WORKSPACE = "00000000-0000-0000-0000-000000000000"
+SERVICE = "00000000-0000-0000-0000-000000000001"
+CONVERSATION = "00000000-0000-0000-0000-000000000002"
+
+
+def hot_queries():
+    now = datetime.utcnow()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return {
+        "bookings list": select(Booking, Contact, Service).outerjoin(
+            Contact, Contact.id == Booking.contact_id
+        ).outerjoin(Service, Service.id == Booking.service_id).where(
+            Booking.workspace_id == WORKSPACE
+        ).order_by(Booking.booking_date.asc()).limit(20),
+        "today's bookings": select(Booking).where(
+            Booking.workspace_id == WORKSPACE,
+            Booking.booking_date >= today,
+            Booking.booking_date < today + timedelta(days=1)
+        ).order_by(Booking.booking_date.asc()),
+        "slot conflict check": select(func.count()).select_from(Booking).where(
+            Booking.service_id == SERVICE,
+            Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING]),
+            Booking.booking_date < now + timedelta(hours=1),
+            Booking.end_time > now
+        ),
+        "conversation list": select(Conversation).where(
+            Conversation.workspace_id == WORKSPACE,
+            Conversation.status == ConversationStatus.OPEN
+        ).order_by(Conversation.last_message_at.desc()).limit(20),
+        "last message": select(Message).where(
+            Message.conversation_id == CONVERSATION
+        ).order_by(Message.created_at.desc()).limit(1),
+        "pending forms count": select(func.count()).select_from(FormSubmission).where(
+            FormSubmission.workspace_id == WORKSPACE,
+            FormSubmission.status == SubmissionStatus.PENDING
+        ),
+        "unread alerts": select(Alert).where(
+            Alert.workspace_id == WORKSPACE,
+            Alert.is_read == False
+        ).order_by(Alert.created_at.desc()).limit(10),
+        "availability for day": select(Availability).where(
+            Availability.service_id == SERVICE,
+            Availability.day_of_week == now.weekday(),
+            Availability.is_active == True
+        ),
+        "reminder job": select(Booking).where(
+            Booking.status == BookingStatus.CONFIRMED,
+            Booking.booking_date >= now + timedelta(hours=23),
+            Booking.booking_date <= now + timedelta(hours=25),
+            Booking.reminder_sent == "no"
+        ),
+        "overdue form job": select(FormSubmission).where(
+            FormSubmission.status == SubmissionStatus.PENDING,
+            FormSubmission.due_date != None,
+            FormSubmission.due_date < now
+        ),
+    }
+
+
+def explain(conn, stmt) -> list[str]:
+    """Run the statement once to capture the exact SQL and bound parameters, then EXPLAIN it"""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        conn.execute(stmt).all()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    statement, parameters = captured[-1]
+
+    if engine.dialect.name == "sqlite":
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+        return [row[-1] for row in rows]
+    rows = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).all()
+    return [row[0] for row in rows]
+
+
+def is_full_scan(plan_line: str) -> bool:
+    if engine.dialect.name == "sqlite":
+        # "SCAN bookings" is a table scan; "SCAN bookings USING INDEX ..." is not
+        return bool(re.match(r"SCAN \w+$", plan_line.strip()))
+    return "Seq Scan" in plan_line
+
+
+class HotQueryPlanTest(unittest.TestCase):
+    """The hot router and scheduler queries are served from indexes, not table scans"""
+
+    @classmethod
+    def setUpClass(cls):
+        migrate()
+
+    def test_no_hot_query_scans_a_table(self):
+        with engine.connect() as conn:
+            if engine.dialect.name == "postgresql":
+                # Small tables make sequential scans cheaper; this checks the indexes are usable
+                conn.exec_driver_sql("SET enable_seqscan = off")
+            for name, stmt in hot_queries().items():
+                with self.subTest(name):
+                    plan = explain(conn, stmt)
+                    self.assertFalse(any(is_full_scan(line) for line in plan), "\n".join(plan))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from unittest import mock
+
+from starlette.requests import Request
+
+from app import database
+
+
+def request(peer: str, headers: dict = None) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        "client": (peer, 51234),
+    })
+
+
+class ClientKeyTest(unittest.TestCase):
+    def setUp(self):
+        proxies = mock.patch.object(database, "_trusted_proxies", {"10.0.0.2"})
+        proxies.start()
+        self.addCleanup(proxies.stop)
+
+    def test_staff_are_keyed_on_their_token(self):
+        first = database.client_key(request("10.0.0.2", {"Authorization": "Bearer a"}))
+        self.assertIsNotNone(first)
+        self.assertNotEqual(first, database.client_key(request("10.0.0.2", {"Authorization": "Bearer b"})))
+
+    def test_visitors_behind_a_trusted_proxy_are_keyed_on_the_forwarded_address(self):
+        key = database.client_key(request("10.0.0.2", {"X-Forwarded-For": "1.2.3.4, 203.0.113.7"}))
+        self.assertEqual(key, "203.0.113.7")
+
+    def test_visitors_that_cannot_be_told_apart_are_not_pinned(self):
+        self.assertIsNone(database.client_key(request("10.0.0.2")))
+        # A forwarded header from an untrusted peer is ignored, and so is the peer address
+        self.assertIsNone(database.client_key(request("198.51.100.9", {"X-Forwarded-For": "203.0.113.7"})))
+
+    def test_an_anonymous_write_does_not_pin_other_visitors(self):
+        database.mark_recent_write(request("10.0.0.2"))
+        with mock.patch.object(database.replica_set, "replicas", ["replica"]), \
+                mock.patch.object(database.replica_set, "candidates", return_value=["replica"]):
+            self.assertEqual(database._read_replicas(request("10.0.0.2")), ["replica"])
+
+
+if __name__ == "__main__":
+    unittest.main()
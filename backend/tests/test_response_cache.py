@@ -0,0 +1,48 @@
+import unittest
+
+from app.services.ai.response_cache import ResponseCache
+
+CONTEXT = (
+    "Looking at our bookings, revenue and no-show numbers for the clinic over the past quarter, "
+    "and keeping in mind that staff capacity is limited on weekends, "
+)
+
+
+class SimilarityTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResponseCache(maxsize=100, ttl=60)
+
+    def lookup(self, cached_prompt: str, prompt: str):
+        self.cache.set("ws", "v1", cached_prompt, "cached answer")
+        return self.cache.get("ws", "v1", prompt)
+
+    def test_exact_prompt_hits(self):
+        self.assertEqual(self.lookup("What are my busiest days?", "what are my busiest days"), "cached answer")
+        self.assertEqual(self.cache.exact_hits, 1)
+
+    def test_rephrasing_hits(self):
+        self.assertEqual(self.lookup("What are my busiest days?", "Which days are the busiest?"), "cached answer")
+        self.assertEqual(self.cache.similar_hits, 1)
+
+    def test_opposite_action_misses(self):
+        self.assertIsNone(self.lookup(CONTEXT + "which services should we promote?", CONTEXT + "which services should we retire?"))
+
+    def test_different_period_misses(self):
+        self.assertIsNone(self.lookup(CONTEXT + "how many bookings this week?", CONTEXT + "how many bookings this month?"))
+
+    def test_negation_misses(self):
+        self.assertIsNone(self.lookup(CONTEXT + "which clients should we contact?", CONTEXT + "which clients should we not contact?"))
+
+    def test_reordered_long_prompt_hits(self):
+        self.assertEqual(
+            self.lookup(CONTEXT + "which services should we promote?", "Please tell me: " + CONTEXT + "what services should we promote"),
+            "cached answer"
+        )
+
+    def test_other_workspace_misses(self):
+        self.cache.set("ws", "v1", "What are my busiest days?", "cached answer")
+        self.assertIsNone(self.cache.get("other", "v1", "What are my busiest days?"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal
+from app.main import app
+from app.middleware.auth import get_current_user
+from app.models.user import User, UserRole
+from tests import seed_demo
+
+
+class ServiceCapacityTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        seed_demo()
+        db = SessionLocal()
+        cls.owner = db.query(User).filter(User.role == UserRole.OWNER).first()
+        db.close()
+        app.dependency_overrides[get_current_user] = lambda: cls.owner
+        cls.client = TestClient(app)
+
+    @classmethod
+    def tearDownClass(cls):
+        app.dependency_overrides.pop(get_current_user, None)
+
+    def test_capacity_below_one_is_rejected(self):
+        for capacity in (0, -2):
+            with self.subTest(capacity=capacity):
+                response = self.client.post("/api/services/", json={"name": "Group class", "capacity": capacity})
+                self.assertEqual(response.status_code, 422)
+
+        created = self.client.post("/api/services/", json={"name": "Group class", "capacity": 6})
+        self.assertEqual(created.status_code, 200)
+        self.assertEqual(created.json()["capacity"], 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from datetime import date, timedelta
+
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal
+from app.main import app
+from app.middleware.auth import get_current_user
+from app.models.booking import Booking, BookingStatus
+from app.models.contact import Contact
+from app.models.service import Service
+from app.models.user import User, UserRole
+from app.models.waitlist import WaitlistEntry, WaitlistStatus
+from tests import seed_demo
+
+
+class CancelledHoldTest(unittest.TestCase):
+    """An offer whose hold staff cancelled can no longer be accepted"""
+
+    @classmethod
+    def setUpClass(cls):
+        seed_demo()
+        db = SessionLocal()
+        cls.owner = db.query(User).filter(User.role == UserRole.OWNER).first()
+        workspace_id = cls.owner.workspace_id
+        cls.service_id = db.query(Service.id).filter(Service.workspace_id == workspace_id).first().id
+        cls.contact_ids = [c.id for c in db.query(Contact.id).filter(Contact.workspace_id == workspace_id).limit(3)]
+        db.close()
+        app.dependency_overrides[get_current_user] = lambda: cls.owner
+        cls.client = TestClient(app)
+
+    @classmethod
+    def tearDownClass(cls):
+        app.dependency_overrides.pop(get_current_user, None)
+
+    def test_accepting_a_cancelled_hold_is_refused(self):
+        holder, first, second = self.contact_ids
+        day = date.today() + timedelta(days=10)
+        booking = self.client.post("/api/bookings/", json={
+            "service_id": self.service_id,
+            "contact_id": holder,
+            "booking_date": f"{day}T15:00:00"
+        }).json()
+        entries = [self.client.post("/api/waitlist/", json={
+            "contact_id": contact_id,
+            "service_id": self.service_id,
+            "date_from": str(day),
+            "date_to": str(day)
+        }).json()["id"] for contact_id in (first, second)]
+
+        self.client.put(f"/api/bookings/{booking['id']}/status", json={"status": "cancelled"})
+        db = SessionLocal()
+        hold_id = db.get(WaitlistEntry, entries[0]).offered_booking_id
+        db.close()
+        self.assertIsNotNone(hold_id)
+
+        # Staff cancel the hold: the offer closes and the slot goes to the next entry
+        self.client.put(f"/api/bookings/{hold_id}/status", json={"status": "cancelled"})
+        response = self.client.post(f"/api/public/waitlist/offer/{entries[0]}/accept")
+        self.assertEqual(response.status_code, 410)
+
+        db = SessionLocal()
+        try:
+            self.assertEqual(db.get(WaitlistEntry, entries[0]).status, WaitlistStatus.CANCELLED)
+            self.assertEqual(db.get(Booking, hold_id).status, BookingStatus.CANCELLED)
+            self.assertEqual(db.get(WaitlistEntry, entries[1]).status, WaitlistStatus.OFFERED)
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
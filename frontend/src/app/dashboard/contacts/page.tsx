@@ -158,7 +158,7 @@ export default function ContactsPage() {
             {/* Bookings */}
             <div className="mb-4">
               <h4 className="font-semibold text-sm text-gray-500 uppercase mb-2 flex items-center gap-1">
-                <Calendar className="w-4 h-4" /> Bookings ({contactDetail.bookings.length})
+                <Calendar className="w-4 h-4" /> Bookings ({contactDetail.stats.bookings})
               </h4>
               {contactDetail.bookings.length === 0 ? (
                 <p className="text-sm text-gray-400">No bookings</p>
@@ -177,7 +177,7 @@ export default function ContactsPage() {
             {/* Forms */}
             <div className="mb-4">
               <h4 className="font-semibold text-sm text-gray-500 uppercase mb-2 flex items-center gap-1">
-                <FileText className="w-4 h-4" /> Forms ({contactDetail.forms.length})
+                <FileText className="w-4 h-4" /> Forms ({contactDetail.stats.outstanding_forms + contactDetail.stats.completed_forms})
               </h4>
               {contactDetail.forms.length === 0 ? (
                 <p className="text-sm text-gray-400">No forms</p>
@@ -0,0 +1,156 @@
+'use client';
+import { useState, useEffect } from 'react';
+import { useParams } from 'next/navigation';
+import { publicAPI } from '@/lib/api';
+import { Calendar, Clock, CheckCircle, XCircle, AlertCircle } from 'lucide-react';
+import toast from 'react-hot-toast';
+
+const CLOSED_MESSAGES: Record<string, string> = {
+  booked: 'You accepted this spot. See you then!',
+  expired: 'This offer has expired and the spot went to the next person on the waitlist.',
+  cancelled: 'This offer is no longer available.',
+  waiting: "You're on the waitlist. We'll contact you if a spot opens up.",
+};
+
+export default function WaitlistOfferPage() {
+  const params = useParams();
+  const entryId = params.id as string;
+  const [offer, setOffer] = useState<any>(null);
+  const [loading, setLoading] = useState(true);
+  const [responding, setResponding] = useState(false);
+
+  useEffect(() => { fetchOffer(); }, [entryId]);
+
+  const fetchOffer = async () => {
+    try {
+      const { data } = await publicAPI.getWaitlistOffer(entryId);
+      setOffer(data);
+    } catch {
+      setOffer(null);
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  const respond = async (accept: boolean) => {
+    setResponding(true);
+    try {
+      if (accept) {
+        await publicAPI.acceptWaitlistOffer(entryId);
+        toast.success('Your booking has been confirmed!');
+      } else {
+        await publicAPI.declineWaitlistOffer(entryId);
+        toast.success('Thanks for letting us know');
+      }
+    } catch (err: any) {
+      toast.error(err.response?.data?.detail || 'Something went wrong');
+    } finally {
+      await fetchOffer();
+      setResponding(false);
+    }
+  };
+
+  if (loading) {
+    return (
+      <div className="min-h-screen flex items-center justify-center bg-gray-50">
+        <div className="w-8 h-8 border-3 border-primary-200 border-t-primary-600 rounded-full animate-spin" />
+      </div>
+    );
+  }
+
+  if (!offer) {
+    return (
+      <div className="min-h-screen flex items-center justify-center bg-gray-50">
+        <div className="text-center">
+          <AlertCircle className="w-16 h-16 text-gray-300 mx-auto mb-4" />
+          <h1 className="text-2xl font-bold text-gray-900 mb-2">Offer Not Found</h1>
+          <p className="text-gray-500">This link is invalid.</p>
+        </div>
+      </div>
+    );
+  }
+
+  const start = offer.start ? new Date(offer.start) : null;
+
+  if (offer.status !== 'offered') {
+    const booked = offer.status === 'booked';
+    return (
+      <div className={`min-h-screen flex items-center justify-center p-6 bg-gradient-to-br ${booked ? 'from-green-50' : 'from-gray-50'} to-white`}>
+        <div className="text-center max-w-md">
+          <div className={`w-20 h-20 rounded-full flex items-center justify-center mx-auto mb-6 ${booked ? 'bg-green-100' : 'bg-gray-100'}`}>
+            {booked ? <CheckCircle className="w-10 h-10 text-green-600" /> : <XCircle className="w-10 h-10 text-gray-400" />}
+          </div>
+          <h1 className="text-3xl font-bold text-gray-900 mb-3">{booked ? 'Booking Confirmed!' : 'Offer Closed'}</h1>
+          <p className="text-gray-600">{CLOSED_MESSAGES[offer.status] || CLOSED_MESSAGES.cancelled}</p>
+          {booked && start && (
+            <p className="text-gray-900 font-medium mt-4">
+              {offer.service} · {start.toLocaleString('en-US', {
+                weekday: 'long', month: 'long', day: 'numeric', hour: 'numeric', minute: '2-digit'
+              })}
+            </p>
+          )}
+          <p className="text-sm text-gray-400 mt-6">{offer.workspace_name}</p>
+        </div>
+      </div>
+    );
+  }
+
+  return (
+    <div className="min-h-screen bg-gradient-to-br from-primary-50 via-white to-primary-50 p-6">
+      <div className="max-w-lg mx-auto">
+        <div className="text-center mb-8">
+          <div className="w-14 h-14 bg-primary-500 rounded-2xl flex items-center justify-center mx-auto mb-4">
+            <Calendar className="w-7 h-7 text-white" />
+          </div>
+          <h1 className="text-2xl font-bold text-gray-900 mb-1">A spot opened up!</h1>
+          <p className="text-sm text-gray-400 mt-2">{offer.workspace_name}</p>
+        </div>
+
+        <div className="card p-6 space-y-5">
+          <div>
+            <p className="text-lg font-semibold text-gray-900">{offer.service}</p>
+            {start && (
+              <p className="text-gray-600 mt-1">
+                {start.toLocaleString('en-US', {
+                  weekday: 'long', month: 'long', day: 'numeric', hour: 'numeric', minute: '2-digit'
+                })}
+              </p>
+            )}
+          </div>
+
+          {offer.expires_at && (
+            <p className="text-sm text-orange-500 flex items-center gap-1.5">
+              <Clock className="w-4 h-4" />
+              Held for you until {new Date(offer.expires_at).toLocaleTimeString('en-US', { hour: 'numeric', minute: '2-digit' })}
+            </p>
+          )}
+
+          <div className="flex gap-3">
+            <button
+              onClick={() => respond(true)}
+              disabled={responding}
+              className="btn-primary flex-1 py-3 flex items-center justify-center gap-2"
+            >
+              {responding ? (
+                <div className="w-5 h-5 border-2 border-white/30 border-t-white rounded-full animate-spin" />
+              ) : (
+                <><CheckCircle className="w-4 h-4" /> Book it</>
+              )}
+            </button>
+            <button
+              onClick={() => respond(false)}
+              disabled={responding}
+              className="btn-secondary flex-1 py-3"
+            >
+              No thanks
+            </button>
+          </div>
+        </div>
+
+        <p className="text-center text-xs text-gray-400 mt-6">
+          Powered by CareOps
+        </p>
+      </div>
+    </div>
+  );
+}
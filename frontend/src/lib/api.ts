@@ -133,6 +133,9 @@ export const publicAPI = {
   createBooking: (slug: string, data: any) => api.post(`/api/public/booking/${slug}`, data),
   getForm: (id: string) => api.get(`/api/public/form/${id}`),
   submitForm: (id: string, data: any) => api.post(`/api/public/form/${id}`, data),
+  getWaitlistOffer: (id: string) => api.get(`/api/public/waitlist/offer/${id}`),
+  acceptWaitlistOffer: (id: string) => api.post(`/api/public/waitlist/offer/${id}/accept`),
+  declineWaitlistOffer: (id: string) => api.post(`/api/public/waitlist/offer/${id}/decline`),
 };
 
 // Integrations